@@ -84,6 +84,7 @@ class ParagraphStyle(PropertySet):
         'hyphenationLang': _hyphenationLang,
         'uriWasteReduce': _uriWasteReduce,
         'embeddedHyphenation': _embeddedHyphenation,
+        'lineBreakAlgorithm': _lineBreakAlgorithm,
         }
 """)
 
@@ -202,6 +203,10 @@ $strikeWidth$, $strikeOffset$, $strikeGap$ &amp; $strikeColor$ attributes do the
 disc("""Attribute $linkUnderline$ controls whether link tags are automatically underlined.""") 
 disc("""If the $pyphen$ python module is installed attribute $hyphenationLang$ controls which language will be used to hyphenate words without explicit embedded hyphens.""")
 disc("""If $embeddedHyphenation$ is set then attempts will be made to split words with embedded hyphens.""")
+disc("""Attribute $lineBreakAlgorithm$ can be <i>'greedy'</i>, the default, which fills each line in turn, or <i>'optimal'</i> which
+uses the Knuth-Plass total fit method to choose the line breaks, and any hyphenations, for the paragraph as a whole. That gives
+more even spacing in justified text and less ragged edges otherwise. If no set of breaks fits, eg because a word is longer than
+a line, the greedy method is used.""")
 disc("""Attribute $uriWasteReduce$ controls how we attempt to split long uri's. It is the fraction of a line that we regard as too much waste. The default in module
 $reportlab.rl_settings$ is <i>0.5</i> which means that we will try and split a word that looks like a uri if we would waste at least half of the line.""")
 disc("""Currently the hyphenation and uri splitting are turned off by default. You need to modify the default settings by using the file $~/.rl_settings$ or adding a module $reportlab_settings.py$ to the python path. Suitable values are""")
@@ -213,6 +218,11 @@ eg("""
 
 
 
+disc("""For large volumes of plain single style text, eg the cells of big tables, class $SimpleParagraph$ takes the same
+arguments as $Paragraph$ but uses its text literally; no markup is recognised and $<$, $>$ and $&amp;$ need no escaping.
+It breaks lines without creating fragment objects and produces the same output as $Paragraph$ would for the escaped text.
+Style features such as $endDots$, hyphenation and $textTransform$ are handled by the $Paragraph$ code.""")
+
 heading2("Paragraph XML Markup Tags")
 disc("""XML markup can be used to modify or specify the
 overall paragraph style, and also to specify intra-
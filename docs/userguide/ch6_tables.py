@@ -359,6 +359,16 @@ disc("""In any style command the first row index may be set to one of the specia
 $'splitlast'$ or $'splitfirst'$ to indicate that the style should be used only for the last row of
 a split table, or the first row of a continuation. This allows splitting tables with nicer effects around the split.""")
 
+heading2("""$StreamingTable(rows, colWidths, header=None, style=None, rowHeights=None)$""")
+disc("""A $StreamingTable$ is meant for very long tables whose rows come from a generator or
+database cursor. Rows are pulled from the $rows$ iterator only as the frames are filled, so a page
+or two of rows is held in memory at a time, and each page is drawn as an ordinary $Table$ with the
+$header$ rows repeated. The column widths must be given as numbers. Because the number of rows is
+not known up front the style may only use commands on the header rows or commands that run to the last
+row ($-1$) such as $GRID$ or $ROWBACKGROUNDS$; $SPAN$ and $NOSPLIT$ in the body, the special split
+indices and other commands on particular body rows raise a $ValueError$. The iterator is consumed
+by the first build so a $StreamingTable$ can only be used in a single pass document build.""")
+
 heading1("""Programming $Flowables$""")
 
 disc("""The following flowables let you conditionally evaluate and execute expressions and statements at wrap time:""")
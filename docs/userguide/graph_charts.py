@@ -1080,7 +1080,10 @@ to each line showing the numeric value. You can also set it
 to 'values' to display the values explicity defined in lineLabelArray."""],
       ["lineLabelArray", """Explicit array of line label values, must match size of data if present.
 These labels values will be displayed only if the property
-lineLabelFormat above is set to 'values'."""]]
+lineLabelFormat above is set to 'values'."""],
+      ["bulkSymbols", """Defaults to 0. If true, a line whose points all use the same
+symbol draws them as a single PointCloud shape instead of one marker per point;
+this makes plots with many thousands of points much quicker to draw."""]]
 t=Table(data, colWidths=(100,330))
 t.setStyle(TableStyle([
             ('FONT',(0,0),(-1,0),'Times-Bold',10,12),
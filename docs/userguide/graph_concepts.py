@@ -165,6 +165,16 @@ eg("""
     renderSVG.drawToFile(d, 'example1.svg')
 """)
 
+disc("""
+A drawing used many times in one PDF, such as a logo drawn in every page
+header, can be compiled once.  If $d.drawAsForm$ is true (or it is $None$ and
+$rl_config.drawingDrawAsForm$ is true) $renderPDF.draw$ renders the drawing
+into a form XObject the first time it is seen and later uses of any
+structurally equal drawing become a single $Do$ operator in the page stream.
+Drawings are compared by their classes and attribute values, so changing
+the drawing between uses simply makes a new form.
+""")
+
 
 heading3("Attribute Verification")
 
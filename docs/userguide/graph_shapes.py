@@ -32,6 +32,7 @@ bullet("Wedge (a pie slice)")
 bullet("Polygon")
 bullet("Line")
 bullet("PolyLine")
+bullet("PointCloud (one marker shape drawn at many points)")
 bullet("String")
 bullet("Group")
 bullet("Path (<i>not implemented yet, but will be added in the future</i>)")
@@ -315,6 +316,24 @@ will be, soon.
     ##         should be finished off accurately for PDF and PS.</b>""")
 
 
+heading3("Point Clouds")
+
+disc("""
+A $PointCloud$ draws the same marker at each of many points, for example the
+symbols of a large scatter plot.
+The points are kept in a single flat $array('d')$ and the marker is any shape,
+group or widget drawn with its origin on each point in turn, so there is no
+shape object per point.
+The PDF renderer makes the marker into a form XObject and each point costs a
+short $Do$ sequence; the SVG renderer defines the marker once and refers to it
+with $use$ elements.
+""")
+
+eg("""
+    from reportlab.graphics.widgets.markers import makeMarker
+    d.add(PointCloud([(10,10), (20,15), (30,12)], makeMarker('FilledCircle', size=3)))
+""")
+
 heading3("Groups")
 
 disc("""
@@ -32,8 +32,14 @@
 
 from reportlab.platypus.flowables import Flowable
 from reportlab.lib.units import inch
+from reportlab.lib.utils import _digester
+from reportlab.pdfgen.canvas import FILL_NON_ZERO
+from reportlab import rl_config
 from string import ascii_lowercase, ascii_uppercase, digits as string_digits
 
+#drawing and layout state that doesn't change the barcode's appearance
+_formSkipAttrs = frozenset(('canv','_barPath','_frame','_postponed','_skipMeNextTime','_formInfo'))
+
 class Barcode(Flowable):
     """Abstract Base for barcodes. Includes implementations of
     some methods suitable for the more primitive barcode types"""
@@ -41,6 +47,7 @@ class Barcode(Flowable):
     fontName = 'Courier'
     fontSize = 12
     humanReadable = 0
+    drawAsForm = None   #None means use rl_config.barcodeDrawAsForm
 
     def _humanText(self):
         return self.encoded
@@ -156,6 +163,46 @@ class Barcode(Flowable):
 
         self.drawHumanReadable()
 
+    def _drawOn(self, canv):
+        drawAsForm = self.drawAsForm
+        if drawAsForm is None:
+            drawAsForm = rl_config.barcodeDrawAsForm
+        if not drawAsForm or not hasattr(canv,'beginForm'):
+            Flowable._drawOn(self, canv)
+            return
+        #compile the barcode once per document as a form with the bars in one path
+        w, h = self.width, self.height
+        name = self._formName()
+        if not canv.hasForm(name):
+            #a generous bounding box; it only clips
+            m = 2*max(w, h, self.fontSize) + abs(getattr(self,'x',0)) + abs(getattr(self,'y',0))
+            canv.beginForm(name, -m, -m, w+m, h+m)
+            self.canv = canv
+            self._barPath = p = canv.beginPath()
+            try:
+                self.draw()
+                if p._code:
+                    canv.drawPath(p, stroke=0, fill=1, fillMode=FILL_NON_ZERO)
+            finally:
+                del self.canv, self._barPath
+            canv.endForm()
+        self._formInfo = self._formState(), name
+        canv.doForm(name)
+
+    def _formState(self):
+        "repr of the class and the attributes determining the barcode's appearance"
+        return repr((self.__class__.__module__, self.__class__.__name__,
+                    sorted((k,v) for k,v in self.__dict__.items() if k not in _formSkipAttrs)))
+
+    def _formName(self):
+        "name of the form for this barcode's class, value and geometry"
+        state = self._formState()
+        fI = self.__dict__.get('_formInfo')
+        if fI and fI[0]==state:
+            #draw may have cached derived values; we still look the same
+            return fI[1]
+        return 'Barcode_%s' % _digester(state)
+
     def drawHumanReadable(self):
         if self.humanReadable:
             #we have text
@@ -175,7 +222,11 @@ class Barcode(Flowable):
             self.annotate(x+width/2.,-y,s,fontName,fontSize)
 
     def rect(self, x, y, w, h):
-        self.canv.rect(x, y, w, h, stroke=0, fill=1)
+        p = getattr(self,'_barPath',None)
+        if p is None:
+            self.canv.rect(x, y, w, h, stroke=0, fill=1)
+        else:
+            p.rect(x, y, w, h)
 
     def annotate(self,x,y,text,fontName,fontSize,anchor='middle'):
         canv = self.canv
@@ -6,7 +6,7 @@ except ImportError:
 else:
     __all__=('DataMatrix',)
 
-from reportlab.graphics.barcode.common import Barcode
+from reportlab.graphics.barcode.common import Barcode, FILL_NON_ZERO
 from reportlab.lib.utils import asBytes
 from reportlab.platypus.paraparser import _num as paraparser_num
 from reportlab.graphics.widgetbase import Widget
@@ -209,13 +209,20 @@ class DataMatrix(Barcode,_DMTXCheck):
         cellHeight = self.cellHeight
         yr = y - b - cellHeight
         x += b
+        #drawing a form (see Barcode._drawOn) so fill the cells with one path
+        p = canv.beginPath() if getattr(self,'_barPath',None) is not None else None
         for row in self.matrix.split('\n'):
             xr = x 
             for c in row:
                 if c=='x':
-                    canv.rect(xr, yr, cellWidth, cellHeight, fill=1, stroke=0)
+                    if p is None:
+                        canv.rect(xr, yr, cellWidth, cellHeight, fill=1, stroke=0)
+                    else:
+                        p.rect(xr, yr, cellWidth, cellHeight)
                 xr += cellWidth
             yr -= cellHeight
+        if p is not None:
+            canv.drawPath(p, fill=1, stroke=0, fillMode=FILL_NON_ZERO)
         canv.restoreState()
     
 
@@ -21,9 +21,9 @@ __all__ = ('QrCodeWidget')
 import itertools
 
 from reportlab.platypus.flowables import Flowable
-from reportlab.graphics.shapes import Group, Rect
+from reportlab.graphics.shapes import Group, Rect, Path, FILL_NON_ZERO
 from reportlab.lib import colors
-from reportlab.lib.validators import isNumber, isNumberOrNone, isColor, Validator
+from reportlab.lib.validators import isNumber, isNumberOrNone, isColor, Validator, OneOf
 from reportlab.lib.attrmap import AttrMap, AttrMapValue
 from reportlab.graphics.widgetbase import Widget
 from reportlab.lib.units import mm
@@ -73,6 +73,7 @@ class QrCodeWidget(Widget):
         barBorder = AttrMapValue(isNumber, desc='Width of QR border.'), # maybe should be named qrBorder?
         barLevel = AttrMapValue(isLevel, desc='QR Code level.'), # maybe should be named qrLevel
         qrVersion = AttrMapValue(isNumberOrNone, desc='QR Code version. None for auto'),
+        qrDrawMode = AttrMapValue(OneOf('rects','path'), desc='draw the dark runs as separate rects or one path'),
         # Below are ignored, they make no sense
         barStrokeWidth = AttrMapValue(isNumber, desc='Width of bar borders.'),
         barStrokeColor = AttrMapValue(isColor, desc='Color of bar borders.'),
@@ -87,6 +88,7 @@ class QrCodeWidget(Widget):
     barBorder = 4
     barLevel = 'L'
     qrVersion = None
+    qrDrawMode = 'rects'
     value = None
 
     def __init__(self, value='Hello World', **kw):
@@ -127,6 +129,12 @@ class QrCodeWidget(Widget):
         offsetX = x + (width - minwh) / 2.0
         offsetY = y + (minwh - height) / 2.0
 
+        if self.qrDrawMode == 'path':
+            p = Path(fillColor=color, strokeColor=None, strokeWidth=0,
+                     fillMode=FILL_NON_ZERO)
+        else:
+            p = None
+
         for r, row in enumerate(self.qr.modules):
             row = map(bool, row)
             c = 0
@@ -136,11 +144,23 @@ class QrCodeWidget(Widget):
                 if isDark:
                     x = (c + border) * boxsize
                     y = (r + border + 1) * boxsize
-                    s = SRect(offsetX + x, offsetY + height - y, count * boxsize, boxsize,
-                            fillColor=color)
-                    g.add(s)
+                    if p:
+                        x0 = offsetX + x
+                        y0 = offsetY + height - y
+                        x1 = x0 + count * boxsize
+                        p.moveTo(x0, y0)
+                        p.lineTo(x1, y0)
+                        p.lineTo(x1, y0 + boxsize)
+                        p.lineTo(x0, y0 + boxsize)
+                        p.closePath()
+                    else:
+                        s = SRect(offsetX + x, offsetY + height - y, count * boxsize, boxsize,
+                                fillColor=color)
+                        g.add(s)
                 c += count
 
+        if p:
+            g.add(p)
         return g
 
 
@@ -152,6 +172,7 @@ class QrCode(Flowable):
     qrBorder = 4
     qrLevel = 'L'
     qrVersion = None
+    qrDrawMode = 'rects'    #or 'path' to fill all the dark runs with one path
     value = None
 
     def __init__(self, value=None, **kw):
@@ -181,6 +202,13 @@ class QrCode(Flowable):
         xsize = self.width / (moduleCount + border * 2.0)
         ysize = self.height / (moduleCount + border * 2.0)
 
+        if self.qrDrawMode == 'path':
+            p = self.canv.beginPath()
+            rect = p.rect
+        else:
+            p = None
+            rect = self.rect
+
         for r, row in enumerate(self.qr.modules):
             row = map(bool, row)
             c = 0
@@ -190,8 +218,11 @@ class QrCode(Flowable):
                 if isDark:
                     x = (c + border) * xsize
                     y = self.height - (r + border + 1) * ysize
-                    self.rect(x, y, count * xsize, ysize * 1.05)
+                    rect(x, y, count * xsize, ysize * 1.05)
                 c += count
 
+        if p:
+            self.canv.drawPath(p, stroke=0, fill=1, fillMode=FILL_NON_ZERO)
+
     def rect(self, x, y, w, h):
         self.canv.rect(x, y, w, h, stroke=0, fill=1)
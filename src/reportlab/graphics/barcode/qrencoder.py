@@ -23,6 +23,8 @@
 
 import re
 import itertools
+from collections import OrderedDict
+from reportlab import rl_config
 try:
     from itertools import zip_longest
 except:
@@ -330,11 +332,19 @@ class QRCode:
         return version
 
     def make(self):
+        qrSymbolCache.make(self)
+
+    def makeSymbol(self):
+        "make the modules without consulting qrSymbolCache"
         if self.version is None:
             self.version = self.calculate_version()
         self.makeImpl(False, self.getBestMaskPattern())
 
     def makeImpl(self, test, maskPattern):
+        self.setupFunctionPatterns(test, maskPattern)
+        self.mapData(self.getData(), maskPattern)
+
+    def setupFunctionPatterns(self, test, maskPattern):
         self.moduleCount = self.version * 4 + 17
         self.modules = [ [False] * self.moduleCount
                          for x in range(self.moduleCount) ]
@@ -346,11 +356,13 @@ class QRCode:
         self.setupTypeInfo(test, maskPattern)
         if (self.version >= 7):
             self.setupTypeNumber(test)
+
+    def getData(self):
         if (self.dataCache == None):
             self.dataCache = QRCode.createData(self.version,
                                                self.errorCorrectLevel,
                                                self.dataList)
-        self.mapData(self.dataCache, maskPattern)
+        return self.dataCache
 
     _positionProbePattern = [
         [True,  True,  True,  True,  True,  True,  True],
@@ -381,11 +393,28 @@ class QRCode:
                 self.modules[row+r][col-1] = False
 
     def getBestMaskPattern(self):
+        # the test symbols only differ in the masked data modules so we pack
+        # the function patterns, data positions and data bits into ints once
+        # and score each mask with whole matrix bit operations
+        self.setupFunctionPatterns(True, 0)
+        n = self.moduleCount
+        pos = [[False] * n for x in range(n)]
+        dark = [[False] * n for x in range(n)]
+        for (col, row), bit in zip_longest(self.dataPosIterator(),
+                                           self.dataBitIterator(self.getData()),
+                                           fillvalue=False):
+            pos[row][col] = True
+            dark[row][col] = bit
+        base = QRUtil.packModules(self.modules)
+        pos = QRUtil.packModules(pos)
+        dark = QRUtil.packModules(dark)
         minLostPoint = 0
         pattern = 0
         for i in range(8):
-            self.makeImpl(True, i);
-            lostPoint = QRUtil.getLostPoint(self);
+            mask = QRUtil.getPackedMask(i, n)
+            rows, cols = [b | ((d ^ m) & p)
+                          for b, d, m, p in zip(base, dark, mask, pos)]
+            lostPoint = QRUtil.getPackedLostPoint(rows, cols, n)
             if (i == 0 or minLostPoint > lostPoint):
                 minLostPoint = lostPoint
                 pattern = i
@@ -571,6 +600,58 @@ class QRCode:
         return data
 
 
+class QRSymbolCache:
+    """process wide LRU cache of made QRCode modules keyed by the data list,
+    error correction level and requested version; it is limited to
+    rl_config.qrSymbolCacheSize entries and 0 disables it.
+
+    Labels and tickets often repeat a code on every page; a hit costs a
+    lookup and a copy of the rows instead of encoding and scoring the masks."""
+    def __init__(self):
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    @property
+    def maxSize(self):
+        return rl_config.qrSymbolCacheSize
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(qrCode):
+        return (qrCode.errorCorrectLevel, qrCode.version,
+                tuple((d.__class__, tuple(sorted(d.__dict__.items())))
+                      for d in qrCode.dataList))
+
+    def make(self, qrCode):
+        maxSize = self.maxSize
+        if maxSize:
+            try:
+                k = self.key(qrCode)
+                v = self._data.get(k)
+            except TypeError:   #unhashable data
+                maxSize = 0
+        if not maxSize:
+            qrCode.makeSymbol()
+            return
+        data = self._data
+        if v is not None:
+            data.move_to_end(k)
+            self.hits += 1
+            qrCode.version, rows = v
+            qrCode.moduleCount = len(rows)
+            qrCode.modules = [[bool(m) for m in row] for row in rows]
+        else:
+            qrCode.makeSymbol()
+            data[k] = qrCode.version, tuple(bytes(row) for row in qrCode.modules)
+            while len(data) > maxSize:
+                data.popitem(last=False)
+            self.misses += 1
+
+qrSymbolCache = QRSymbolCache()
+
 class QRErrorCorrectLevel:
     L = 1
     M = 0
@@ -680,11 +761,16 @@ class QRUtil:
     def getMask(cls, maskPattern):
         return cls.maskPattern[maskPattern]
 
-    @staticmethod
-    def getErrorCorrectPolynomial(errorCorrectLength):
-        a = QRPolynomial([1], 0);
-        for i in range(errorCorrectLength):
-            a = a.multiply(QRPolynomial([1, QRMath.gexp(i)], 0) )
+    _errorCorrectPolynomials = {}
+
+    @classmethod
+    def getErrorCorrectPolynomial(cls, errorCorrectLength):
+        a = cls._errorCorrectPolynomials.get(errorCorrectLength)
+        if a is None:
+            a = QRPolynomial([1], 0);
+            for i in range(errorCorrectLength):
+                a = a.multiply(QRPolynomial([1, QRMath.gexp(i)], 0) )
+            cls._errorCorrectPolynomials[errorCorrectLength] = a
         return a
 
     @classmethod
@@ -762,6 +848,71 @@ class QRUtil:
         lostPoint += cls.maskScoreRule4(qrCode.modules)
         return lostPoint
 
+    @staticmethod
+    def packModules(modules):
+        """return (rows, cols) ints with bit r*n+c, respectively c*n+r, set
+        for each dark module[r][c] of the n x n matrix modules"""
+        modules = [[bool(v) for v in row] for row in modules]
+        return tuple(int(''.join('1' if v else '0'
+                        for row in m for v in row)[::-1] or '0', 2)
+                        for m in (modules, list(zip(*modules))))
+
+    _packedMasks = {}
+
+    @classmethod
+    def getPackedMask(cls, maskPattern, n):
+        key = maskPattern, n
+        packed = cls._packedMasks.get(key)
+        if packed is None:
+            mask = cls.getMask(maskPattern)
+            packed = cls._packedMasks[key] = cls.packModules(
+                        [[mask(i, j) for j in range(n)] for i in range(n)])
+        return packed
+
+    _packedLines = {}
+
+    @classmethod
+    def getPackedLines(cls, n):
+        """return the ints selecting columns < n-1, columns < n-11 and the
+        first n-1 rows of those with columns < n-1 in a packed n x n matrix"""
+        lines = cls._packedLines.get(n)
+        if lines is None:
+            lines = cls._packedLines[n] = tuple(
+                sum(((1 << w) - 1) << (r * n) for r in range(h))
+                for w, h in ((n - 1, n), (max(n - 11, 0), n), (n - 1, n - 1)))
+        return lines
+
+    @staticmethod
+    def bitCount(x):
+        return bin(x).count('1')
+
+    @classmethod
+    def getPackedLostPoint(cls, rows, cols, n,
+            pattern = [True, False, True, True, True, False, True,
+                       False, False, False, False]):
+        """the score of getLostPoint for the matrix packed in rows and cols"""
+        bitCount = cls.bitCount
+        line, line3, block = cls.getPackedLines(n)
+        lostPoint = 0
+        # LEVEL1 runs of five or more along the rows and the columns
+        for x in (rows, cols):
+            same = ~(x ^ (x >> 1)) & line
+            run = same & (same >> 1) & (same >> 2) & (same >> 3)
+            lostPoint += bitCount(run) + 2 * bitCount(run & ~(run >> 1))
+        # LEVEL2 2x2 blocks
+        same = ~(rows ^ (rows >> n))
+        lostPoint += 3 * bitCount(same & (same >> 1)
+                                  & ~(rows ^ (rows >> 1)) & block)
+        # LEVEL3 finder like patterns; like maskScoreRule3hor the columns
+        # never score and these patterns cannot overlap
+        match = line3
+        for i, p in enumerate(pattern):
+            match &= (rows >> i) if p else ~(rows >> i)
+        lostPoint += 40 * bitCount(match)
+        # LEVEL4
+        lostPoint += 10 * (abs(100 * bitCount(rows) // (n * n) - 50) // 5)
+        return lostPoint
+
 class QRMath:
     @staticmethod
     def glog(n):
@@ -813,12 +964,18 @@ class QRPolynomial:
     def mod(self, e):
         if (self.getLength() < e.getLength()):
             return self;
-        ratio = QRMath.glog(self.num[0] ) - QRMath.glog(e.num[0] )
-        num = [nn ^ QRMath.gexp(QRMath.glog(en) + ratio)
-               for nn,en in zip(self.num, e.num)]
-        num += self.num[e.getLength():]
-        # recursive call
-        return QRPolynomial(num, 0).mod(e);
+        # long division by e one leading term at a time
+        num = self.num[:]
+        elen = e.getLength()
+        elog = [QRMath.glog(en) for en in e.num]
+        i = 0
+        while len(num) - i >= elen:
+            if num[i]:
+                ratio = LOG_TABLE[num[i]] - elog[0]
+                for j, en in enumerate(elog, i):
+                    num[j] ^= EXP_TABLE[(en + ratio) % 255]
+            i += 1
+        return QRPolynomial(num[i:] or [0], 0);
 
 class QRRSBlock:
     RS_BLOCK_TABLE = [
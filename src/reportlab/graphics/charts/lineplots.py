@@ -9,7 +9,7 @@ from reportlab.lib import colors
 from reportlab.lib.validators import *
 from reportlab.lib.attrmap import *
 from reportlab.lib.utils import flatten, isStr
-from reportlab.graphics.shapes import Drawing, Group, Rect, PolyLine, Polygon, _SetKeyWordArgs
+from reportlab.graphics.shapes import Drawing, Group, Rect, PolyLine, Polygon, PointCloud, _SetKeyWordArgs
 from reportlab.graphics.widgetbase import TypedPropertyCollection, PropHolder, tpcGetItem
 from reportlab.graphics.charts.textlabels import Label
 from reportlab.graphics.charts.axes import XValueAxis, YValueAxis, AdjYValueAxis, NormalDateXValueAxis
@@ -101,11 +101,13 @@ class LinePlot(AbstractLineChart):
         annotations = AttrMapValue(None, desc='list of callables, will be called with self, xscale, yscale.',advancedUsage=1),
         behindAxes = AttrMapValue(isBoolean, desc='If true use separate line group.',advancedUsage=1),
         gridFirst = AttrMapValue(isBoolean, desc='If true use draw grids before axes.',advancedUsage=1),
+        bulkSymbols = AttrMapValue(isBoolean, desc='If true draw the symbols of a row as one PointCloud when they are all the same.',advancedUsage=1),
         )
 
     def __init__(self):
         PlotArea.__init__(self)
         self.reversePlotOrder = 0
+        self.bulkSymbols = 0
 
         self.xValueAxis = XValueAxis()
         self.yValueAxis = YValueAxis()
@@ -293,6 +295,7 @@ class LinePlot(AbstractLineChart):
             inFillX1 = inFillX0 + xA._length
             inFillG = getattr(self,'_inFillG',g)
         lG = getattr(self,'_lineG',g)
+        bulkSymbols = getattr(self,'bulkSymbols',0) and not bubblePlot
         # Iterate over data rows.
         R = range(len(P))
         if self.reversePlotOrder: R = reversed(R)
@@ -340,7 +343,13 @@ class LinePlot(AbstractLineChart):
             else:
                 uSymbol = None
 
-            if uSymbol:
+            if uSymbol and bulkSymbols and not isinstance(uSymbol,TypedPropertyCollection) \
+                    and not [k for k in lines._children if len(k)==2 and k[0]==styleRowNo]:
+                #every point has the same symbol so draw them all in one node
+                symbol = uSymbol2Symbol(uSymbol,0,0,strokeColor)
+                if symbol:
+                    g.add(PointCloud(row,symbol))
+            elif uSymbol:
                 if bubblePlot: drow = self.data[rowNo]
                 for j,xy in enumerate(row):
                     if (styleRowNo,j) in lines:
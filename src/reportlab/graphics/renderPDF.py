@@ -26,8 +26,74 @@ from reportlab.graphics.renderbase import Renderer, getStateDelta, renderScaledD
 # the main entry point for users...
 def draw(drawing, canvas, x, y, showBoundary=rl_config._unset_):
     """As it says"""
-    R = _PDFRenderer()
-    R.draw(renderScaledDrawing(drawing), canvas, x, y, showBoundary=showBoundary)
+    asForm = getattr(drawing,'drawAsForm',None)
+    if asForm is None:
+        asForm = rl_config.drawingDrawAsForm
+    if asForm and hasattr(canvas,'beginForm'):
+        drawAsForm(drawing, canvas, x, y, showBoundary=showBoundary)
+    else:
+        R = _PDFRenderer()
+        R.draw(renderScaledDrawing(drawing), canvas, x, y, showBoundary=showBoundary)
+
+def drawAsForm(drawing, canvas, x, y, showBoundary=rl_config._unset_):
+    """Draw using a form XObject which is rendered once per document for
+    each distinct drawing (see nodeDigest); a repeated logo or chart then
+    costs a single Do in the page stream.  The form clips anything drawn
+    further outside the drawing than its own width or height."""
+    d = renderScaledDrawing(drawing)
+    name = 'Drawing_%s' % nodeDigest(d, showBoundary)
+    if not canvas.hasForm(name):
+        w, h = d.width, d.height
+        m = max(w, h)
+        canvas.beginForm(name, -m, -m, w+m, h+m)
+        _PDFRenderer().draw(d, canvas, 0, 0, showBoundary=showBoundary)
+        canvas.endForm()
+    canvas.saveState()
+    canvas.translate(x, y)
+    canvas.doForm(name)
+    canvas.restoreState()
+
+_digestSkipAttrs = frozenset(('canv','_parent','__propholder_parent__','_frame','_postponed','_skipMeNextTime'))
+
+def nodeDigest(*nodes):
+    """md5 hex digest of the classes and attributes of nodes and of the
+    shapes, widgets and other graphics objects they hold.  Other values
+    contribute their repr so equal digests mean structurally equal trees."""
+    from reportlab.lib.utils import _digester
+    out = []
+    a = out.append
+    seen = {}
+    def walk(v):
+        cls = v.__class__
+        if hasattr(v,'__dict__') and (isinstance(v,(Shape,UserNode)) or cls.__module__.startswith('reportlab.graphics')):
+            i = id(v)
+            if i in seen:
+                a('@%d' % seen[i])
+                return
+            seen[i] = len(seen)
+            a('<%s.%s' % (cls.__module__, cls.__qualname__))
+            D = v.__dict__
+            for k in sorted(D):
+                if k not in _digestSkipAttrs:
+                    a(k)
+                    walk(D[k])
+            a('>')
+        elif cls in (list, tuple):
+            a(cls.__name__)
+            for x in v:
+                walk(x)
+            a(']')
+        elif cls is dict:
+            a('{')
+            for k in sorted(v, key=repr):
+                a(repr(k))
+                walk(v[k])
+            a('}')
+        else:
+            a(repr(v))
+    for node in nodes:
+        walk(node)
+    return _digester('\n'.join(out))
 
 class _PDFRenderer(Renderer):
     """This draws onto a PDF document.  It needs to be a class
@@ -201,6 +267,36 @@ class _PDFRenderer(Renderer):
                 fill = 0
             cP(pdfPath, fill=fill, stroke=stroke, fillMode=fillMode)
 
+    def drawPointCloud(self, cloud):
+        """the marker becomes a form XObject, named for the marker and the
+        state it inherits, and each point costs one short Do sequence"""
+        canvas = self._canvas
+        if not hasattr(canvas,'beginForm'):
+            return Renderer.drawPointCloud(self, cloud)
+        marker = cloud.getMarker()
+        if marker is None: return
+        P = cloud.points
+        if not P: return
+        state = self._tracker.getState().copy()
+        del state['ctm'], state['transform']
+        name = 'PointCloud_%s' % nodeDigest(marker, state)
+        if not canvas.hasForm(name):
+            b = marker.getBounds()
+            if b is None: return
+            x0, y0, x1, y1 = b
+            m = max(x1-x0, y1-y0, state['strokeWidth'] or 0, 1)
+            stroke, fill = self._stroke, self._fill
+            canvas.beginForm(name, x0-m, y0-m, x1+m, y1+m)
+            #the form must not rely on the state at any Do
+            self.applyStateChanges(state, {})
+            self.drawNode(marker)
+            canvas.endForm()
+            self._stroke, self._fill = stroke, fill
+        xobj = canvas._doc.getXObjectName(name)
+        canvas._formsinuse.append(name)
+        fmt = 'q 1 0 0 1 %%s cm /%s Do Q' % xobj
+        canvas._code.append('\n'.join([fmt % fp_str(P[i],P[i+1]) for i in range(0,len(P),2)]))
+
     def setStrokeColor(self,c):
         self._canvas.setStrokeColor(c)
 
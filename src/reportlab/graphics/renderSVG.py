@@ -790,6 +790,31 @@ class _SVGRenderer(Renderer):
 
         if self.verbose: print("### end _SVGRenderer.drawGroup")
 
+    def drawPointCloud(self, cloud):
+        #the marker is drawn once inside a defs element and each point is a use
+        marker = cloud.getMarker()
+        P = cloud.points
+        if marker is None or not P: return
+        canvas = self._canvas
+        doc = canvas.doc
+        n = canvas._nPointClouds = getattr(canvas,'_nPointClouds',0) + 1
+        mid = 'pointCloud%d' % n
+        currGroup = canvas.currGroup
+        defs = doc.createElement('defs')
+        currGroup.appendChild(defs)
+        canvas.currGroup = transformNode(doc, "g", id=mid)
+        defs.appendChild(canvas.currGroup)
+        self.drawNode(marker)
+        canvas.currGroup = currGroup
+        href = '#'+mid
+        fp_str = canvas.fp_str
+        for i in range(0, len(P), 2):
+            use = doc.createElement('use')
+            use.setAttribute('xlink:href', href)
+            use.setAttribute('x', fp_str(P[i]))
+            use.setAttribute('y', fp_str(P[i+1]))
+            currGroup.appendChild(use)
+
     def drawRect(self, rect):
         link_info = self._get_link_info_dict(rect)
         svgAttrs = getattr(rect,'_svgAttrs',{})
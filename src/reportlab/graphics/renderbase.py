@@ -8,14 +8,24 @@ __doc__='''Superclass for renderers to factor out common functionality and defau
 from reportlab.graphics.shapes import *
 from reportlab.lib.validators import DerivedValue
 from reportlab import rl_config
+from itertools import repeat
 
 from . transform import mmult, inverse
 
+_plainProperties = {}   #class --> true if it uses Shape.getProperties
+
 def getStateDelta(shape):
     """Used to compute when we need to change the graphics state.
     For example, if we have two adjacent red shapes we don't need
     to set the pen color to red in between. Returns the effect
     the given shape would have on the graphics state"""
+    cls = shape.__class__
+    plain = _plainProperties.get(cls)
+    if plain is None:
+        plain = _plainProperties[cls] = getattr(cls,'getProperties',None) is Shape.getProperties
+    if plain:
+        #the same result without building the full properties dict
+        return {prop: value for prop, value in shape.__dict__.items() if prop in STATE_DEFAULTS}
     delta = {}
     for prop, value in shape.getProperties().items():
         if prop in STATE_DEFAULTS:
@@ -58,16 +68,15 @@ class StateTracker:
         the stack.  After doing this, the combined state is accessible
         through getState()"""
 
-        newstate = self._combined[-1].copy()
-        for key, value in delta.items():
-            if key == 'transform':  #do cumulative matrix
-                newstate['transform'] = delta['transform']
-                newstate['ctm'] = mmult(self._combined[-1]['ctm'], delta['transform'])
-                #print 'statetracker transform = (%0.2f, %0.2f, %0.2f, %0.2f, %0.2f, %0.2f)' % tuple(newstate['transform'])
-                #print 'statetracker ctm = (%0.2f, %0.2f, %0.2f, %0.2f, %0.2f, %0.2f)' % tuple(newstate['ctm'])
-
-            else:  #just overwrite it
-                newstate[key] = value
+        state = self._combined[-1]
+        if delta:
+            newstate = state.copy()
+            newstate.update(delta)
+            if 'transform' in delta:    #do cumulative matrix
+                newstate['ctm'] = mmult(state['ctm'], delta['transform'])
+        else:
+            #nothing changes so share the frame; __setitem__ copies it before writing
+            newstate = state
 
         self._combined.append(newstate)
         self._deltas.append(delta)
@@ -109,7 +118,10 @@ class StateTracker:
 
     def __setitem__(self,key,value):
         "sets the complete graphics state value of key to value"
-        self._combined[-1][key] = value
+        C = self._combined
+        if len(C)>1 and C[-1] is C[-2]:
+            C[-1] = C[-1].copy()
+        C[-1][key] = value
 
 def testStateTracker():
     print('Testing state tracker')
@@ -159,6 +171,38 @@ def renderScaledDrawing(d):
         d.renderScale = 1.0
     return d
 
+_nodeDrawMethods = (
+        (Line, 'drawLine'),
+        (Image, 'drawImage'),
+        (Rect, 'drawRect'),
+        (Circle, 'drawCircle'),
+        (Ellipse, 'drawEllipse'),
+        (PolyLine, 'drawPolyLine'),
+        (Polygon, 'drawPolygon'),
+        (Path, 'drawPath'),
+        (String, 'drawString'),
+        (Group, 'drawGroup'),
+        (Wedge, 'drawWedge'),
+        (PointCloud, 'drawPointCloud'),
+        (DirectDraw, None),
+        )
+_nodeDrawMethodCache = {}
+
+def _nodeDrawMethod(cls):
+    """the name of the Renderer method drawing instances of cls, None for
+    DirectDraw nodes and '' for anything else; the first isinstance match in
+    _nodeDrawMethods wins and is remembered for the class"""
+    try:
+        return _nodeDrawMethodCache[cls]
+    except KeyError:
+        for klass, meth in _nodeDrawMethods:
+            if issubclass(cls, klass):
+                break
+        else:
+            meth = ''
+        _nodeDrawMethodCache[cls] = meth
+        return meth
+
 class Renderer:
     """Virtual superclass for graphics renderers."""
 
@@ -217,7 +261,10 @@ class Renderer:
         parent.
 
         """
-        for key, value in node.__dict__.items():
+        D = node.__dict__
+        if not any(map(isinstance, D.values(), repeat(DerivedValue))):
+            return
+        for key, value in list(D.items()):
             if isinstance(value, DerivedValue):
                 #just replace with default for key?
                 #print '    fillDerivedValues(%s)' % key
@@ -245,29 +292,10 @@ class Renderer:
             if dtcb:
                 dtcb(node,canvas=canvas,renderer=self)
             #draw the object, or recurse
-            if isinstance(node, Line):
-                self.drawLine(node)
-            elif isinstance(node, Image):
-                self.drawImage(node)
-            elif isinstance(node, Rect):
-                self.drawRect(node)
-            elif isinstance(node, Circle):
-                self.drawCircle(node)
-            elif isinstance(node, Ellipse):
-                self.drawEllipse(node)
-            elif isinstance(node, PolyLine):
-                self.drawPolyLine(node)
-            elif isinstance(node, Polygon):
-                self.drawPolygon(node)
-            elif isinstance(node, Path):
-                self.drawPath(node)
-            elif isinstance(node, String):
-                self.drawString(node)
-            elif isinstance(node, Group):
-                self.drawGroup(node)
-            elif isinstance(node, Wedge):
-                self.drawWedge(node)
-            elif isinstance(node, DirectDraw):
+            meth = _nodeDrawMethod(node.__class__)
+            if meth:
+                getattr(self,meth)(node)
+            elif meth is None:
                 node.drawDirectly(self)
             else:
                 print('DrawingError','Unexpected element %s in drawing!' % str(node))
@@ -289,17 +317,32 @@ class Renderer:
             #here is where we do derived values - this seems to get everything. Touch wood.
             self.fillDerivedValues(node)
             try:
+                #private attributes are not validated so skip setattr
+                D = node.__dict__
                 if hasattr(node,'_canvas'):
                     ocanvas = 1
                 else:
-                    node._canvas = canvas
+                    D['_canvas'] = canvas
                     ocanvas = None
-                node._parent = group
+                D['_parent'] = group
                 self.drawNode(node)
             finally:
                 del node._parent
                 if not ocanvas: del node._canvas
 
+    def drawPointCloud(self, cloud):
+        # by default draw the marker at each point through one reused
+        # translating group; no node is made per point
+        marker = cloud.getMarker()
+        if marker is None: return
+        g = Group(marker)
+        D = g.__dict__
+        D['_parent'] = cloud
+        P = cloud.points
+        for i in range(0, len(P), 2):
+            D['transform'] = (1,0,0,1,P[i],P[i+1])
+            self.drawNode(g)
+
     def drawWedge(self, wedge):
         # by default ask the wedge to make a polygon of itself and draw that!
         #print "drawWedge"
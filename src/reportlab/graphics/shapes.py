@@ -7,6 +7,8 @@ __doc__='''Core of the graphics library - defines Drawing and Shapes'''
 
 import os, sys
 from math import pi, cos, sin, sqrt, radians, floor
+from array import array
+from itertools import chain
 
 from reportlab.platypus import Flowable
 from reportlab.rl_config import shapeChecking, verbose, defaultGraphicsFontName as _baseGFontName, _unset_, decimalSymbol
@@ -591,6 +593,7 @@ class Drawing(Group, Flowable):
             }
 
     _bmModes = _saveModes - {'eps','pdf','ps','py','svg'}
+    drawAsForm = None
 
     _xtraAttrMap = AttrMap(
         width = AttrMapValue(isNumber,desc="Drawing width in points."),
@@ -604,6 +607,7 @@ class Drawing(Group, Flowable):
         renderScale = AttrMapValue(isNumber,desc="Global scaling for rendering"),
         initialFontName = AttrMapValue(isStringOrNone,desc="override the STATE_DEFAULTS value for fontName"),
         initialFontSize = AttrMapValue(isNumberOrNone,desc="override the STATE_DEFAULTS value for fontSize"),
+        drawAsForm = AttrMapValue(NoneOr(isBoolean),desc="if true renderPDF.draw makes a form XObject once per document; None means rl_config.drawingDrawAsForm"),
         )
 
     _attrMap = AttrMap(BASE=Group,
@@ -1398,6 +1402,66 @@ class PolyLine(LineShape):
     def getBounds(self):
         return getPointsBounds(self.points)
 
+class isPointArray(Validator):
+    def test(self,x):
+        return isinstance(x,array) and x.typecode=='d' and len(x)%2==0
+isPointArray = isPointArray()
+
+class PointCloud(Shape):
+    """The same marker shape drawn at each of many points.
+
+    The points are held in a flat array('d') x1, y1, x2, y2 ... xn, yn and
+    the marker (a shape, group or widget) is drawn translated so that its
+    origin lies on each point in turn.  Renderers draw the cloud in one
+    loop without making a node per point, so very large scatter plots
+    stay cheap.  points may be given as a flat sequence of numbers, a
+    sequence of (x,y) pairs or a numpy array of either shape."""
+
+    _attrMap = AttrMap(
+        points = AttrMapValue(isPointArray,desc="array('d') of numbers in the form x1, y1, x2, y2 ... xn, yn"),
+        marker = AttrMapValue(isValidChildOrNone,desc="shape drawn with its origin at each point"),
+        )
+
+    def __init__(self, points=(), marker=None, **kw):
+        self.points = self.asPointArray(points)
+        self.marker = marker
+        self.setProperties(kw)
+
+    @staticmethod
+    def asPointArray(points):
+        if isinstance(points,array) and points.typecode=='d':
+            A = points
+        else:
+            if hasattr(points,'ravel'):
+                points = points.ravel()
+            elif len(points) and isSeq(points[0]):
+                points = chain.from_iterable(points)
+            A = array('d',points)
+        assert len(A) % 2 == 0, 'Point list must have even number of elements!'
+        return A
+
+    def getMarker(self):
+        '''the marker as a drawable shape, or None'''
+        marker = self.marker
+        if isinstance(marker,UserNode):
+            marker = marker.provideNode()
+        return marker
+
+    def copy(self):
+        new = self.__class__(array('d',self.points),self.marker)
+        new.setProperties({k:v for k,v in self.getProperties().items() if k not in ('points','marker')})
+        return new
+
+    def getBounds(self):
+        marker = self.getMarker()
+        P = self.points
+        if marker is None or not P: return None
+        b = marker.getBounds()
+        if b is None: return None
+        X = P[0::2]
+        Y = P[1::2]
+        return (min(X)+b[0], min(Y)+b[1], max(X)+b[2], max(Y)+b[3])
+
 class Hatching(Path):
     '''define a hatching of a set of polygons defined by lists of the form [x0,y0,x1,y1,....,xn,yn]'''
 
@@ -37,7 +37,8 @@ from reportlab.rl_config import canvas_basefontname as _baseFontName, \
                                 hyphenationLang as _hyphenationLang, \
                                 hyphenationMinWordLength as _hyphenationMinWordLength, \
                                 uriWasteReduce as _uriWasteReduce, \
-                                embeddedHyphenation as _embeddedHyphenation
+                                embeddedHyphenation as _embeddedHyphenation, \
+                                lineBreakAlgorithm as _lineBreakAlgorithm
 _baseFontNameB = tt2ps(_baseFontName,1,0)
 _baseFontNameI = tt2ps(_baseFontName,0,1)
 _baseFontNameBI = tt2ps(_baseFontName,1,1)
@@ -157,6 +158,7 @@ class ParagraphStyle(PropertySet):
         #'hyphenationMinWordLength': _hyphenationMinWordLength,
         'embeddedHyphenation': _embeddedHyphenation,
         'uriWasteReduce': _uriWasteReduce,
+        'lineBreakAlgorithm': _lineBreakAlgorithm,  #greedy or optimal (Knuth-Plass)
         }
 
 class LineStyle(PropertySet):
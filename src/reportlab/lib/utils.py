@@ -615,8 +615,11 @@ class ImageReader:
     "Wraps up PIL to get data from bitmaps"
     _cache={}
     _max_image_size = None
+    _fromPIL = False
     def __init__(self, fileName,ident=None):
         if isinstance(fileName,ImageReader):
+            if isinstance(fileName,LazyImageReader):
+                fileName._load()
             self.__dict__ = fileName.__dict__   #borgize
             return
         self._ident = ident
@@ -630,29 +633,38 @@ class ImageReader:
         self._data = None
         if _isPILImage(fileName):
             self._image = fileName
+            self._fromPIL = True
             self.fp = getattr(fileName,'fp',None)
             try:
                 self.fileName = self._image.fileName
             except AttributeError:
                 self.fileName = 'PILIMAGE_%d' % id(self)
         else:
-            try:
-                from reportlab.rl_config import imageReaderFlags
-                if imageReaderFlags != 0:
-                    raise ValueError('imageReaderFlags values other than 0 are no longer supported; all images are interned now')
-                fp = open_for_read(fileName,'b')
-                if not isinstance(fp, BytesIO):
-                    tfp, fp = fp, BytesIO(fp.read())
-                    tfp.close()
-                    del tfp
-                self.fp = fp
-                self._image = self._read_image(self.fp)
-                self._image.fileName = fileName if isinstance(fileName,str) else repr(fileName)
-                self.check_pil_image_size(self._image)
-                if getattr(self._image,'format',None)=='JPEG':
-                    self.jpeg_fh = self._jpeg_fh
-            except:
-                annotateException('\nfileName=%r identity=%s'%(fileName,self.identity()))
+            self._load()
+
+    def _load(self):
+        '''read the file into memory and open it with PIL'''
+        fileName = self.fileName
+        try:
+            from reportlab.rl_config import imageReaderFlags
+            if imageReaderFlags != 0:
+                raise ValueError('imageReaderFlags values other than 0 are no longer supported; all images are interned now')
+            fp = open_for_read(fileName,'b')
+            if not isinstance(fp, BytesIO):
+                tfp, fp = fp, BytesIO(fp.read())
+                tfp.close()
+                del tfp
+            self.fp = fp
+            self._image = self._read_image(self.fp)
+            self._image.fileName = fileName if isinstance(fileName,str) else repr(fileName)
+            self.check_pil_image_size(self._image)
+            fmt = getattr(self._image,'format',None)
+            if fmt=='JPEG':
+                self.jpeg_fh = self._jpeg_fh
+            elif fmt=='PNG':
+                self.png_fh = self._jpeg_fh
+        except:
+            annotateException('\nfileName=%r identity=%s'%(fileName,self.identity()))
 
     def identity(self):
         '''try to return information that will identify the instance'''
@@ -690,11 +702,33 @@ class ImageReader:
     def jpeg_fh(self):
         return None
 
+    def png_fh(self):
+        return None
+
     def getSize(self):
         if (self._width is None or self._height is None):
             self._width, self._height = self._image.size
         return (self._width, self._height)
 
+    def _imageInfo(self):
+        return self._image.info
+
+    def _xobjName(self, mask):
+        "digest identifying the image XObject made from this and mask"
+        fp = self.jpeg_fh() or self.png_fh()
+        if fp:
+            #the file identifies the image so we need not decode it
+            return _digester(fp.getvalue()+str(mask).encode('utf8'))
+        rawdata = self.getRGBData()
+        smask = self._dataA
+        if mask=='auto' and smask:
+            mdata = smask.getRGBData()
+        else:
+            mdata = str(mask)
+        if isUnicode(mdata):
+            mdata = mdata.encode('utf8')
+        return _digester(rawdata+mdata)
+
     def getRGBData(self):
         "Return byte array of RGB data as string"
         try:
@@ -741,8 +775,65 @@ class ImageReader:
         else:
             return None
 
-class LazyImageReader(ImageReader): 
-    pass #now same as base class since we intern everything
+class LazyImageReader(ImageReader):
+    """An ImageReader for named files that only reads the image header when
+    created.  The file is read into memory (and the pixels decoded) when
+    something needs them eg when the image XObject is made; release() then
+    drops the buffers again.  Other sources are handled as by ImageReader."""
+    _lazy = False
+    _format = None
+    def __init__(self, fileName, ident=None):
+        if not isStr(fileName):
+            ImageReader.__init__(self, fileName, ident)
+            return
+        self._ident = ident
+        self.fileName = fileName
+        self._transparent = None
+        self._data = None
+        self._lazy = True
+        try:
+            f = open_for_read(fileName,'b')
+            try:
+                im = Image.open(f)
+                self._width, self._height = im.size
+                self._format = im.format
+                self._info = im.info.copy()
+                self.check_pil_image_size(im)
+            finally:
+                f.close()
+        except:
+            annotateException('\nfileName=%r identity=%s'%(fileName,self.identity()))
+
+    def __getattr__(self, a):
+        if a in ('_image','fp'):
+            self._load()
+            return self.__dict__[a]
+        raise AttributeError('%s instance has no attribute %r' % (self.__class__.__name__,a))
+
+    def jpeg_fh(self):
+        return self._jpeg_fh() if self._format=='JPEG' else None
+
+    def png_fh(self):
+        return self._jpeg_fh() if self._format=='PNG' else None
+
+    def _imageInfo(self):
+        return self._info
+
+    def _xobjName(self, mask):
+        names = self.__dict__.setdefault('_xobjNames',{})
+        k = repr(mask)
+        name = names.get(k)
+        if name is None:
+            name = names[k] = ImageReader._xobjName(self, mask)
+        return name
+
+    def release(self):
+        '''drop the file contents and decoded pixels; they are reloaded if needed'''
+        if not self._lazy: return   #we could not read them again
+        D = self.__dict__
+        for a in ('_image','fp','_dataA','jpeg_fh','png_fh'):
+            D.pop(a,None)
+        self._data = None
 
 def getImageData(imageFileName):
     "Get width, height and RGB pixels from image file.  Wraps PIL"
@@ -48,6 +48,7 @@ Pages = "Pages"
 PDF_VERSION_DEFAULT = (1, 3)
 PDF_SUPPORT_VERSION = dict(     #map keyword to min version that supports it
     transparency = (1, 4),
+    objectStreams = (1, 5),
     )
 
 def pdfdocEnc(x):
@@ -72,7 +73,7 @@ def format(element, document, toplevel=0):
         #use a controlled number formatting routine
         #instead of str, so Jython/Python etc do not differ
         return pdfdocEnc(fp_str(element))
-    elif isBytes(element):
+    elif isinstance(element,(bytes,bytearray,memoryview)):
         return element
     elif isUnicode(element):
         return pdfdocEnc(element)
@@ -107,6 +108,15 @@ class DummyDoc(PDFObject):
     "used to bypass encryption when required"
     encrypt = NoEncryption()
 
+def _discardOutput(f, fn):
+    "close and remove the partial output file fn"
+    import os
+    try:
+        f.close()
+        os.remove(fn)
+    except OSError:
+        pass
+
 ### the global document structure manager
 class PDFDocument(PDFObject):
     # set this to define filters
@@ -119,6 +129,8 @@ class PDFDocument(PDFObject):
                  filename=None,
                  pdfVersion=PDF_VERSION_DEFAULT,
                  lang=None,
+                 streamTo=None,
+                 objectStreams=None,
                  ):
         self._ID = None
         self.objectcounter = 0
@@ -164,6 +176,17 @@ class PDFDocument(PDFObject):
         DD.__Comment__ = "The standard fonts dictionary"
         self.Reference(DD, BasicFonts)
         self.delayedFonts = []
+        # if streamTo is a filename or file like object finished pages are
+        # written to it as they are added; only the shared objects, xref and
+        # trailer remain to be written at save time
+        self._streamTo = streamTo
+        self._streamInPlace = False     #True when a plain save writes straight to the target
+        self._streamFile = None
+        self._streamOut = None
+        self._streamMark = self.objectcounter
+        self._streamPending = []
+        # pack non stream objects into compressed object streams (PDF 1.5)
+        self.objectStreams = rl_config.pdfObjectStreams if objectStreams is None else objectStreams
 
     def setCompression(self, onoff):
         # XXX: maybe this should also set self.defaultStreamFilters?
@@ -189,10 +212,8 @@ class PDFDocument(PDFObject):
         self._ID = (b'\n['+IDs+IDs+b']\n% ReportLab generated PDF document -- digest (http://www.reportlab.com)\n')
         return self._ID
 
-    def SaveToFile(self, filename, canvas):
-        if getattr(self,'_savedToFile',False):
-            raise RuntimeError("class %s instances can only be saved once" % self.__class__.__name__)
-        self._savedToFile = True
+    def _openOutput(self, filename):
+        "return (f, filename, myfile) for a filename or a file like object"
         if hasattr(getattr(filename, "write",None),'__call__'):
             myfile = 0
             f = filename
@@ -208,14 +229,51 @@ class PDFDocument(PDFObject):
             f = open(filename, "wb")
         else:
             raise TypeError('Cannot use %s as a filename or file' % repr(filename)) 
+        return f, filename, myfile
+
+    def _openStreamOutput(self, filename):
+        '''as _openOutput, but a named file is written under a temporary name
+        which replaces filename only when the document is complete'''
+        if not isStr(filename):
+            return self._openOutput(filename)
+        import os, weakref
+        filename = makeFileName(filename)
+        tfn = '%s.%d.tmp' % (filename,os.getpid())
+        f = open(tfn, "wb")
+        #remove the partial output if we fail or are never saved
+        self._streamTemp = tfn, weakref.finalize(self,_discardOutput,f,tfn)
+        return f, filename, 1
 
-        data = self.GetPDFData(canvas)
-        if isUnicode(data):
-            data = data.encode('latin1')
-        f.write(data)
+    def SaveToFile(self, filename, canvas):
+        if getattr(self,'_savedToFile',False):
+            raise RuntimeError("class %s instances can only be saved once" % self.__class__.__name__)
+        self._savedToFile = True
+        if self._streamTo is None and not getattr(self,'_digiSigs',None):
+            #write the objects straight to the output rather than joining them first;
+            #the target is opened in place as for a non streamed save
+            self._streamTo = filename
+            self._streamInPlace = True
+        if self._streamTo is not None:
+            try:
+                self.GetPDFData(canvas)     #writes the remaining objects directly to the output
+            except:
+                temp = getattr(self,'_streamTemp',None)
+                if temp: temp[1]()
+                raise
+            f, filename, myfile = self._streamOut
+        else:
+            f, filename, myfile = self._openOutput(filename)
+            data = self.GetPDFData(canvas)
+            if isUnicode(data):
+                data = data.encode('latin1')
+            f.write(data)
         if myfile:
             f.close()
             import os
+            temp = getattr(self,'_streamTemp',None)
+            if temp:
+                temp[1].detach()
+                os.replace(temp[0],filename)
             if os.name=='mac':
                 from reportlab.lib.utils import markfilename
                 markfilename(filename) # do platform specific file junk
@@ -279,6 +337,79 @@ class PDFDocument(PDFObject):
         self.Pages.addPage(page)
         self.pageCounter += 1
         self.inObject = None
+        if self._streamTo is not None:
+            self._streamPages(page)
+
+    def _startStream(self):
+        "open the streaming output on first use and return its PDFFile"
+        File = self._streamFile
+        if File is None:
+            if getattr(self,'_digiSigs',None):
+                raise PDFError("digital signatures cannot be used when streaming pages")
+            self._streamOut = (self._openOutput if self._streamInPlace else self._openStreamOutput)(self._streamTo)
+            # the document ID is fixed from here on
+            self.encrypt.prepare(self)
+            File = self._streamFile = PDFFile(self._pdfVersion,self._streamOut[0])
+            File.pdfVersion = self._pdfVersion
+        return File
+
+    def _writeObject(self, File, oid, packed=None):
+        '''format the indirect object oid into File and record its offset;
+        if packed is a list non stream objects are appended to it instead'''
+        obj = self.idToObject[oid]
+        IOf = PDFIndirectObject(oid, obj).formatParts(self)
+        if packed is not None and len(IOf)==3 and b'\nstream\n' not in IOf[1]:
+            packed.append((oid,b''.join(IOf[1:])[:-7]))    #strip 'n v obj\n' & 'endobj\n'
+            return
+        # add a comment to the PDF output
+        if not rl_config.invariant and rl_config.pdfComments:
+            try:
+                classname = obj.__class__.__name__
+            except:
+                classname = ascii(obj)
+            File.add("%% %s: class %s \n" % (ascii(oid), classname[:50]))
+        if getattr(self,'_digiSigs',None):
+            IOf = [b''.join(IOf)]
+        #the parts (eg a large image stream) are written without joining them
+        self.idToOffset[oid] = File.add(IOf[0])
+        for part in IOf[1:]:
+            File.add(part)
+
+    def _streamPages(self, page):
+        '''write finished pages, their content streams and any new images to
+        the output and release them. Pages which refer to objects that are
+        not yet defined (eg forward references to forms) are retried later.'''
+        File = self._startStream()
+        idToObject = self.idToObject
+        pages = self.Pages.pages
+        pending = self._streamPending
+        pending.append((len(pages)-1,page))
+        P = []
+        for i, page in pending:
+            oid = page.__InternalName__
+            try:
+                self._writeObject(File, oid)
+            except KeyError:
+                P.append((i,page))
+                continue
+            idToObject[oid] = _streamedObject
+            pages[i] = PDFObjectReference(oid)
+            cid = getattr(page.Contents,'__InternalName__',None)
+            if cid is not None and cid not in self.idToOffset:
+                self._writeObject(File, cid)
+                idToObject[cid] = _streamedObject
+        self._streamPending = P
+
+        #images are complete when registered so they can go now
+        numberToId = self.numberToId
+        for n in range(self._streamMark+1, self.objectcounter+1):
+            oid = numberToId[n]
+            obj = idToObject[oid]
+            if isinstance(obj,PDFImageXObject) and oid not in self.idToOffset:
+                self._writeObject(File, oid)
+                # keep the object for reuse and its size, but not the data
+                obj.streamContent = None
+        self._streamMark = self.objectcounter
 
     def addForm(self, name, form):
         """add a Form XObject."""
@@ -388,8 +519,20 @@ class PDFDocument(PDFObject):
     def format(self):
         # register the Catalog/INfo and then format the objects one by one until exhausted
         # (possible infinite loop if there is a bug that continually makes new objects/refs...)
-        # Prepare encryption
-        self.encrypt.prepare(self)
+        # object streams are not used with encryption or signatures
+        objectStreams = (self.objectStreams and isinstance(self.encrypt,NoEncryption)
+                            and not getattr(self,'_digiSigs',None))
+        if objectStreams:
+            self.ensureMinPdfVersion('objectStreams')
+        streaming = self._streamTo is not None
+        if streaming:
+            File = self._startStream()
+            if self._pdfVersion>File.pdfVersion:
+                # the header has already been written
+                self.Catalog.Version = PDFName("%s.%s" % self._pdfVersion)
+        else:
+            # Prepare encryption
+            self.encrypt.prepare(self)
         cat = self.Catalog
         info = self.info
         self.Reference(cat)
@@ -408,31 +551,25 @@ class PDFDocument(PDFObject):
         idToOf = self.idToOffset
         ### note that new entries may be "appended" DURING FORMATTING
         # __accum__ allows objects to know where they are in the file etc etc
-        self.__accum__ = File = PDFFile(self._pdfVersion) # output collector
+        if not streaming:
+            File = PDFFile(self._pdfVersion) # output collector
+        self.__accum__ = File
+        packed = [] if objectStreams else None
         while True:
             counter += 1 # do next object...
             if counter not in numbertoid: break
             oid = numbertoid[counter]
-            #printidToOb
-            obj = idToOb[oid]
-            IO = PDFIndirectObject(oid, obj)
-            # register object number and version
-            IOf = IO.format(self)
-            # add a comment to the PDF output
-            if not rl_config.invariant and rl_config.pdfComments:
-                try:
-                    classname = obj.__class__.__name__
-                except:
-                    classname = ascii(obj)
-                File.add("%% %s: class %s \n" % (ascii(oid), classname[:50]))
-            offset = File.add(IOf)
-            idToOf[oid] = offset
+            if oid not in idToOf:   #streamed objects are already written
+                self._writeObject(File, oid, packed)
             ids.append(oid)
         del self.__accum__
         # sanity checks (must happen AFTER formatting)
         lno = len(numbertoid)
         if counter-1!=lno:
             raise ValueError("counter %s doesn't match number to id dictionary %s" %(counter, lno))
+        if objectStreams:
+            self._formatObjectStreams(File, ids, packed)
+            return File.format(self)
         # now add the xref
         xref = PDFCrossReferenceTable()
         xref.addsection(0, ids)
@@ -451,9 +588,34 @@ class PDFDocument(PDFObject):
         File.add(trailerf)
         for ds in getattr(self,'_digiSigs',[]):
             ds.sign(File)
-        # return string format for pdf file
+        # return string format for pdf file (empty if streamed)
         return File.format(self)
 
+    def _formatObjectStreams(self, File, ids, packed):
+        "write the packed objects as object streams followed by a cross reference stream"
+        stmIndex = {}
+        n = PDFObjectStream.maxObjects
+        for i in range(0,len(packed),n):
+            objs = packed[i:i+n]
+            stm = PDFObjectStream([(self.idToObjectNumberAndVersion[oid][0],c) for oid,c in objs])
+            soid = self.Reference(stm).name
+            self._writeObject(File, soid)
+            ids.append(soid)
+            snum = self.idToObjectNumberAndVersion[soid][0]
+            for j,(oid,c) in enumerate(objs):
+                stmIndex[oid] = snum, j
+        xref = PDFCrossReferenceStream(ids, stmIndex,
+                    Root = self.Reference(self.Catalog),
+                    Info = self.Reference(self.info),
+                    ID = self.ID(),
+                    )
+        xoid = self.Reference(xref).name
+        ids.append(xoid)
+        # the cross reference stream includes its own position
+        xref.startxref = self.idToOffset[xoid] = File.offset
+        File.add(PDFIndirectObject(xoid, xref).format(self))
+        File.add(pdfdocEnc('startxref\n%s\n%%%%EOF\n' % xref.startxref))
+
     def hasForm(self, name):
         """test for existence of named form"""
         internalname = xObjectName(name)
@@ -744,17 +906,38 @@ class ViewerPreferencesPDFDictionary(CheckedPDFDictionary):
 
 # stream filters are objects to support round trip and
 # possibly in the future also support parameters
+_zlibStrategies = dict(default=zlib.Z_DEFAULT_STRATEGY, filtered=zlib.Z_FILTERED,
+                        huffman=zlib.Z_HUFFMAN_ONLY, rle=zlib.Z_RLE, fixed=zlib.Z_FIXED)
+def zlibCompress(data, kind=None):
+    '''compress data with the zlib level and strategy configured for kind
+    (page, image or font see rl_config.pageZlibLevel etc); None means defaults'''
+    if kind is None:
+        return zlib.compress(data)
+    level = getattr(rl_config,kind+'ZlibLevel')
+    strategy = _zlibStrategies[getattr(rl_config,kind+'ZlibStrategy')]
+    if strategy==zlib.Z_DEFAULT_STRATEGY:
+        return zlib.compress(data,level)
+    c = zlib.compressobj(level,zlib.DEFLATED,zlib.MAX_WBITS,zlib.DEF_MEM_LEVEL,strategy)
+    return c.compress(data)+c.flush()
+
+def zlibSettings(kind):
+    "the zlib parameters used for kind (for cache keys)"
+    return getattr(rl_config,kind+'ZlibLevel'), getattr(rl_config,kind+'ZlibStrategy')
+
 class PDFStreamFilterZCompress:
     pdfname = "FlateDecode"
+    def __init__(self, kind=None):
+        self.kind = kind
     def encode(self, text):
         if isUnicode(text):
             text = text.encode('utf8')
-        return zlib.compress(text)
+        return zlibCompress(text,self.kind)
     def decode(self, encoded):
         return zlib.decompress(encoded)
 
-# need only one of these, unless we implement parameters later
 PDFZCompress = PDFStreamFilterZCompress()
+PDFZCompressPage = PDFStreamFilterZCompress('page')
+PDFZCompressFont = PDFStreamFilterZCompress('font')
 
 class PDFStreamFilterBase85Encode:
     pdfname = "ASCII85Decode"
@@ -781,6 +964,10 @@ class PDFStream(PDFObject):
         self.content = content
         self.filters = filters
     def format(self, document):
+        return b''.join(self._formatParts(document))
+
+    def _formatParts(self, document):
+        "return the formatted stream as a list of parts so the content need not be copied"
         dictionary = self.dictionary
         # copy it for modification
         dictionary = PDFDictionary(dictionary.dict.copy())
@@ -810,7 +997,7 @@ class PDFStream(PDFObject):
         fc = format(content, document)
         dictionary["Length"] = len(content)
         fd = format(dictionary, document)
-        return fd+b'\nstream\n'+fc+b'endstream\n'
+        return [fd+b'\nstream\n', fc, b'endstream\n']
 
 def teststream(content=None):
     #content = "" # test
@@ -860,14 +1047,24 @@ class PDFIndirectObject(PDFObject):
         self.name = name
         self.content = content
     def format(self, document):
+        return b''.join(self.formatParts(document))
+
+    def formatParts(self, document):
+        "return the formatted object as a list of byte strings"
         name = self.name
         n, v = document.idToObjectNumberAndVersion[name]
         # set encryption parameters
         document.encrypt.register(n, v)
-        fcontent = format(self.content, document, toplevel=1)   # yes this is at top level
-        return (pdfdocEnc("%s %s obj\n"%(n,v))
-            +fcontent+ (b'' if fcontent.endswith(b'\n') else b'\n')
-            +b'endobj\n')
+        content = self.content
+        formatParts = getattr(content,'_formatParts',None)
+        if formatParts:
+            parts = formatParts(document)
+            if not rl_config.invariant and rl_config.pdfComments and hasattr(content, __Comment__):
+                parts[0] = pdfdocEnc("%% %s\n" % content.__Comment__)+parts[0]
+        else:
+            parts = [format(content, document, toplevel=1)]   # yes this is at top level
+        return ([pdfdocEnc("%s %s obj\n"%(n,v))] + parts
+                + [b'endobj\n' if parts[-1].endswith(b'\n') else b'\nendobj\n'])
 
 class PDFObjectReference(PDFObject):
     def __init__(self, name):
@@ -880,9 +1077,10 @@ class PDFObjectReference(PDFObject):
 
 class PDFFile(PDFObject):
     ### just accumulates strings: keeps track of current offset
-    def __init__(self,pdfVersion=PDF_VERSION_DEFAULT):
+    ### if f is given the strings are written to it immediately
+    def __init__(self,pdfVersion=PDF_VERSION_DEFAULT,f=None):
         self.strings = []
-        self.write = self.strings.append
+        self.write = f.write if f is not None else self.strings.append
         self.offset = 0
         ### chapter 5
         # Following Ken Lunde's advice and the PDF spec, this includes
@@ -908,6 +1106,12 @@ class PDFFile(PDFObject):
     def format(self, document):
         return b''.join(self.strings)
 
+class _PDFStreamedObject(PDFObject):
+    "stands in for an indirect object that has already been written out"
+    def format(self, document):
+        raise PDFError("attempt to reformat an object that has already been streamed")
+_streamedObject = _PDFStreamedObject()
+
 class PDFCrossReferenceSubsection(PDFObject):
     def __init__(self, firstentrynumber, idsequence):
         self.firstentrynumber = firstentrynumber
@@ -983,6 +1187,60 @@ class PDFTrailer(PDFObject):
                 ]
                 )
 
+class PDFObjectStream(PDFObject):
+    "compressed container for non stream objects (PDF 1.5 section 3.4.6)"
+    maxObjects = 100
+    def __init__(self, objects):
+        self.objects = objects  #list of (object number, formatted object)
+    def format(self, document):
+        H = []
+        B = []
+        offset = 0
+        for n, c in self.objects:
+            H.append(b'%d %d' % (n, offset))
+            B.append(c)
+            offset += len(c)+1
+        H = b' '.join(H)+b'\n'
+        S = PDFStream(content=H+b'\n'.join(B)+b'\n', filters=[PDFZCompress])
+        D = S.dictionary
+        D["Type"] = PDFName("ObjStm")
+        D["N"] = len(self.objects)
+        D["First"] = len(H)
+        return S.format(document)
+
+class PDFCrossReferenceStream(PDFObject):
+    '''replaces the cross reference table and trailer (PDF 1.5 section 3.4.7)
+    objects in stmIndex live in an object stream, all others have a file offset'''
+    def __init__(self, ids, stmIndex, Root=None, Info=None, ID=None):
+        self.ids = ids
+        self.stmIndex = stmIndex
+        self.startxref = None
+        dict = self.dict = PDFDictionary()
+        for (n,v) in [("Root", Root), ("Info", Info), ("ID", ID)]:
+            if v is not None:
+                dict[n] = v
+    def format(self, document):
+        idToNV = document.idToObjectNumberAndVersion
+        idToOffset = document.idToOffset
+        stmIndex = self.stmIndex
+        E = [None]*(len(self.ids)+1)
+        E[0] = (0,0,65535)
+        for id in self.ids:
+            if id in stmIndex:
+                E[idToNV[id][0]] = (2,)+stmIndex[id]
+            else:
+                E[idToNV[id][0]] = (1,idToOffset[id],0)
+        if None in E:
+            raise ValueError("cross reference stream object numbers are not contiguous")
+        w = max(1,(max(e[1] for e in E).bit_length()+7)//8)
+        content = b''.join(t.to_bytes(1,'big')+f1.to_bytes(w,'big')+f2.to_bytes(2,'big') for t,f1,f2 in E)
+        S = PDFStream(self.dict.copy(), content, filters=[PDFZCompress])
+        D = S.dictionary
+        D["Type"] = PDFName("XRef")
+        D["Size"] = len(E)
+        D["W"] = PDFArrayCompact([1,w,2])
+        return S.format(document)
+
 #### XXXX skipping incremental update,
 #### encryption
 
@@ -998,7 +1256,8 @@ class PDFCatalog(PDFObject):
                 }
     __NoDefault__ = """
         Dests Outlines Pages Threads AcroForm Names OpenAction PageMode URI
-        ViewerPreferences PageLabels PageLayout JavaScript StructTreeRoot SpiderInfo""".split()
+        ViewerPreferences PageLabels PageLayout JavaScript StructTreeRoot SpiderInfo
+        Version""".split()
     __Refs__ = __NoDefault__
 
     def format(self, document):
@@ -1125,7 +1384,7 @@ class PDFPage(PDFCatalog):
             else:
                 S = PDFStream()
                 if self.compression:
-                    S.filters = rl_config.useA85 and [PDFBase85Encode, PDFZCompress] or [PDFZCompress]
+                    S.filters = rl_config.useA85 and [PDFBase85Encode, PDFZCompressPage] or [PDFZCompressPage]
                 S.content = stream
                 S.__Comment__ = "page stream"
                 self.Contents = S
@@ -1944,17 +2203,18 @@ class PDFTrueTypeFont(PDFType1Font):
 ##    Subtype = "Type3"
 ##    local_attributes = "FirstChar LastChar Widths CharProcs FontBBox FontMatrix Resources Encoding".split()
 ##
-##class PDFType0Font(PDFType1Font):
-##    Subtype = "Type0"
-##    local_attributes = "DescendantFonts Encoding".split(
-##
+class PDFType0Font(PDFType1Font):
+    Subtype = "Type0"
+    local_attributes = "DescendantFonts Encoding ToUnicode".split()
+
 ##class PDFCIDFontType0(PDFType1Font):
 ##    Subtype = "CIDFontType0"
 ##    local_attributes = "CIDSystemInfo FontDescriptor DW W DW2 W2 Registry Ordering Supplement".split()
 ##
-##class PDFCIDFontType0(PDFType1Font):
-##    Subtype = "CIDFontType2"
-##    local_attributes = "BaseFont CIDToGIDMap CIDSystemInfo FontDescriptor DW W DW2 W2".split()
+class PDFCIDFontType2(PDFType1Font):
+    Subtype = "CIDFontType2"
+    local_attributes = "CIDToGIDMap CIDSystemInfo FontDescriptor DW W DW2 W2".split()
+
 ##
 ##class PDFEncoding(PDFType1Font):
 ##    Type = "Encoding"
@@ -2022,7 +2282,7 @@ class PDFFormXObject(PDFObject):
                 resources.XObject = self.XObjects
             self.Resources=resources
         if self.compression:
-            self.Contents.filters = rl_config.useA85 and [PDFBase85Encode, PDFZCompress] or [PDFZCompress]
+            self.Contents.filters = rl_config.useA85 and [PDFBase85Encode, PDFZCompressPage] or [PDFZCompressPage]
         sdict = self.Contents.dictionary
         sdict["Type"] = PDFName("XObject")
         sdict["Subtype"] = PDFName("Form")
@@ -2078,11 +2338,10 @@ class PDFImageXObject(PDFObject):
             ext = os.path.splitext(source)[1].lower()
             src = open_for_read(source)
             try:
-                if not(ext in ('.jpg', '.jpeg') and self.loadImageFromJPEG(src)):
-                    if rl_config.useA85:
-                        self.loadImageFromA85(src)
-                    else:
-                        self.loadImageFromRaw(src)
+                if not((ext in ('.jpg', '.jpeg') and self.loadImageFromJPEG(src))
+                        or (ext=='.png' and self.loadImageFromPNG(src))):
+                    from reportlab.lib.utils import ImageReader
+                    self.loadImageFromSRC(ImageReader(src))
             finally:
                 src.close()
 
@@ -2127,6 +2386,44 @@ class PDFImageXObject(PDFObject):
         self.mask = None
         return True
 
+    def loadImageFromPNG(self,imageFile):
+        '''copy the deflate stream of a PNG straight into the XObject; the PNG
+        row filters are undone by the matching FlateDecode predictor.  Returns
+        False (leaving imageFile rewound) if the image must be decoded eg because
+        it is interlaced or has alpha that needs splitting into an SMask'''
+        info = pdfutils.readPNGInfo(imageFile.read())
+        imageFile.seek(0)
+        if not info or info['interlace'] or info['compression'] or info['filter']:
+            return False
+        colorType = info['colorType']
+        mask = self.mask
+        if info['bitDepth']!=8 or colorType in (4,6) or (mask=='auto' and 'transparency' in info):
+            return False
+        if colorType==0:
+            colors, colorSpace = 1, 'DeviceGray'
+        elif colorType==2:
+            colors, colorSpace = 3, 'DeviceRGB'
+        elif colorType==3 and info.get('palette') and mask in (None,'auto'):
+            colors, colorSpace = 1, 'DeviceRGB'
+            self._palette = info['palette']
+        else:
+            return False
+        self.width = info['width']
+        self.height = info['height']
+        self.bitsPerComponent = 8
+        self.colorSpace = colorSpace
+        self._decodeParms = dict(Predictor=15, Colors=colors, BitsPerComponent=8, Columns=self.width)
+        if rl_config.useA85:
+            self.streamContent = asciiBase85Encode(info['idat'])
+            self._filters = 'ASCII85Decode','FlateDecode' #'A85','Fl'
+        else:
+            self.streamContent = info['idat']
+            self._filters = 'FlateDecode', #'Fl'
+        if mask=='auto':
+            self.mask = None
+        self._checkTransparency(None)
+        return True
+
     def loadImageFromRaw(self,source):
         IMG=[]
         imagedata = pdfutils.makeRawImage(source,IMG=IMG,detectJpeg=True)
@@ -2163,11 +2460,13 @@ class PDFImageXObject(PDFObject):
         fp = im.jpeg_fh()
         if fp:
             self.loadImageFromJPEG(fp)
-        else:
+            return
+        fp = im.png_fh()
+        if not (fp and self.loadImageFromPNG(fp)):
             self.width, self.height = im.getSize()
             raw = im.getRGBData()
             #assert len(raw) == self.width*self.height, "Wrong amount of data for image expected %sx%s=%s got %s" % (self.width,self.height,self.width*self.height,len(raw))
-            self.streamContent = zlib.compress(raw)
+            self.streamContent = zlibCompress(raw,'image')
             if rl_config.useA85:
                 self.streamContent = asciiBase85Encode(self.streamContent)
                 self._filters = 'ASCII85Decode','FlateDecode' #'A85','Fl'
@@ -2178,6 +2477,9 @@ class PDFImageXObject(PDFObject):
             self._checkTransparency(im)
 
     def format(self, document):
+        return b''.join(self._formatParts(document))
+
+    def _formatParts(self, document):
         S = PDFStream(content = self.streamContent)
         dict = S.dictionary
         dict["Type"] = PDFName("XObject")
@@ -2185,16 +2487,175 @@ class PDFImageXObject(PDFObject):
         dict["Width"] = self.width
         dict["Height"] = self.height
         dict["BitsPerComponent"] = self.bitsPerComponent
-        dict["ColorSpace"] = PDFName(self.colorSpace)
+        palette = getattr(self,'_palette',None)
+        if palette:
+            dict["ColorSpace"] = PDFArray([PDFName("Indexed"),PDFName(self.colorSpace),len(palette)//3-1,PDFText(palette)])
+        else:
+            dict["ColorSpace"] = PDFName(self.colorSpace)
         if self.colorSpace=='DeviceCMYK' and getattr(self,'_dotrans',0):
             dict["Decode"] = PDFArray([1,0,1,0,1,0,1,0])
         elif getattr(self,'_decode',None):
             dict["Decode"] = PDFArray(self._decode)
         dict["Filter"] = PDFArray(map(PDFName,self._filters))
+        decodeParms = getattr(self,'_decodeParms',None)
+        if decodeParms:
+            decodeParms = PDFDictionary(decodeParms)
+            dict["DecodeParms"] = PDFArray([PDFnull,decodeParms]) if len(self._filters)>1 else decodeParms
         dict["Length"] = len(self.streamContent)
         if self.mask: dict["Mask"] = PDFArray(self.mask)
         if getattr(self,'smask',None): dict["SMask"] = self.smask
-        return S.format(document)
+        return S._formatParts(document)
+
+class ImageXObjectCache:
+    """process wide cache of finished image XObjects keyed by the content of
+    their source (see rl_config.imageXObjectCacheSize/imageXObjectCacheDir).
+
+    Values are the attributes of a loaded PDFImageXObject (compressed stream,
+    dictionary values and any soft mask) so a repeated image costs a lookup
+    instead of a decode, digest and deflate.  The in memory part is an LRU
+    limited to maxSize bytes of stream data; the optional directory holds one
+    marshalled file per image and is shared between processes."""
+    version = 2     #of the cached values; change when PDFImageXObject's attributes do
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._size = 0
+        self._fileKeys = {}
+        self.hits = self.misses = 0
+
+    @property
+    def maxSize(self):
+        return rl_config.imageXObjectCacheSize
+
+    @property
+    def cacheDir(self):
+        return rl_config.imageXObjectCacheDir
+
+    @property
+    def enabled(self):
+        return bool(self.maxSize or self.cacheDir)
+
+    def clear(self):
+        self._data.clear()
+        self._size = 0
+        self._fileKeys.clear()
+        self.hits = self.misses = 0
+
+    def _fileKey(self, fn):
+        import os
+        try:
+            st = os.stat(fn)
+        except (OSError, TypeError, ValueError):
+            f = open_for_read(fn,'b')
+            try:
+                return _digester(f.read())
+            finally:
+                f.close()
+        k = fn, st.st_size, st.st_mtime
+        key = self._fileKeys.get(k)
+        if key is None:
+            with open(fn,'rb') as f:
+                key = self._fileKeys[k] = _digester(f.read())
+        return key
+
+    def key(self, source, mask):
+        """return a content key for source (a filename or ImageReader) or None
+        if the image cannot be identified without decoding it"""
+        import os
+        if isinstance(source,(str,os.PathLike)):
+            skey = self._fileKey(os.fspath(source))
+        else:
+            fp = getattr(source,'fp',None)
+            if getattr(source,'_fromPIL',True) or not hasattr(fp,'getvalue'):
+                return None #a PIL image or something else we cannot identify cheaply
+            skey = getattr(source,'_xobjCacheKey',None)
+            if skey is None:
+                skey = source._xobjCacheKey = _digester(fp.getvalue())
+        return _digester(('%s|%r|%s|%r|%d' % (skey,mask,rl_config.useA85,zlibSettings('image'),self.version)).encode('latin1'))
+
+    def _path(self, key):
+        import os
+        return os.path.join(self.cacheDir,key+'.xobj')
+
+    def get(self, key):
+        v = self._data.get(key)
+        if v is not None:
+            self._data.move_to_end(key)
+        elif self.cacheDir:
+            import marshal
+            try:
+                with open(self._path(key),'rb') as f:
+                    v = marshal.load(f)
+            except (OSError, EOFError, ValueError, TypeError):
+                v = None
+            else:
+                self._store(key,v)
+        if v is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return v
+
+    @staticmethod
+    def _vSize(v):
+        n = len(v['streamContent'])
+        smask = v.get('_smask')
+        if smask: n += len(smask['streamContent'])
+        return n
+
+    def _store(self, key, v):
+        maxSize = self.maxSize
+        n = self._vSize(v)
+        if not maxSize or n>maxSize: return
+        data = self._data
+        data[key] = v
+        self._size += n
+        while self._size>maxSize:
+            self._size -= self._vSize(data.popitem(last=False)[1])
+
+    def put(self, key, v):
+        self._store(key,v)
+        if self.cacheDir:
+            import os, marshal
+            fn = self._path(key)
+            tfn = '%s.%d' % (fn,os.getpid())
+            try:
+                os.makedirs(self.cacheDir,exist_ok=True)
+                with open(tfn,'wb') as f:
+                    marshal.dump(v,f)
+                os.replace(tfn,fn)
+            except (OSError, ValueError):
+                try:
+                    os.remove(tfn)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _state(imgObj):
+        v = imgObj.__dict__.copy()
+        v.pop('name',None)
+        smask = v.get('_smask')
+        if smask:
+            v['_smask'] = smask.__dict__.copy()
+        return v
+
+    def imageXObject(self, key, name, source, mask=None):
+        "return a PDFImageXObject for source, from the cache if possible"
+        v = self.get(key)
+        if v is None:
+            imgObj = PDFImageXObject(name, source, mask=mask)
+            self.put(key,self._state(imgObj))
+        else:
+            imgObj = PDFImageXObject(name)
+            imgObj.__dict__.update(v)
+            smask = v.get('_smask')
+            if smask:
+                imgObj._smask = PDFImageXObject(smask['name'])
+                imgObj._smask.__dict__.update(smask)
+        imgObj.name = name
+        return imgObj
+
+imageXObjectCache = ImageXObjectCache()
 
 class PDFSeparationCMYKColor:
     def __init__(self, cmyk):
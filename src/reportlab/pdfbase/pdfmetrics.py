@@ -23,6 +23,8 @@ from reportlab.pdfbase import _fontdata
 from reportlab.lib.logger import warnOnce
 from reportlab.lib.utils import rl_isfile, rl_glob, rl_isdir, open_and_read, open_and_readlines, findInPaths, isSeq, isStr
 from reportlab.rl_config import defaultEncoding, T1SearchPath
+from reportlab import rl_config
+from collections import OrderedDict
 from reportlab.lib.rl_accel import unicode2T1, instanceStringWidthT1
 from reportlab.pdfbase import rl_codecs
 _notdefChar = b'n'
@@ -41,6 +43,60 @@ class FontError(Exception):
 class FontNotFoundError(Exception):
     pass
 
+class StringWidthCache:
+    """process wide LRU cache of string widths keyed by (fontName, fontSize,
+    encoding, text) and limited to rl_config.stringWidthCacheSize entries.
+
+    Layout measures the same words over and over, in every paragraph and in
+    every wrap of a paragraph; hits and misses count the lookups so the cache
+    can be sized.  Registering a font empties it."""
+    def __init__(self):
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    @property
+    def maxSize(self):
+        return rl_config.stringWidthCacheSize
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def stringWidths(self, texts, fontName, fontSize, encoding='utf8'):
+        "cached equivalent of stringWidths(texts, fontName, fontSize, encoding)"
+        maxSize = self.maxSize
+        if not maxSize:
+            return stringWidths(texts, fontName, fontSize, encoding)
+        data = self._data
+        get = data.get
+        touch = data.move_to_end
+        R = []
+        M = {}      #missing text --> its positions
+        for i,t in enumerate(texts):
+            k = fontName, fontSize, encoding, t
+            w = get(k)
+            if w is None:
+                M.setdefault(t,[]).append(i)
+            else:
+                touch(k)
+            R.append(w)
+        if M:
+            for (t,I), w in zip(M.items(),stringWidths(list(M), fontName, fontSize, encoding)):
+                data[fontName, fontSize, encoding, t] = w
+                for i in I:
+                    R[i] = w
+            while len(data)>maxSize:
+                data.popitem(last=False)
+            self.misses += len(M)
+        self.hits += len(R)-len(M)
+        return R
+
+    def stringWidth(self, text, fontName, fontSize, encoding='utf8'):
+        "cached equivalent of stringWidth(text, fontName, fontSize, encoding)"
+        return self.stringWidths((text,), fontName, fontSize, encoding)[0]
+
+stringWidthCache = StringWidthCache()
+
 def parseAFMFile(afmFileName):
     """Quick and dirty - gives back a top-level dictionary
     with top-level items, and a 'widths' key containing
@@ -361,6 +417,26 @@ class Font:
     def stringWidth(self, text, size, encoding='utf8'):
         return instanceStringWidthT1(self, text, size, encoding=encoding)
 
+    def stringWidths(self, texts, size, encoding='utf8'):
+        '''return the list of widths of a sequence of texts'''
+        return _stringWidths(self, texts, size, encoding)
+
+    def _codeWidths(self):
+        '''return (dict of code point to width, default width) for the characters
+        measured directly by this font; None means measure others individually'''
+        enc = self.encName
+        W = {}
+        if 'UCS-2' not in enc:
+            for i,w in enumerate(self.widths):
+                b = bytes((i,))
+                try:
+                    u = b.decode(enc)
+                    if len(u)==1 and u.encode(enc)==b:
+                        W[ord(u)] = w
+                except (UnicodeError, LookupError):
+                    pass
+        return W, None
+
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, self.face.name)
 
@@ -612,6 +688,7 @@ def registerFont(font):
     "Registers a font, including setting up info for accelerated stringWidth"
     #assert isinstance(font, Font), 'Not a Font: %s' % font
     fontName = font.fontName
+    stringWidthCache._data.clear()
     if font._dynamicFont:
         faceName = font.face.name
         if fontName not in _fonts:
@@ -732,6 +809,67 @@ def stringWidth(text, fontName, fontSize, encoding='utf8'):
     not accelerated as fast enough because of instanceStringWidthT1/TTF"""
     return getFont(fontName).stringWidth(text, fontSize, encoding=encoding)
 
+def stringWidths(texts, fontName, fontSize, encoding='utf8'):
+    """Compute the widths in points of a sequence of strings in one call"""
+    font = getFont(fontName)
+    if hasattr(font,'stringWidths'):
+        return font.stringWidths(texts, fontSize, encoding=encoding)
+    return [font.stringWidth(t, fontSize, encoding=encoding) for t in texts]
+
+_numpy = None
+def _getNumpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+_stringWidthsMinBatch = 24      #below this numpy's overhead exceeds the accelerated per string loop
+_widthsTableMax = 0x10000       #code points at or above this are measured by font.stringWidth
+def _stringWidths(font, texts, size, encoding='utf8'):
+    '''batch version of font.stringWidth. With numpy available the texts are
+    measured together from a per font table of widths indexed by code point;
+    cumulative sums of the looked up widths give each text's width'''
+    if len(texts)<_stringWidthsMinBatch or not _getNumpy():
+        return [font.stringWidth(t, size, encoding) for t in texts]
+    np = _numpy
+    table = font.__dict__.get('_widthsTable')
+    if table is None:
+        W, dw = font._codeWidths()
+        m = max(W) if W else -1
+        if m<_widthsTableMax:
+            table = np.full(m+2, np.nan if dw is None else dw)
+        else:
+            #keep the table to the BMP; the last entry marks higher code points as missing
+            W = {k:v for k,v in W.items() if k<_widthsTableMax}
+            table = np.full(_widthsTableMax+1, np.nan if dw is None else dw)
+            table[-1] = np.nan
+        if W:
+            table[np.fromiter(W.keys(),dtype=np.intp,count=len(W))] = np.fromiter(W.values(),dtype=float,count=len(W))
+        font._widthsTable = table
+    texts = [t if isinstance(t,str) else t.decode(encoding or 'utf8') for t in texts]
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le','surrogatepass'),dtype='<u4')
+    widths = table[np.minimum(codes,len(table)-1)]
+    lens = np.fromiter(map(len,texts),dtype=np.intp,count=len(texts))
+    ends = np.cumsum(lens)
+    starts = ends-lens
+    cum = np.zeros(len(widths)+1)
+    missing = np.isnan(widths)
+    if missing.any():
+        widths[missing] = 0
+        nmissing = np.zeros(len(widths)+1,dtype=np.intp)
+        np.cumsum(missing,out=nmissing[1:])
+        missing = (nmissing[ends]-nmissing[starts]).nonzero()[0]
+    else:
+        missing = ()
+    np.cumsum(widths,out=cum[1:])
+    R = ((cum[ends]-cum[starts])*0.001*size).tolist()
+    for i in missing:
+        R[i] = font.stringWidth(texts[i], size, encoding)
+    return R
+
 def dumpFontData():
     print('Registered Encodings:')
     keys = list(_encodings.keys())
@@ -817,6 +955,7 @@ def _reset(
         d.clear()
         d.update(v)
     rl_codecs.RL_Codecs.reset_dynamic_codecs()
+    stringWidthCache.clear()
 
 from reportlab.rl_config import register_reset
 register_reset(_reset)
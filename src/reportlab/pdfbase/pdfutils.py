@@ -28,7 +28,6 @@ def _chunker(src,dst=[],chunkSize=60):
 _mode2cs = {'RGB':'RGB', 'CMYK': 'CMYK', 'L': 'G'}
 _mode2bpp = {'RGB': 3, 'CMYK':4, 'L':1}
 def makeA85Image(filename,IMG=None, detectJpeg=False):
-    import zlib
     img = ImageReader(filename)
     if IMG is not None:
         IMG.append(img)
@@ -46,7 +45,8 @@ def makeA85Image(filename,IMG=None, detectJpeg=False):
     append('ID')
     #use a flate filter and Ascii Base 85
     assert len(raw) == imgwidth * imgheight*_mode2bpp[img.mode], "Wrong amount of data for image"
-    compressed = zlib.compress(raw)   #this bit is very fast...
+    from reportlab.pdfbase.pdfdoc import zlibCompress
+    compressed = zlibCompress(raw,'image')   #this bit is very fast...
     encoded = asciiBase85Encode(compressed) #...sadly this may not be
 
     #append in blocks of 60 characters
@@ -55,7 +55,6 @@ def makeA85Image(filename,IMG=None, detectJpeg=False):
     append('EI')
     return code
 def makeRawImage(filename,IMG=None,detectJpeg=False):
-    import zlib
     img = ImageReader(filename)
     if IMG is not None:
         IMG.append(img)
@@ -73,7 +72,8 @@ def makeRawImage(filename,IMG=None,detectJpeg=False):
     append('ID')
     #use a flate filter
     assert len(raw) == imgwidth * imgheight*_mode2bpp[img.mode], "Wrong amount of data for image"
-    compressed = zlib.compress(raw)   #this bit is very fast...
+    from reportlab.pdfbase.pdfdoc import zlibCompress
+    compressed = zlibCompress(raw,'image')   #this bit is very fast...
 
     #append in blocks of 60 characters
     _chunker(compressed,code)
@@ -273,6 +273,42 @@ def readJPEGInfo(image):
                 x = struct.unpack('BB', image.read(2))
                 image.seek( (x[0] << 8) + x[1] - 2, 1)
 
+#########################################################################
+#
+#  PNG processing code
+#
+#########################################################################
+
+def readPNGInfo(data):
+    """Return a dict with the IHDR fields (width, height, bitDepth, colorType,
+    compression, filter, interlace), any palette/transparency chunk data and the
+    concatenated IDAT deflate stream of the PNG in data; None if it is not a PNG."""
+    import struct
+    if data[:8]!=b'\x89PNG\r\n\x1a\n': return None
+    info = {}
+    idat = []
+    pos = 8
+    n = len(data)
+    while pos+8<=n:
+        length, typ = struct.unpack_from('>I4s',data,pos)
+        pos += 8
+        if pos+length+4>n: return None
+        if typ==b'IHDR':
+            (info['width'], info['height'], info['bitDepth'], info['colorType'],
+                info['compression'], info['filter'], info['interlace']) = struct.unpack_from('>IIBBBBB',data,pos)
+        elif typ==b'IDAT':
+            idat.append(data[pos:pos+length])
+        elif typ==b'PLTE':
+            info['palette'] = data[pos:pos+length]
+        elif typ==b'tRNS':
+            info['transparency'] = data[pos:pos+length]
+        elif typ==b'IEND':
+            break
+        pos += length+4     #skip the crc
+    if 'width' not in info or not idat: return None
+    info['idat'] = b''.join(idat)
+    return info
+
 class _fusc:
     def __init__(self,k, n):
         assert k, 'Argument k should be a non empty string'
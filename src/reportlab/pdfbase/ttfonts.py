@@ -51,14 +51,14 @@ Oh, and that 14 up there is font size.)
 Canvas and TextObject have special support for dynamic fonts.
 """
 
-from struct import pack, unpack, error as structError
+from struct import pack, unpack, unpack_from, error as structError
 from reportlab.lib.utils import bytestr, isUnicode, char2int, isStr, isBytes
 from reportlab.pdfbase import pdfmetrics, pdfdoc
 from reportlab import rl_config
 from reportlab.lib.rl_accel import hex32, add32, calcChecksum, instanceStringWidthTTF
 from collections import namedtuple
-from io import BytesIO
-import os, time
+from io import BytesIO, UnsupportedOperation
+import os, time, mmap
 
 class TTFError(pdfdoc.PDFError):
     "TrueType font exception"
@@ -96,6 +96,37 @@ def makeToUnicodeCMap(fontname, subset):
         ]
     return '\n'.join(cmap)
 
+def makeIdentityToUnicodeCMap(fontname, subset):
+    """Creates a ToUnicode CMap for an Identity-H font where CID n+1
+    is used for the character subset[n]."""
+    cmap = [
+        "/CIDInit /ProcSet findresource begin",
+        "12 dict begin",
+        "begincmap",
+        "/CIDSystemInfo",
+        "<< /Registry (Adobe)",
+        "/Ordering (UCS)",
+        "/Supplement 0",
+        ">> def",
+        "/CMapName /%s def" % fontname,
+        "/CMapType 2 def",
+        "1 begincodespacerange",
+        "<0000> <FFFF>",
+        "endcodespacerange",
+        ]
+    for i in range(0,len(subset),100):
+        chunk = subset[i:i+100]
+        cmap.append("%d beginbfchar" % len(chunk))
+        cmap.extend("<%04X> <%s>" % (i+j+1,chr(v).encode('utf_16_be').hex().upper()) for j,v in enumerate(chunk))
+        cmap.append("endbfchar")
+    cmap.extend([
+        "endcmap",
+        "CMapName currentdict /CMap defineresource pop",
+        "end",
+        "end"
+        ])
+    return '\n'.join(cmap)
+
 def splice(stream, offset, value):
     """Splices the given value into stream at the given offset and
     returns the resulting stream (the original is unchanged)"""
@@ -243,16 +274,33 @@ class TTFontParser:
         return version==self.ttfVersions[-1]
 
     def readFile(self,f):
+        '''f may be a file name, a file object or an mmap/memoryview of the font data;
+        named files are memory mapped if rl_config.ttfUseMMap is set'''
         if not hasattr(self,'_ttf_data'):
-            if hasattr(f,'read'):
+            if isinstance(f,(mmap.mmap,memoryview)):
+                self.filename = '(ttf)'
+                self._ttf_data = f
+            elif hasattr(f,'read'):
                 self.filename = getattr(f,'name','(ttf)')   #good idea Marius
                 self._ttf_data = f.read()
             else:
                 self.filename, f = TTFOpenFile(f)
-                self._ttf_data = f.read()
-                f.close()
+                try:
+                    self._ttf_data = self._mmapFile(f)
+                finally:
+                    f.close()
         self._pos = 0
 
+    @staticmethod
+    def _mmapFile(f):
+        '''return a read only mmap of the open file f or its contents if it cannot be mapped'''
+        if rl_config.ttfUseMMap:
+            try:
+                return mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError, UnsupportedOperation):
+                pass
+        return f.read()
+
     def checksumTables(self):
         # Check the checksums for all tables
         for t in self.tables:
@@ -267,7 +315,7 @@ class TTFontParser:
 
     def checksumFile(self):
         # Check the checksums for the whole file
-        checksum = calcChecksum(self._ttf_data)
+        checksum = calcChecksum(bytes(self._ttf_data))
         if 0xB1B0AFBA!=checksum:
             raise TTFError('TTF file "%s": invalid checksum %s (expected 0xB1B0AFBA) len: %d &3: %d' % (self.filename,hex32(checksum),len(self._ttf_data),(len(self._ttf_data)&3)))
 
@@ -294,7 +342,7 @@ class TTFontParser:
     def read_tag(self):
         "Read a 4-character tag"
         self._pos += 4
-        return str(self._ttf_data[self._pos - 4:self._pos],'utf8')
+        return str(bytes(self._ttf_data[self._pos - 4:self._pos]),'utf8')
 
     def get_chunk(self, pos, length):
         "Return a chunk of raw data at given position"
@@ -302,38 +350,43 @@ class TTFontParser:
 
     def read_uint8(self):
         self._pos += 1
-        return int(self._ttf_data[self._pos-1])
+        return unpack_from('>B',self._ttf_data,self._pos-1)[0]
 
     def read_ushort(self):
         "Reads an unsigned short"
         self._pos += 2
-        return unpack('>H',self._ttf_data[self._pos-2:self._pos])[0]
+        return unpack_from('>H',self._ttf_data,self._pos-2)[0]
 
     def read_ulong(self):
         "Reads an unsigned long"
         self._pos += 4
-        return unpack('>L',self._ttf_data[self._pos - 4:self._pos])[0]
+        return unpack_from('>L',self._ttf_data,self._pos-4)[0]
 
     def read_short(self):
         "Reads a signed short"
         self._pos += 2
         try:
-            return unpack('>h',self._ttf_data[self._pos-2:self._pos])[0]
+            return unpack_from('>h',self._ttf_data,self._pos-2)[0]
         except structError as error:
             raise TTFError(error)
 
+    def read_ushorts(self, n):
+        "Reads n unsigned shorts"
+        self._pos += 2*n
+        return unpack_from('>%dH' % n,self._ttf_data,self._pos-2*n)
+
     def get_ushort(self, pos):
         "Return an unsigned short at given position"
-        return unpack('>H',self._ttf_data[pos:pos+2])[0]
+        return unpack_from('>H',self._ttf_data,pos)[0]
 
     def get_ulong(self, pos):
         "Return an unsigned long at given position"
-        return unpack('>L',self._ttf_data[pos:pos+4])[0]
+        return unpack_from('>L',self._ttf_data,pos)[0]
 
     def get_table(self, tag):
         "Return the given TTF table"
         pos, length = self.get_table_pos(tag)
-        return self._ttf_data[pos:pos+length]
+        return bytes(self._ttf_data[pos:pos+length])
 
 class TTFontMaker:
     "Basic TTF file generator"
@@ -424,7 +477,7 @@ class TTFontFile(TTFontParser):
             while True:
                 TTFontParser.__init__(self, file, validate=validate,subfontIndex=sfi)
                 numSubfonts = self.numSubfonts = self.read_ulong()
-                self.extractInfo(charInfo)
+                self._extractInfo(charInfo,sfi)
                 if (isBytes(subfontIndex) and subfontIndex==self.name
                     or subfontIndex==self.name.ustr): #we found it
                     return
@@ -437,7 +490,58 @@ class TTFontFile(TTFontParser):
                 self.__dict__.update(__dict__)
         else:
             TTFontParser.__init__(self, file, validate=validate,subfontIndex=subfontIndex)
-            self.extractInfo(charInfo)
+            self._extractInfo(charInfo,subfontIndex)
+
+    _parseCacheVersion = 1
+
+    def _parseCachePath(self, charInfo, subfontIndex):
+        '''return the parse cache file for this font or None if there is no usable cache'''
+        cacheDir = rl_config.ttfParseCacheDir
+        fn = getattr(self,'filename',None)
+        if not cacheDir or not isStr(fn): return None
+        try:
+            fn = os.path.realpath(fn)
+            st = os.stat(fn)
+        except (OSError, ValueError):
+            return None
+        from hashlib import md5
+        key = repr((self._parseCacheVersion, self.__class__.__name__, fn, st.st_size, st.st_mtime_ns,
+                    subfontIndex, bool(charInfo), os.path.basename(fn) in rl_config.allowTTFSubsetting))
+        return os.path.join(cacheDir,md5(key.encode('utf8')).hexdigest()+'.ttfinfo')
+
+    def _extractInfo(self, charInfo, subfontIndex):
+        '''extractInfo via the on disk parse cache (see rl_config.ttfParseCacheDir)'''
+        fn = self._parseCachePath(charInfo, subfontIndex)
+        if fn:
+            import marshal, mmap
+            try:
+                with open(fn,'rb') as f, mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as m:
+                    info = marshal.loads(m)
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+            else:
+                for k,(b,u) in info.pop('_TTFNameBytes').items():
+                    info[k] = n = bytes.__new__(TTFNameBytes,b)
+                    n.ustr = u
+                self.__dict__.update(info)
+                return
+        before = self.__dict__.copy()
+        self.extractInfo(charInfo)
+        if fn:
+            import marshal
+            info = dict((k,v) for k,v in self.__dict__.items() if k not in before or before[k] is not v)
+            info['_TTFNameBytes'] = dict((k,(bytes(info.pop(k)),v.ustr)) for k,v in list(info.items()) if isinstance(v,TTFNameBytes))
+            tfn = '%s.%d' % (fn,os.getpid())
+            try:
+                os.makedirs(os.path.dirname(fn),exist_ok=True)
+                with open(tfn,'wb') as f:
+                    marshal.dump(info,f)
+                os.replace(tfn,fn)
+            except (OSError, ValueError):
+                try:
+                    os.remove(tfn)
+                except OSError:
+                    pass
 
     def extractInfo(self, charInfo=1):
         """
@@ -719,12 +823,12 @@ class TTFontFile(TTFontParser):
             limit = encoffs + length
             segCount = int(self.read_ushort() / 2.0)
             self.skip(6)
-            endCount = [self.read_ushort() for _ in range(segCount)]
+            endCount = self.read_ushorts(segCount)
             self.skip(2)
-            startCount = [self.read_ushort() for _ in range(segCount)]
+            startCount = self.read_ushorts(segCount)
             idDelta = [self.read_short() for _ in range(segCount)]
             idRangeOffset_start = self._pos
-            idRangeOffset = [self.read_ushort() for _ in range(segCount)]
+            idRangeOffset = self.read_ushorts(segCount)
 
             # Now it gets tricky.
             for n in range(segCount):
@@ -853,13 +957,10 @@ class TTFontFile(TTFontParser):
         # loca - Index to location
         if 'loca' not in self.table: raise TTFError('missing location table')
         self.seek_table('loca')
-        self.glyphPos = []
         if indexToLocFormat == 0:
-            for n in range(numGlyphs + 1):
-                self.glyphPos.append(self.read_ushort() << 1)
+            self.glyphPos = [p << 1 for p in self.read_ushorts(numGlyphs + 1)]
         elif indexToLocFormat == 1:
-            for n in range(numGlyphs + 1):
-                self.glyphPos.append(self.read_ulong())
+            self.glyphPos = list(unpack_from('>%dL' % (numGlyphs + 1), self._ttf_data, self._pos))
         else:
             raise TTFError('Unknown location table format (%d)' % indexToLocFormat)
         if 0x20 in charToGlyph:
@@ -871,14 +972,10 @@ class TTFontFile(TTFontParser):
 
     # Subsetting
 
-    def makeSubset(self, subset):
-        """Create a subset of a TrueType font"""
-        output = TTFontMaker()
-
-        # Build a mapping of glyphs in the subset to glyph numbers in
-        # the original font.  Also build a mapping of UCS codes to
-        # glyph values in the new font.
-
+    def _subsetGlyphMap(self, subset):
+        """Build a mapping of glyphs in the subset to glyph numbers in
+        the original font.  Also build a mapping of UCS codes to
+        glyph values in the new font.  Returns (glyphMap, glyphSet, codeToGlyph)."""
         # Start with 0 -> 0: "missing character"
         glyphMap = [0]                  # new glyph index -> old glyph index
         glyphSet = {0:0}                # old glyph index -> new glyph index
@@ -892,6 +989,12 @@ class TTFontFile(TTFontParser):
                 glyphSet[originalGlyphIdx] = len(glyphMap)
                 glyphMap.append(originalGlyphIdx)
             codeToGlyph[code] = glyphSet[originalGlyphIdx]
+        return glyphMap, glyphSet, codeToGlyph
+
+    def makeSubset(self, subset):
+        """Create a subset of a TrueType font"""
+        output = TTFontMaker()
+        glyphMap, glyphSet, codeToGlyph = self._subsetGlyphMap(subset)
 
         # Also include glyphs that are parts of composite glyphs
         start = self.get_table_pos('glyf')[0]
@@ -972,19 +1075,20 @@ class TTFontFile(TTFontParser):
 
         # cmap - Character to glyph mapping
         # XXX maybe use format 0 if possible, not 6?
-        entryCount = len(subset)
+        # the format 6 length is a ushort so large (Identity-H) subsets are
+        # truncated; they are accessed by glyph id anyway
+        entryCount = min(len(subset),0x7FFA)
         length = 10 + entryCount * 2
         cmap = [0, 1,           # version, number of tables
                 1, 0, 0,12,     # platform, encoding, offset (hi,lo)
                 6, length, 0,   # format, length, language
                 0,
                 entryCount] + \
-               list(map(codeToGlyph.get, subset))
+               list(map(codeToGlyph.get, subset[:entryCount]))
         cmap = pack(*([">%dH" % len(cmap)] + cmap))
         output.add('cmap', cmap)
 
-        # glyf - Glyph data
-        glyphData = self.get_table('glyf')
+        # glyf - Glyph data; only the glyphs we need are copied from the font data
         offsets = []
         glyf = []
         pos = 0
@@ -993,7 +1097,7 @@ class TTFontFile(TTFontParser):
             originalGlyphIdx = glyphMap[n]
             glyphPos = self.glyphPos[originalGlyphIdx]
             glyphLen = self.glyphPos[originalGlyphIdx + 1] - glyphPos
-            data = glyphData[glyphPos:glyphPos+glyphLen]
+            data = self.get_chunk(start+glyphPos,glyphLen)
             # Fix references in composite glyphs
             if glyphLen > 2 and unpack(">h", data[:2])[0] < 0:
                 # composite glyph
@@ -1083,7 +1187,7 @@ class TTFontFace(TTFontFile, pdfmetrics.TypeFace):
         fontFile.content = self.makeSubset(subset)
         fontFile.dictionary['Length1'] = len(fontFile.content)
         if doc.compression:
-            fontFile.filters = [pdfdoc.PDFZCompress]
+            fontFile.filters = [pdfdoc.PDFZCompressFont]
         fontFileRef = doc.Reference(fontFile, 'fontFile:%s(%s)' % (self.filename, fontname))
 
         flags = self.flags & ~ FF_NONSYMBOLIC
@@ -1149,6 +1253,12 @@ class TTFont:
                 self.frozen = True
                 return
 
+            if getattr(ttf,'_identityH',False):
+                #a single subset of 2 byte CIDs; CID 0 is .notdef
+                self.subsets = [[]]
+                self.nextCode = 1
+                return
+
             if asciiReadable is None:
                 asciiReadable = rl_config.ttfAsciiReadable
 
@@ -1167,12 +1277,17 @@ class TTFont:
 
     _multiByte = 1      # We want our own stringwidth
     _dynamicFont = 1    # We want dynamic subsetting
+    _identityH = False
 
-    def __init__(self, name, filename, validate=0, subfontIndex=0,asciiReadable=None):
+    def __init__(self, name, filename, validate=0, subfontIndex=0,asciiReadable=None,identityH=None):
         """Loads a TrueType font from filename.
 
         If validate is set to a false values, skips checksum validation.  This
         can save time, especially if the font is large.
+
+        If identityH is true (default rl_config.ttfIdentityH) the font is embedded
+        once per document as a CIDFontType2 with Identity-H encoding and 2 byte
+        codes instead of as a number of 256 character simple font subsets.
         """
         self.fontName = name
         self.face = TTFontFace(filename, validate=validate, subfontIndex=subfontIndex)
@@ -1182,10 +1297,21 @@ class TTFont:
         if asciiReadable is None:
             asciiReadable = rl_config.ttfAsciiReadable
         self._asciiReadable = asciiReadable
+        if identityH is None:
+            identityH = rl_config.ttfIdentityH
+        if identityH and not self.face._full_font:
+            self._identityH = True
 
     def stringWidth(self,text,size,encoding='utf8'):
         return instanceStringWidthTTF(self,text,size,encoding)
 
+    def stringWidths(self,texts,size,encoding='utf8'):
+        '''return the list of widths of a sequence of texts'''
+        return pdfmetrics._stringWidths(self,texts,size,encoding)
+
+    def _codeWidths(self):
+        return self.face.charWidths, self.face.defaultWidth
+
     def _assignState(self,doc,asciiReadable=None,namePrefix=None):
         '''convenience function for those wishing to roll their own state properties'''
         if asciiReadable is None:
@@ -1213,6 +1339,8 @@ class TTFont:
             text = text.decode('utf-8')     # encoding defaults to utf-8
         assignments = state.assignments
         subsets = state.subsets
+        if self._identityH:
+            return [(0,self._identityCodes(text,state))]
         reserveTTFNotdef = rl_config.reserveTTFNotdef
         for code in map(ord,text):
             if code==0xa0: code = 32    #map nbsp into space
@@ -1251,12 +1379,32 @@ class TTFont:
             results.append((curSet,bytes(cur)))
         return results
 
+    def _identityCodes(self, text, state):
+        '''return the 2 byte CID string for text assigning new CIDs as needed'''
+        assignments = state.assignments
+        subset = state.subsets[0]
+        C = []
+        for code in map(ord,text):
+            if code==0xa0: code = 32    #map nbsp into space
+            n = assignments.get(code)
+            if n is None:
+                if state.frozen:
+                    raise pdfdoc.PDFError("Font %s is already frozen, cannot add new character U+%04X" % (self.fontName, code))
+                n = state.nextCode
+                if n>0xFFFF:
+                    raise pdfdoc.PDFError("Font %s has too many characters for Identity-H" % self.fontName)
+                state.nextCode += 1
+                assignments[code] = n
+                subset.append(code)
+            C.append(n)
+        return pack('>%dH' % len(C),*C)
+
     def getSubsetInternalName(self, subset, doc):
         """Returns the name of a PDF Font object corresponding to a given
         subset of this dynamic font.  Use this function instead of
         PDFDocument.getInternalFontName."""
         try: state = self.state[doc]
-        except KeyError: state = self.state[doc] = TTFont.State(self._asciiReadable)
+        except KeyError: state = self.state[doc] = TTFont.State(self._asciiReadable,self)
         if subset < 0 or subset >= len(state.subsets):
             raise IndexError('Subset %d does not exist in font %s' % (subset, self.fontName))
         if state.internalName is None:
@@ -1274,8 +1422,12 @@ class TTFont:
         FontDescriptor is a (no more than) 256 character subset of the original
         TrueType font."""
         try: state = self.state[doc]
-        except KeyError: state = self.state[doc] = TTFont.State(self._asciiReadable)
+        except KeyError: state = self.state[doc] = TTFont.State(self._asciiReadable,self)
         state.frozen = 1
+        if self._identityH:
+            self._addIdentityObjects(doc, state)
+            del self.state[doc]
+            return
         for n,subset in enumerate(state.subsets):
             internalName = self.getSubsetInternalName(n, doc)[1:]
             baseFontName = (b''.join((SUBSETN(n),b'+',self.face.name,self.face.subfontNameX))).decode('pdfdoc')
@@ -1305,6 +1457,48 @@ class TTFont:
             fontDict[internalName] = pdfFont
         del self.state[doc]
 
+    def _addIdentityObjects(self, doc, state):
+        '''add a Type0 font with a single CIDFontType2 descendant for the Identity-H case'''
+        face = self.face
+        subset = state.subsets[0]
+        internalName = self.getSubsetInternalName(0, doc)[1:]
+        baseFontName = (b''.join((SUBSETN(0),b'+',face.name,face.subfontNameX))).decode('pdfdoc')
+
+        cidFont = pdfdoc.PDFCIDFontType2()
+        cidFont.__Comment__ = 'Font %s CIDFontType2' % self.fontName
+        cidFont.BaseFont = baseFontName
+        cidFont.CIDSystemInfo = pdfdoc.PDFDictionary(dict(Registry=pdfdoc.PDFString('Adobe'),
+                                Ordering=pdfdoc.PDFString('Identity'), Supplement=0))
+        cidFont.DW = face.defaultWidth
+        if subset:
+            cidFont.W = pdfdoc.PDFArray([1,pdfdoc.PDFArray(list(map(face.getCharWidth, subset)))])
+
+        #CID n+1 is subset[n]; map it to its glyph in the embedded subset font
+        codeToGlyph = face._subsetGlyphMap(subset)[2]
+        gids = [0]+[codeToGlyph[c] for c in subset]
+        cidToGid = pdfdoc.PDFStream()
+        cidToGid.content = pack('>%dH' % len(gids),*gids)
+        if doc.compression:
+            cidToGid.filters = [pdfdoc.PDFZCompress]
+        cidFont.CIDToGIDMap = doc.Reference(cidToGid, 'cidToGidMap:' + baseFontName)
+        cidFont.FontDescriptor = face.addSubsetObjects(doc, baseFontName, subset)
+
+        cmapStream = pdfdoc.PDFStream()
+        cmapStream.content = makeIdentityToUnicodeCMap(baseFontName, subset)
+        if doc.compression:
+            cmapStream.filters = [pdfdoc.PDFZCompress]
+
+        pdfFont = pdfdoc.PDFType0Font()
+        pdfFont.__Comment__ = 'Font %s' % self.fontName
+        pdfFont.Name = internalName
+        pdfFont.BaseFont = baseFontName
+        pdfFont.Encoding = pdfdoc.PDFName('Identity-H')
+        pdfFont.DescendantFonts = pdfdoc.PDFArray([doc.Reference(cidFont, 'cidFont:' + baseFontName)])
+        pdfFont.ToUnicode = doc.Reference(cmapStream, 'toUnicodeCMap:' + baseFontName)
+
+        doc.Reference(pdfFont, internalName)
+        doc.idToObject['BasicFonts'].dict[internalName] = pdfFont
+
 #preserve the initial values here
 def _reset():
     _cached_ttf_dirs.clear()
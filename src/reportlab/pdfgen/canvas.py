@@ -19,7 +19,7 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen  import pathobject
 from reportlab.pdfgen.textobject import PDFTextObject, _PDFColorSetter
 from reportlab.lib.colors import black, _chooseEnforceColorSpace, Color, CMYKColor, toColor
-from reportlab.lib.utils import ImageReader, isSeq, isStr, isUnicode, _digester, asUnicode
+from reportlab.lib.utils import ImageReader, LazyImageReader, isSeq, isStr, isUnicode, _digester, asUnicode
 from reportlab.lib.rl_accel import fp_str, escapePDF
 from reportlab.lib.boxstuff import aspectRatioFix
 
@@ -277,6 +277,8 @@ class Canvas(_PDFColorSetter):
                  trimBox=None,
                  bleedBox=None,
                  lang=None,
+                 streamPages=None,
+                 objectStreams=None,
                  ):
         """Create a canvas of a given size. etc.
 
@@ -292,8 +294,16 @@ class Canvas(_PDFColorSetter):
         if enforceColorSpace is in ('cmyk', 'rgb', 'sep','sep_black','sep_cmyk') then one of
         the standard _PDFColorSetter callables will be used to enforce appropriate color settings.
         If it is a callable then that will be used.
+
+        if streamPages is true each page is written to filename as soon as it is
+        shown and then released so memory use stays flat for long documents;
+        getpdfdata is then unavailable.  The default is rl_config.streamPages.
+
+        if objectStreams is true the output uses PDF 1.5 compressed object streams
+        and a cross reference stream.  The default is rl_config.pdfObjectStreams.
         """
         if pagesize is None: pagesize = rl_config.defaultPageSize
+        if streamPages is None: streamPages = rl_config.streamPages
         if invariant is None: invariant = rl_config.invariant
 
         self._initialFontName = initialFontName if initialFontName else rl_config.canvas_basefontname
@@ -305,7 +315,9 @@ class Canvas(_PDFColorSetter):
         self._doc = pdfdoc.PDFDocument(compression=pageCompression,
                                        invariant=invariant, filename=filename,
                                        pdfVersion=pdfVersion or pdfdoc.PDF_VERSION_DEFAULT,
-                                       lang=lang
+                                       lang=lang,
+                                       streamTo=filename if streamPages else None,
+                                       objectStreams=objectStreams,
                                        )
 
         self._enforceColorSpace = _chooseEnforceColorSpace(enforceColorSpace)
@@ -961,16 +973,13 @@ class Canvas(_PDFColorSetter):
 
         # first, generate a unique name/signature for the image.  If ANYTHING
         # is different, even the mask, this should be different.
-        if isinstance(image,ImageReader):
-            rawdata = image.getRGBData()
-            smask = image._dataA
-            if mask=='auto' and smask:
-                mdata = smask.getRGBData()
-            else:
-                mdata = str(mask)
-            if isUnicode(mdata):
-                mdata = mdata.encode('utf8')
-            name = _digester(rawdata+mdata)
+        xobjCache = pdfdoc.imageXObjectCache
+        cacheKey = xobjCache.key(image,mask) if xobjCache.enabled else None
+        if cacheKey:
+            #identified by source content so we need not decode it
+            name = cacheKey
+        elif isinstance(image,ImageReader):
+            name = image._xobjName(mask)
         else:
             #filename, use it
             s = '%s%s' % (image, mask)
@@ -984,7 +993,10 @@ class Canvas(_PDFColorSetter):
         imgObj = self._doc.idToObject.get(regName, None)
         if not imgObj:
             #first time seen, create and register the PDFImageXobject
-            imgObj = pdfdoc.PDFImageXObject(name, image, mask=mask)
+            if cacheKey:
+                imgObj = xobjCache.imageXObject(cacheKey, name, image, mask=mask)
+            else:
+                imgObj = pdfdoc.PDFImageXObject(name, image, mask=mask)
             imgObj.name = name
             self._setXObjects(imgObj)
             self._doc.Reference(imgObj, regName)
@@ -999,6 +1011,8 @@ class Canvas(_PDFColorSetter):
                 else:
                     imgObj.smask = pdfdoc.PDFObjectReference(mRegName)
                 del imgObj._smask
+            if isinstance(image,LazyImageReader):
+                image.release()     #the XObject has what it needs
 
         # ensure we have a size, as PDF will make it 1x1 pixel otherwise!
         x,y,width,height,scaled = aspectRatioFix(preserveAspectRatio,anchor,x,y,width,height,imgObj.width,imgObj.height,anchorAtXY)
@@ -1283,6 +1297,8 @@ class Canvas(_PDFColorSetter):
         """Returns the PDF data that would normally be written to a file.
         If there is current data a ShowPage is executed automatically.
         After this operation the canvas must not be used further."""
+        if self._doc._streamTo is not None:
+            raise ValueError('getpdfdata is not available when pages are streamed to %r' % (self._filename,))
         if len(self._code): self.showPage()
         s = self._doc.GetPDFData(self)
         if isUnicode(s):
@@ -62,11 +62,10 @@ class PDFImage:
         imageFile.seek(0) #reset file pointer
         imagedata = []
         #imagedata.append('BI /Width %d /Height /BitsPerComponent 8 /ColorSpace /%s /Filter [/Filter [ /ASCII85Decode /DCTDecode] ID' % (info[0], info[1], colorSpace))
-        imagedata.append('BI /W %d /H %d /BPC 8 /CS /%s /F [%s/DCT] ID' % (imgwidth, imgheight, colorSpace, rl_config.useA85 and '/A85 ' or ''))
+        #inline image data lives in the (text) page stream so is always ASCII85 encoded
+        imagedata.append('BI /W %d /H %d /BPC 8 /CS /%s /F [/A85 /DCT] ID' % (imgwidth, imgheight, colorSpace))
         #write in blocks of (??) 60 characters per line to a list
-        data = imageFile.read()
-        if rl_config.useA85:
-            data = asciiBase85Encode(data)
+        data = asciiBase85Encode(imageFile.read())
         pdfutils._chunker(data,imagedata)
         imagedata.append('EI')
         return (imagedata, imgwidth, imgheight)
@@ -84,7 +83,6 @@ class PDFImage:
         return imagedata
 
     def PIL_imagedata(self):
-        import zlib
         image = self.image
         if image.format=='JPEG':
             fp=image.fp
@@ -115,15 +113,14 @@ class PDFImage:
 
         # this describes what is in the image itself
         # *NB* according to the spec you can only use the short form in inline images
-        imagedata=['BI /W %d /H %d /BPC %d /CS /%s /F [%s/Fl] ID' % (imgwidth, imgheight, bpc, colorSpace, rl_config.useA85 and '/A85 ' or '')]
+        imagedata=['BI /W %d /H %d /BPC %d /CS /%s /F [/A85 /Fl] ID' % (imgwidth, imgheight, bpc, colorSpace)]
 
-        #use a flate filter and, optionally, Ascii Base 85 to compress
+        #use a flate filter and Ascii Base 85 to compress
         raw = (myimage.tobytes if hasattr(myimage,'tobytes') else myimage.tostring)()
         rowstride = (imgwidth*bpc*bpp+7)>>3
         assert len(raw) == rowstride*imgheight, "Wrong amount of data for image"
-        data = zlib.compress(raw)    #this bit is very fast...
-        if rl_config.useA85:
-            data = asciiBase85Encode(data) #...sadly this may not be
+        data = pdfdoc.zlibCompress(raw,'image')    #this bit is very fast...
+        data = asciiBase85Encode(data) #...sadly this may not be
         #append in blocks of 60 characters
         pdfutils._chunker(data,imagedata)
         imagedata.append('EI')
@@ -131,7 +128,7 @@ class PDFImage:
 
     def non_jpg_imagedata(self,image):
         if not self.imageCaching:
-            imagedata = pdfutils.cacheImageFile(image,returnInMemory=1)
+            imagedata = pdfutils.makeA85Image(image)
         else:
             imagedata = self.cache_imagedata()
         words = imagedata[1].split()
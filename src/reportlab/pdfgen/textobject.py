@@ -388,7 +388,10 @@ class PDFTextObject(_PDFColorSetter):
                     pdffontname = font.getSubsetInternalName(subset, canv._doc)
                     R.append("%s %s Tf %s TL" % (pdffontname, fp_str(self._fontsize), fp_str(self._leading)))
                     self._curSubset = subset
-                R.append("(%s) Tj" % canv._escape(t))
+                if getattr(font,'_identityH',False) and getattr(self,'_wordSpace',0):
+                    R.append(self._identityTJ(font,t))
+                else:
+                    R.append("(%s) Tj" % canv._escape(t))
         elif font._multiByte:
             #all the fonts should really work like this - let them know more about PDF...
             R.append("%s %s Tf %s TL" % (
@@ -416,6 +419,22 @@ class PDFTextObject(_PDFColorSetter):
                 R.append("%s %s Tf %s TL" % (canv._doc.getInternalFontName(self._fontname), fp_str(self._fontsize), fp_str(self._leading)))
         return ' '.join(R)
 
+    def _identityTJ(self, font, t):
+        '''Tw only applies to the single byte code 32 so for 2 byte Identity-H
+        fonts we emulate word spacing with TJ adjustments after each space'''
+        canv = self._canvas
+        space = font.splitString(' ', canv._doc)[0][1]
+        adj = fp_str(-1000.*self._wordSpace/self._fontsize)
+        R = []
+        i = 0
+        for j in range(0,len(t),2):
+            if t[j:j+2]==space:
+                R.append('(%s) %s' % (canv._escape(t[i:j+2]),adj))
+                i = j+2
+        if i<len(t):
+            R.append('(%s)' % canv._escape(t[i:]))
+        return '[%s] TJ' % ' '.join(R)
+
     def _textOut(self, text, TStar=0):
         "prints string at current point, ignores text cursor"
         self._code.append('%s%s' % (self._formatText(text), (TStar and ' T*' or '')))
@@ -50,10 +50,12 @@ from reportlab.platypus.flowables import *
 from reportlab.platypus.flowables import _ContainerSpace
 from reportlab.lib.units import inch
 from reportlab.platypus.paragraph import Paragraph
-from reportlab.platypus.frames import Frame
+from reportlab.platypus.frames import Frame, _draw
+from reportlab import rl_config
 from reportlab.rl_config import defaultPageSize, verbose
 import reportlab.lib.sequencer
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfdoc
 from reportlab.lib.utils import isSeq, encode_label, decode_label, annotateException, strTypes
 
 try:
@@ -475,6 +477,11 @@ class BaseDocTemplate:
       (default: 1)
     - title: Internal title for document (does not automatically display on any page)
     - author: Internal author for document (does not automatically display on any page)
+    - streamPages: if set each finished page is written to the output file as it is
+      completed (see Canvas); not used by multiBuild.
+    - objectStreams: if set use compressed PDF 1.5 object and cross reference streams.
+    - wrapStats: if set each build counts the wraps asked for by the frames in a
+      WrapStats instance left in this attribute eg doc.wrapStats.redundant.
     """
     _initArgs = {   'pagesize':defaultPageSize,
                     'pageTemplates':[],
@@ -521,9 +528,13 @@ class BaseDocTemplate:
                     'printClip': None,
                     'printScaling': None,
                     'duplex': None,
+                    'streamPages': None,
+                    'objectStreams': None,
+                    'wrapStats': None,
                     }
     _invalidInitArgs = ()
     _firstPageTemplateIndex = 0
+    _laterSectionTemplate = None    #first template for sections after a SectionBreak
 
     def __init__(self, filename, **kw):
         """create a document template bound to a filename (see class documentation for keyword arguments)"""
@@ -699,7 +710,7 @@ class BaseDocTemplate:
         if f._atTop:
             boundary = self.frame.showBoundary or self.showBoundary
             if boundary:
-                self.frame.drawBoundary(self.canv,boundary)
+                _draw(self.canv,self.frame.drawBoundary,boundary)
         f._leftExtraIndent = self._leftExtraIndent
         f._rightExtraIndent = self._rightExtraIndent
         f._frameBGs = self._frameBGs
@@ -988,6 +999,13 @@ class BaseDocTemplate:
         '''
         #each distinct pass gets a sequencer
         self.seq = reportlab.lib.sequencer.Sequencer()
+        kwds = {}
+        streamPages = rl_config.streamPages if self.streamPages is None else self.streamPages
+        if streamPages or rl_config.streamPages:
+            #multiBuild passes may be discarded so only stream when we will save
+            kwds['streamPages'] = streamPages if getattr(self,'_doSave',1) else 0
+        if self.objectStreams is not None:
+            kwds['objectStreams'] = self.objectStreams
         canv = canvasmaker(filename or self.filename,
                             pagesize=self.pagesize,
                             invariant=self.invariant,
@@ -1001,6 +1019,7 @@ class BaseDocTemplate:
                             trimBox = self.trimBox,
                             bleedBox = self.bleedBox,
                             lang = self.lang,
+                            **kwds
                             )
 
         getattr(canv,'setEncrypt',lambda x: None)(self.encrypt)
@@ -1059,6 +1078,7 @@ class BaseDocTemplate:
             self._onProgress('STARTED',0)
             self._onProgress('SIZE_EST', len(flowables))
         self._startBuild(filename,canvasmaker)
+        if self.wrapStats: self.wrapStats = WrapStats()
 
         #pagecatcher can drag in information from embedded PDFs and we want ours
         #to take priority, so cache and reapply our own info dictionary after the build.
@@ -1138,11 +1158,18 @@ class BaseDocTemplate:
 
     def multiBuild(self, story,
                    maxPasses = 10,
+                   incremental = False,
                    **buildKwds
                    ):
         """Makes multiple passes until all indexing flowables
         are happy.
 
+        If incremental is true the wrap and split results of replayable
+        flowables (eg Paragraphs) are remembered between passes and reused
+        whenever a later pass asks the same flowable the same question about
+        unchanged content. Paragraph subclasses whose wrap or split change
+        the text must then set _layoutReplayable = 0.
+
         Returns number of passes"""
         self._indexingFlowables = []
         #scan the story and keep a copy
@@ -1155,6 +1182,7 @@ class BaseDocTemplate:
         passes = 0
         mbe = []
         self._multiBuildEdits = mbe.append
+        self._layoutCache = {} if incremental else None
         while 1:
             passes += 1
             if self._onProgress:
@@ -1186,10 +1214,171 @@ class BaseDocTemplate:
                 e = mbe.pop(0)
                 e[0](*e[1:])
 
-        del self._multiBuildEdits
+        del self._multiBuildEdits, self._layoutCache
         if verbose: print('saved')
         return passes
 
+    def _splitSections(self, story):
+        "split story at SectionBreaks into a list of (nextTemplate, flowables)"
+        sections = []
+        S = []
+        nextTemplate = None
+        for f in story:
+            if isinstance(f,SectionBreak):
+                if S: sections.append((nextTemplate,S))
+                S = []
+                nextTemplate = f.nextTemplate
+                if nextTemplate is None:
+                    nextTemplate = self._laterSectionTemplate
+            else:
+                S.append(f)
+        if S: sections.append((nextTemplate,S))
+        return sections
+
+    def _drawSection(self, index, section, pageOffset=0):
+        '''draw one section as if it were a complete document whose first page
+        is pageOffset+1; the content of each page becomes a form XObject.
+        Returns the pages as a list of (page template index, form name,
+        annotation references), the PDF objects they need by (section prefixed)
+        name, the fonts used by resource name and whether anything other than
+        the page templates read the page number'''
+        import copy
+        doc = copy.copy(self)
+        doc.__class__ = type(self.__class__.__name__,(_SectionDocMixin,self.__class__),{})
+        D = doc.__dict__
+        D['_sectionPage'] = D['_sectionPageOffset'] = pageOffset
+        D['_sectionPageReads'] = D['_sectionHooks'] = 0
+        doc.pageTemplates = copy.deepcopy(self.pageTemplates,{id(self):doc})
+        #the parent runs the page template callbacks again with the final page numbers
+        for pt in doc.pageTemplates:
+            for name in ('beforeDrawPage','checkPageSize','onPage','afterDrawPage','onPageEnd'):
+                setattr(pt,name,_sectionHook(doc,getattr(pt,name)))
+        doc.beforePage = _sectionHook(doc,doc.beforePage)
+        doc.afterPage = _sectionHook(doc,doc.afterPage)
+        nextTemplate, story = section
+        if nextTemplate is not None:
+            if isinstance(nextTemplate,strTypes):
+                nextTemplate = [pt.id for pt in self.pageTemplates].index(nextTemplate)
+            doc._firstPageTemplateIndex = nextTemplate
+        doc._doSave = 0
+        doc._onPage = doc._onProgress = None
+        BaseDocTemplate.build(doc, story[:],   #the section may be drawn again
+                canvasmaker=lambda *args,**kwds: _SectionCanvas(doc,index,*args,**kwds))
+        return doc.canv._sectionResult() + (D['_sectionPageReads']>0,)
+
+    def parallelBuild(self, story, maxWorkers=None, filename=None, canvasmaker=canvas.Canvas, maxPasses=10):
+        '''Build the document drawing its sections in parallel processes.
+
+        The story is split at SectionBreak flowables and each section is laid
+        out and drawn in a separate process as if it started a new document
+        (with the SectionBreak's nextTemplate or the first page template).
+        The flowable content of every page is returned as a finished form
+        XObject; the parent then makes the pages in order, running the page
+        template callbacks with the final page numbers and drawing the form.
+
+        Sections are first drawn as if each began on page 1.  Once the page
+        counts are known a section whose flowables read the page number
+        (canv.getPageNumber() or doc.page) is drawn again with its real first
+        page; this repeats if that changes its length, at most maxPasses times.
+
+        Shared fonts are embedded once: whole fonts by name and TrueType subsets
+        by font and characters.  Images and other digest named XObjects are
+        shared as well.  Each section still makes its own TrueType subsets so
+        the output is somewhat larger than, and not byte identical to, that of
+        build.  afterFlowable and indexing flowables such as TableOfContents
+        need the final layout and raise ValueError, as do bookmarks, outline
+        entries and internal links; URL links are kept.  Story elements, page
+        templates and the document must be picklable where the fork start
+        method is unavailable.
+
+        Returns the number of sections.
+        '''
+        if (getattr(self.afterFlowable,'__func__',None) is not BaseDocTemplate.afterFlowable
+                or [f for f in story if f.isIndexing()]):
+            raise ValueError('parallelBuild cannot run afterFlowable or indexing flowables; use build or multiBuild')
+        sections = self._splitSections(story)
+        if self._onProgress:
+            self._onProgress('STARTED',0)
+            self._onProgress('SIZE_EST', len(story))
+        if maxWorkers==1 or len(sections)<2:
+            results = self._drawSections(sections, lambda jobs: [self._drawSection(i,sections[i],o) for i,o in jobs], maxPasses)
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            ctx = (multiprocessing.get_context('fork')
+                    if 'fork' in multiprocessing.get_all_start_methods() else None)
+            with ProcessPoolExecutor(maxWorkers, mp_context=ctx,
+                    initializer=_initParallelJob, initargs=(self,sections)) as executor:
+                results = self._drawSections(sections, lambda jobs: list(executor.map(_drawParallelSection,*zip(*jobs))), maxPasses)
+
+        self._startBuild(filename,canvasmaker)
+        canv = self.canv
+        pdfDoc = canv._doc
+        idToObject = pdfDoc.idToObject
+        sharedFonts = {}
+        try:
+            canv._doctemplate = self
+            for index, (pages, objects, fonts, _) in enumerate(results):
+                prefix = 'Section%d.' % index
+                basicFonts = objects.get(prefix+pdfdoc.BasicFonts)
+                for resName, key in fonts.items():
+                    name = prefix+resName
+                    if key[1] is None:
+                        #a whole font; use the document's own
+                        shared = pdfDoc.getInternalFontName(key[0])[1:]
+                    else:
+                        shared = sharedFonts.setdefault(key,name)
+                    if shared!=name:
+                        basicFonts.dict[resName] = pdfdoc.PDFObjectReference(shared)
+                roots = [pdfdoc.PDFObjectReference(pdfdoc.xObjectName(formName))
+                            for _, formName, _ in pages if formName]
+                for _, _, annots in pages:
+                    roots.extend(annots)
+                for obj in _walkObjects(roots, objects.get):
+                    if isinstance(obj,pdfdoc.PDFObjectReference): continue
+                    name = obj.__InternalName__
+                    if name not in idToObject:
+                        del obj.__InternalName__
+                        pdfDoc.Reference(obj,name)
+                for ptIndex, formName, annots in pages:
+                    self.pageTemplate = self.pageTemplates[ptIndex]
+                    self.clean_hanging()    #begins the page
+                    if formName:
+                        canv.doForm(formName)
+                    canv._annotationrefs.extend(annots)
+                    self._curPageFlowableCount += 1
+                    self.handle_pageEnd()
+        finally:
+            del canv._doctemplate
+        self._endBuild()
+        if self._onProgress:
+            self._onProgress('FINISHED',0)
+        return len(sections)
+
+    def _drawSections(self, sections, draw, maxPasses):
+        '''draw the sections with draw(jobs) where jobs is a list of (section
+        index, page offset) and return the results of _drawSection for the final
+        page offsets'''
+        n = len(sections)
+        offsets = n*[0]
+        results = n*[None]
+        todo = list(range(n))
+        passes = 0
+        while todo:
+            passes += 1
+            if passes > maxPasses:
+                raise IndexError("Section page numbers not resolved after %d passes" % maxPasses)
+            for i, r in zip(todo,draw([(i,offsets[i]) for i in todo])):
+                results[i] = r
+            todo = []
+            offset = 0
+            for i, r in enumerate(results):
+                if offsets[i]!=offset:
+                    offsets[i] = offset
+                    if r[3]: todo.append(i)
+                offset += len(r[0])
+        return results
+
     #these are pure virtuals override in derived classes
     #NB these get called at suitable places by the base class
     #so if you derive and override the handle_xxx methods
@@ -1276,6 +1465,200 @@ class BaseDocTemplate:
         except:
             annotateException('\ndocEval %s failed!\n' % expr)
 
+class _SectionPage:
+    '''the page attribute of a document drawing one section for parallelBuild;
+    reads other than those of the page template callbacks and of the page
+    count's own increment are noted'''
+    def __get__(self, doc, cls=None):
+        if doc is None: return self
+        D = doc.__dict__
+        if not D['_sectionHooks']:
+            D['_sectionPageReads'] += 1
+        return D['_sectionPage']
+
+    def __set__(self, doc, value):
+        D = doc.__dict__
+        if value==D['_sectionPage']+1 and D['_sectionPageReads']:
+            D['_sectionPageReads'] -= 1     #the read of handle_pageBegin's page += 1
+        D['_sectionPage'] = value
+
+class _SectionDocMixin:
+    '''mixed into the class of the copy of the document that draws a section'''
+    page = _SectionPage()
+
+    def handle_documentBegin(self):
+        super().handle_documentBegin()
+        self.__dict__['_sectionPage'] = self._sectionPageOffset
+
+def _sectionHook(doc, func):
+    "wrap a page template callback so that its page number reads are not noted"
+    def hook(*args,**kwds):
+        D = doc.__dict__
+        D['_sectionHooks'] += 1
+        try:
+            return func(*args,**kwds)
+        finally:
+            D['_sectionHooks'] -= 1
+    return hook
+
+def _encodeStream(stream, filters):
+    "apply the filters to the content of stream now rather than when it is formatted"
+    data = stream.content
+    for f in reversed(filters):
+        data = f.encode(data)
+    stream.content = data
+    stream.dictionary['Filter'] = pdfdoc.PDFArray([pdfdoc.PDFName(f.pdfname) for f in filters])
+
+class _SectionCanvas(canvas.Canvas):
+    '''canvas used to draw one section for parallelBuild; the output of the
+    flowables (as opposed to the page template) on each page is made into a
+    form XObject instead of a page'''
+    def __init__(self, doc, index, *args, **kwds):
+        canvas.Canvas.__init__(self, *args, **kwds)
+        self._sectionDoc = doc
+        self._sectionIndex = index
+        self._sectionPages = []
+        self._pageNumber = doc._sectionPageOffset+1
+        self._sectionForms = set()
+        self._inContent = False
+        self._resetContent()
+
+    def getPageNumber(self):
+        D = self._sectionDoc.__dict__
+        if not D['_sectionHooks']:
+            D['_sectionPageReads'] += 1
+        return self._pageNumber
+
+    def _resetContent(self):
+        self._contentRanges = []
+        self._contentForms = []
+        self._contentAnnots = []
+
+    def _contentDraw(self, func, args, kwds):
+        if self._inContent:
+            func(self,*args,**kwds)
+            return
+        code, forms, annots = self._code, self._formsinuse, self._annotationrefs
+        c, f, a = len(code), len(forms), len(annots)
+        self._inContent = True
+        try:
+            func(self,*args,**kwds)
+        finally:
+            self._inContent = False
+        self._contentRanges.append((c,len(code)))
+        self._contentForms.extend(forms[f:])
+        self._contentAnnots.extend(annots[a:])
+
+    def showPage(self):
+        doc = self._sectionDoc
+        code = self._code
+        content = []
+        for c0, c1 in self._contentRanges:
+            content.extend(code[c0:c1])
+        formName = None
+        if content:
+            formName = 'Section%dPage%d' % (self._sectionIndex,len(self._sectionPages)+1)
+            w, h = self._pagesize
+            form = pdfdoc.PDFFormXObject(0,0,w,h)
+            data = pdfdoc.pdfdocEnc('\n'.join(content))
+            S = form.Contents = pdfdoc.PDFStream(content=data)
+            if self._pageCompression:
+                #compress here rather than in the parent
+                _encodeStream(S, rl_config.useA85 and [pdfdoc.PDFBase85Encode,pdfdoc.PDFZCompressPage] or [pdfdoc.PDFZCompressPage])
+            #the pages of the section share one resource dictionary
+            form.Resources = pdfdoc.PDFObjectReference('SectionResources')
+            self._sectionForms.update(self._contentForms)
+            self._doc.addForm(formName,form)
+        self._sectionPages.append((doc.pageTemplates.index(doc.pageTemplate),formName,self._contentAnnots))
+        self._resetContent()
+        self._startPage()
+
+    def _sectionResult(self):
+        '''return the pages, the objects they need renamed so as not to clash
+        with those of the parent or of other sections and the fonts used as a
+        dict of resource name to (font name, subset or None for a whole font)'''
+        pdfDoc = self._doc
+        fonts = {}
+        for fontName, name in pdfDoc.fontMapping.items():
+            fonts[name[1:]] = fontName, None
+        for fnt in pdfDoc.delayedFonts:
+            state = fnt.state[pdfDoc]
+            del fonts[state.internalName]
+            for n, subset in enumerate(state.subsets):
+                fonts['%s+%d' % (state.internalName,n)] = fnt.fontName, tuple(subset)
+            fnt.addObjects(pdfDoc)
+        pdfDoc.delayedFonts = []
+        if self._destinations or getattr(pdfDoc.outline,'buildtree',None):
+            raise ValueError('parallelBuild does not support bookmarks, outlines or internal links')
+        #the graphics states, colours and shadings are those used anywhere in the section
+        resources = pdfdoc.PDFResourceDictionary()
+        resources.basicFonts()
+        resources.allProcs()
+        if self._sectionForms:
+            resources.XObject = pdfDoc.xobjDict(sorted(self._sectionForms))
+        ext = self._extgstate.getState()
+        if ext:
+            resources.ExtGState = ext
+        resources.setShading(self._shadingUsed)
+        resources.setColorSpace(self._colorsUsed)
+        pdfDoc.Reference(resources,'SectionResources')
+        roots = [pdfdoc.PDFObjectReference(pdfdoc.xObjectName(formName))
+                    for _, formName, _ in self._sectionPages if formName]
+        for _, _, annots in self._sectionPages:
+            roots.extend(annots)
+        objects = _renameObjects(pdfDoc, roots, 'Section%d.' % self._sectionIndex)
+        #compress the streams (eg font files) here rather than in the parent
+        for obj in objects.values():
+            if obj.__class__ is pdfdoc.PDFStream and 'Filter' not in obj.dictionary.dict:
+                filters = pdfDoc.defaultStreamFilters if obj.filters is None else obj.filters
+                if filters: _encodeStream(obj, filters)
+        return self._sectionPages, objects, fonts
+
+def _walkObjects(roots, lookup):
+    '''yield the object references and the named objects reachable from roots;
+    lookup(name) returns the object a reference refers to or None'''
+    PDFObject = pdfdoc.PDFObject
+    PDFObjectReference = pdfdoc.PDFObjectReference
+    seen = set()
+    todo = list(roots)
+    while todo:
+        x = todo.pop()
+        if id(x) in seen: continue
+        seen.add(id(x))
+        if isinstance(x,PDFObjectReference):
+            obj = lookup(x.name)
+            if obj is not None: todo.append(obj)
+            yield x
+        elif isinstance(x,PDFObject):
+            if hasattr(x,'__InternalName__'): yield x
+            todo.extend(v for v in x.__dict__.values() if isinstance(v,(PDFObject,dict,list,tuple)))
+        elif isinstance(x,dict):
+            todo.extend(v for v in x.values() if isinstance(v,(PDFObject,dict,list,tuple)))
+        elif isinstance(x,(list,tuple)):
+            todo.extend(v for v in x if isinstance(v,(PDFObject,dict,list,tuple)))
+
+def _renameObjects(pdfDoc, roots, prefix):
+    '''prefix the names of the objects of pdfDoc reachable from roots (except
+    the XObjects which are named by content) and return them by new name'''
+    rename = lambda name: name if name.startswith('FormXob.') else prefix+name
+    objects = {}
+    for x in _walkObjects(roots, pdfDoc.idToObject.get):
+        if isinstance(x,pdfdoc.PDFObjectReference):
+            x.name = rename(x.name)
+        else:
+            name = x.__InternalName__ = rename(x.__InternalName__)
+            objects[name] = x
+    return objects
+
+_parallelJob = None
+def _initParallelJob(doc, sections):
+    global _parallelJob
+    _parallelJob = doc, sections
+
+def _drawParallelSection(i, pageOffset):
+    doc, sections = _parallelJob
+    return doc._drawSection(i,sections[i],pageOffset)
+
 class SimpleDocTemplate(BaseDocTemplate):
     """A special case document template that will handle many simple documents.
        See documentation for BaseDocTemplate.  No pageTemplates are required
@@ -1286,6 +1669,7 @@ class SimpleDocTemplate(BaseDocTemplate):
        page may can be built using this special approach.
     """
     _invalidInitArgs = ('pageTemplates',)
+    _laterSectionTemplate = 'Later'
 
     def handle_pageBegin(self):
         '''override base method to add a change of page template after the firstpage.
@@ -1306,6 +1690,10 @@ class SimpleDocTemplate(BaseDocTemplate):
                footers, etcetera. They can use external variables to vary
                the look (for example providing page numbering or section names).
         """
+        self._addSimpleTemplates(onFirstPage, onLaterPages)
+        BaseDocTemplate.build(self,flowables, canvasmaker=canvasmaker)
+
+    def _addSimpleTemplates(self, onFirstPage, onLaterPages):
         self._calc()    #in case we changed margins sizes etc
         frameT = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
         self.addPageTemplates([PageTemplate(id='First',frames=frameT, onPage=onFirstPage,pagesize=self.pagesize),
@@ -1314,7 +1702,13 @@ class SimpleDocTemplate(BaseDocTemplate):
             self.pageTemplates[0].beforeDrawPage = self.onFirstPage
         if onLaterPages is _doNothing and hasattr(self,'onLaterPages'):
             self.pageTemplates[1].beforeDrawPage = self.onLaterPages
-        BaseDocTemplate.build(self,flowables, canvasmaker=canvasmaker)
+
+    def parallelBuild(self, flowables, onFirstPage=_doNothing, onLaterPages=_doNothing,
+                        maxWorkers=None, filename=None, canvasmaker=canvas.Canvas):
+        "as BaseDocTemplate.parallelBuild with the page templates of build"
+        self._addSimpleTemplates(onFirstPage, onLaterPages)
+        return BaseDocTemplate.parallelBuild(self, flowables, maxWorkers=maxWorkers,
+                        filename=filename, canvasmaker=canvasmaker)
 
 def progressCB(typ, value):
     """Example prototype for progress monitoring.
@@ -256,8 +256,8 @@ class ImageFigure(FlexFigure):
     """Image with a caption below it"""
     def __init__(self, filename, caption, background=None,scaleFactor=None,hAlign='CENTER',border=None):
         assert os.path.isfile(filename), 'image file %s not found' % filename
-        from reportlab.lib.utils import ImageReader
-        w, h = ImageReader(filename).getSize()
+        from reportlab.lib.utils import LazyImageReader
+        w, h = LazyImageReader(filename).getSize()
         self.filename = filename
         FlexFigure.__init__(self, w, h, caption, background,scaleFactor=scaleFactor,hAlign=hAlign,border=border)
 
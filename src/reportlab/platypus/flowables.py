@@ -40,8 +40,38 @@ __all__ = '''AnchorFlowable BalancedColumns BulletDrawer CallerMacro CondPageBre
         DocAssign DocExec DocIf DocPara DocWhile FailOnDraw FailOnWrap Flowable FrameBG FrameSplitter
         HRFlowable Image ImageAndFlowables KeepInFrame KeepTogether LIIndenter ListFlowable ListItem
         Macro NullDraw PTOContainer PageBreak PageBreakIfNotEmpty ParagraphAndImage Preformatted
-        SetPageTopFlowables SetTopFlowables SlowPageBreak Spacer TopPadder TraceInfo UseUpSpace XBox
-        splitLine splitLines'''.split()
+        SectionBreak SetPageTopFlowables SetTopFlowables SlowPageBreak Spacer TopPadder TraceInfo UseUpSpace WrapStats
+        XBox splitLine splitLines'''.split()
+
+class WrapStats:
+    '''counts the wraps asked for by frames and containers during one build
+    (see the wrapStats document template argument). A wrap is reused when the
+    flowable answered from its remembered result, redundant when it worked out
+    again the answer it gave last time for the same width.'''
+    def __init__(self):
+        self.wraps = self.reused = self.redundant = 0
+        self._last = {}
+
+    def wrap(self, f, aW, aH):
+        wI = f.__dict__.get('_wrapInfo')
+        r = f.wrap(aW,aH)
+        self.wraps += 1
+        if wI is not None and f.__dict__.get('_wrapInfo') is wI:
+            self.reused += 1
+        else:
+            last = self._last.get(id(f))
+            if last and last[1]==aW and (last[2]==aH or last[3]==r):
+                self.redundant += 1
+        #keep the flowable so its id cannot be reused during the build
+        self._last[id(f)] = f, aW, aH, r
+        return r
+
+    def __repr__(self):
+        return '%s(wraps=%d, reused=%d, redundant=%d)' % (self.__class__.__name__,self.wraps,self.reused,self.redundant)
+
+def _wrapStats(canv):
+    stats = getattr(getattr(canv,'_doctemplate',None),'wrapStats',None)
+    return stats if isinstance(stats,WrapStats) else None
 
 class TraceInfo:
     "Holder for info about where an object originated"
@@ -68,6 +98,7 @@ class Flowable:
     """
     _fixedWidth = 0         #assume wrap results depend on arguments?
     _fixedHeight = 0
+    _layoutReplayable = 0   #wrap/split depend only on their arguments and our content?
 
     def __init__(self):
         self.width = 0
@@ -120,7 +151,8 @@ class Flowable:
         '''intended for use by packers allows setting the canvas on
         during the actual wrap'''
         self.canv = canv
-        w, h = self.wrap(aW,aH)
+        stats = _wrapStats(canv)
+        w, h = self.wrap(aW,aH) if stats is None else stats.wrap(self,aW,aH)
         del self.canv
         return w, h
 
@@ -134,6 +166,11 @@ class Flowable:
         """This should return the minimum required width"""
         return getattr(self,'_minWidth',self.width)
 
+    def _layoutKey(self):
+        """identifies the content the wrap/split results of a _layoutReplayable
+        flowable depend on; remembered results are reused only while it is unchanged"""
+        return None
+
     def splitOn(self, canv, aW, aH):
         '''intended for use by packers allows setting the canvas on
         during the actual split'''
@@ -462,8 +499,8 @@ class Image(Flowable):
         img = self._img
         if img:
             self.imageWidth, self.imageHeight = img.getSize()
-            if self._dpi and hasattr(img,'_image'):
-                self._dpi = img._image.info.get('dpi',(72,72))
+            if self._dpi and hasattr(img,'_imageInfo'):
+                self._dpi = img._imageInfo().get('dpi',(72,72))
         elif self._drawing:
             self.imageWidth, self.imageHeight = self._drawing.width,self._drawing.height
             self._dpi = False
@@ -495,8 +532,8 @@ class Image(Flowable):
 
     def __getattr__(self,a):
         if a=='_img':
-            from reportlab.lib.utils import ImageReader  #this may raise an error
-            self._img = ImageReader(self._file)
+            from reportlab.lib.utils import LazyImageReader  #this may raise an error
+            self._img = LazyImageReader(self._file)
             if not isinstance(self._file,strTypes):
                 self._file = None
                 if self._lazy>=2: self._lazy = 1    #here we're assuming we cannot read again
@@ -590,6 +627,12 @@ class SlowPageBreak(PageBreak):
 class PageBreakIfNotEmpty(PageBreak):
     pass
 
+class SectionBreak(PageBreak):
+    '''A page break that also marks the start of an independent section.
+    BaseDocTemplate.parallelBuild draws the sections separately;
+    elsewhere it is just a PageBreak.'''
+    pass
+
 class CondPageBreak(Spacer):
     locChanger=1
     """use up a frame if not enough vertical space effectively CondFrameBreak"""
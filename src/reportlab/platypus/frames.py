@@ -14,6 +14,43 @@ __all__ = (
 
 import logging
 logger = logging.getLogger('reportlab.platypus')
+from reportlab.platypus.flowables import _wrapStats
+
+def _draw(canv, func, *args, **kwds):
+    '''call func(canv,*args,**kwds) letting a canvas that separates flowable
+    content from page template output know (see BaseDocTemplate.parallelBuild)'''
+    content = getattr(canv,'_contentDraw',None)
+    if content:
+        content(func,args,kwds)
+    else:
+        func(canv,*args,**kwds)
+
+_layoutTransients = ('canv', '_frame', '_postponed')
+def _layout(canv, flowable, meth, aW, aH):
+    '''call flowable.wrap or flowable.split; during multiBuild the result and
+    the resulting flowable state are remembered so that later passes can replay
+    them when asked the same question about the same content again (see
+    BaseDocTemplate.multiBuild)'''
+    cache = getattr(getattr(canv,'_doctemplate',None),'_layoutCache',None)
+    if cache is None or not getattr(flowable,'_layoutReplayable',False):
+        if meth=='wrap':
+            stats = _wrapStats(canv)
+            if stats is not None: return stats.wrap(flowable,aW,aH)
+        return getattr(flowable,meth)(aW,aH)
+    key = meth, id(flowable), aW, aH, flowable._layoutKey()
+    hit = cache.get(key)
+    D = flowable.__dict__
+    if hit:
+        r, state = hit[1:]
+        for k in [k for k in D if k not in state and k not in _layoutTransients]:
+            del D[k]
+        D.update(state)
+        return r[:] if meth=='split' else r
+    r = getattr(flowable,meth)(aW,aH)
+    #keep the flowable so its id cannot be reused while the cache lives
+    cache[key] = (flowable, r[:] if meth=='split' else r,
+                    dict((k,v) for k,v in D.items() if k not in _layoutTransients))
+    return r
 
 _geomAttr=('x1', 'y1', 'width', 'height', 'leftPadding', 'bottomPadding', 'rightPadding', 'topPadding')
 from reportlab import rl_config
@@ -166,7 +203,7 @@ class Frame:
                     s = max(s-self._prevASpace,0)
             h = y - p - s
             if h>0 or zeroSize:
-                w, h = flowable.wrap(aW, h)
+                w, h = _layout(canv, flowable, 'wrap', aW, h)
             else:
                 return 0
 
@@ -205,11 +242,11 @@ class Frame:
                                 fbg[-1].start = 'frame-permanent-1'
                         else:
                             fby = fbw = fbh = 0
-                    bg.render(canv,self,fbx,fby,fbw,fbh)
+                    _draw(canv,bg.render,self,fbx,fby,fbw,fbh)
                     if bgm=='frame':
                         fbg.pop()
 
-                flowable.drawOn(canv, self._x + self._leftExtraIndent, y, _sW=aW-w)
+                _draw(canv, flowable.drawOn, self._x + self._leftExtraIndent, y, _sW=aW-w)
                 flowable.canv=canv
                 if self._debug: logger.debug('drew %s' % flowable.identity())
                 y -= sa
@@ -243,7 +280,7 @@ class Frame:
         flowable._frame = self                  #some flowables might need these
         flowable.canv = canv
         try:
-            r = flowable.split(self._aW, h)
+            r = _layout(canv, flowable, 'split', self._aW, h)
         finally:
             #sometimes canv/_frame aren't still on the flowable
             for a in ('canv', '_frame'):
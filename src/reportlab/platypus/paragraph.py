@@ -3,6 +3,7 @@
 #history https://hg.reportlab.com/hg-public/reportlab/log/tip/src/reportlab/platypus/paragraph.py
 __all__=(
         'Paragraph',
+        'SimpleParagraph',
         'cleanBlockQuotedText',
         'ParaLines',
         'FragLine',
@@ -12,19 +13,22 @@ __doc__='''The standard paragraph implementation'''
 from string import whitespace
 from operator import truth
 from unicodedata import category
-from reportlab.pdfbase.pdfmetrics import stringWidth, getAscentDescent
-from reportlab.platypus.paraparser import ParaParser, _PCT, _num as _parser_num, _re_us_value
+from reportlab.pdfbase.pdfmetrics import stringWidth, stringWidthCache, getAscentDescent
+from reportlab.platypus.paraparser import ParaParser, ParaFrag, _PCT, _num as _parser_num, _re_us_value
 from reportlab.platypus.flowables import Flowable
 from reportlab.lib.colors import Color
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER, TA_JUSTIFY
 from reportlab.lib.geomutils import normalizeTRBL
 from reportlab.lib.textsplit import wordSplit, ALL_CANNOT_START
 from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.fonts import ps2tt, tt2ps
 from copy import deepcopy
 from reportlab.lib.abag import ABag
 from reportlab.rl_config import decimalSymbol, _FUZZ, paraFontSizeHeightOffset,\
     hyphenationMinWordLength
 from reportlab.lib.utils import _className, isBytes, isStr
+from reportlab import rl_config
+from collections import OrderedDict
 from reportlab.lib.rl_accel import sameFrag
 import re
 from types import MethodType
@@ -124,6 +128,26 @@ class FragLine(ABag):
                     but could be used for line spacing.
     """
 
+class _SimpleParaLines:
+    """
+    compact kind=0 ParaLines used by SimpleParagraph
+        lines   [(extraSpace1,words1),....,(extraspaceN,wordsN)]
+    """
+    __slots__ = ('lines','fontName','fontSize','textColor','ascent','descent')
+    kind = 0
+    us_lines = link = ()
+
+    def __init__(self, lines, fontName, fontSize, textColor, ascent, descent):
+        self.lines = lines
+        self.fontName = fontName
+        self.fontSize = fontSize
+        self.textColor = textColor
+        self.ascent = ascent
+        self.descent = descent
+
+    def clone(self, lines):
+        return self.__class__(lines, self.fontName, self.fontSize, self.textColor, self.ascent, self.descent)
+
 def _lineClean(L):
     return ' '.join(list(filter(truth,split(strip(L)))))
 
@@ -784,12 +808,14 @@ def _getFragWords(frags,maxWidth=None):
                     elif not S:
                         continue
 
-                for w in S[:-1]:
+                #measure all the words of this frag at once; soft hyphens are not measured
+                SW = stringWidthCache.stringWidths(S if _shy not in text else [w.replace(_shy,'') for w in S], f.fontName, f.fontSize)
+                for i,w in enumerate(S[:-1]):
                     if _shy in w:
                         w = _SHYIndexedStr(w)
                         shyIndices = True
                     W.append((f,w))
-                    n += stringWidth(w, f.fontName, f.fontSize)
+                    n += SW[i]
                     W.insert(0,n)
                     aR(_SHYWordHS(W) if shyIndices or isinstance(W,_SHYWord) else _HSFrag(W))
                     W = []
@@ -802,7 +828,7 @@ def _getFragWords(frags,maxWidth=None):
                     w = _SHYIndexedStr(w)
                     shyIndices = True
                 W.append((f,w))
-                n += stringWidth(w, f.fontName, f.fontSize)
+                n += SW[-1]
                 if text and text[-1] in whitespace:
                     W.insert(0,n)
                     aR(_SHYWord(W) if shyIndices or isinstance(W,_SHYWord) else _HSFrag(W))
@@ -1230,6 +1256,153 @@ def _hyphenateWord(hyphenator,fontName,fontSize,w,ww,newWidth,maxWidth, uriWaste
         hy, hylen, hw, tw, h, t = R
         return [(_SplitWordHY if hy else _SplitWordH)(h+hy),_SplitWordEnd(t)]
 
+def _kpSplits(split, width):
+    '''return [(headWidth, tailWidth, (head, tail)),...] for every way split can divide a word.
+    split(maxWidth) is one of the hyphenation methods that returns the longest head no wider than
+    maxWidth; width gives the width of a head or tail'''
+    R = []
+    limit = 0x7fffffff
+    while True:
+        hsw = split(limit)
+        if not hsw: break
+        hw = width(hsw[0])
+        if R and hw>=R[-1][0]: break
+        R.append((hw,width(hsw[1]),tuple(hsw)))
+        limit = hw - 1e-6
+    return R
+
+_kpLinePenalty = 10
+_kpHyphenPenalty = 50
+_kpDoubleHyphenDemerits = 3000
+_kpInfBad = 10000
+_kpSpaceStretch = 0.5   #fraction of a space that justified lines may stretch without penalty
+_kpRaggedStretch = 3    #fontSizes of stretch allowed at the end of unjustified lines
+
+def _kpBreaks(W, G, F, maxWidths, hyphenations, shrinkage, stretch, raggedStretch, justifyBreaks):
+    '''Knuth-Plass total fit line breaking.
+    W[i] is the width of word i and G[i] the space before it when it is not first on a line;
+    a line must end after word i if F[i] is true.  hyphenations(i) returns the ways word i can
+    be split as from _kpSplits.  Spaces may shrink by shrinkage and, when stretch is non-zero,
+    stretch by stretch of their width; otherwise each line may stretch by raggedStretch.
+    Returns [(i, hyphenation or None),...] the last word on each line or None if no set of breaks fits.
+    '''
+    n = len(W)
+    if not n: return []
+    A = [0]     #cumulative widths of words with their leading spaces
+    S = [0]     #cumulative leading spaces
+    a = s = 0
+    for w, g in zip(W,G):
+        if w>0:
+            a += g + w
+            s += g
+        A.append(a)
+        S.append(s)
+    maxlineno = len(maxWidths)-1
+    H = {}
+    lp2 = _kpLinePenalty**2
+    hp2 = _kpHyphenPenalty**2
+
+    def badness(slack, gaps):
+        if slack<0:
+            sh = shrinkage*gaps
+            return 100*(-slack/sh)**3 if sh>0 else 0
+        st = stretch*gaps if stretch else raggedStretch
+        return min(100*(slack/st)**3,_kpInfBad) if st>0 else (_kpInfBad if slack>1e-8 else 0)
+
+    def node(total, lineno, e, hy, prev):
+        #(total demerits, width offset, space offset, line width, first word, line number, last word, hyphenation, previous)
+        #lines after the last of maxWidths are all alike so lineno stops there
+        if hy is None:
+            i = e+1
+            base = (W[i] if W[i]>0 else 0) - A[i+1]
+        else:
+            i = e
+            base = hy[1] - A[i+1]
+        return (total, base, -S[i+1], maxWidths[lineno], i, lineno, e, hy, prev)
+
+    active = [node(0, 0, -1, None, None)]
+    nC = maxlineno+1
+    for b in range(n):
+        forced = F[b]
+        final = b==n-1
+        lastLine = final or (forced and not justifyBreaks)
+        Ab = A[b+1]
+        Sb = S[b+1]
+        best = [None]*nC    #best whole word break at b for each line number
+        bestH = {}          #best hyphenated breaks keyed by (hyphenation index, line number)
+        drop = []
+        for x, nd in enumerate(active):
+            total, base, sbase, maxWidth, i, lineno, e, hy, prev = nd
+            nat = base + Ab
+            gaps = sbase + Sb
+            if nat<=maxWidth+shrinkage*gaps:
+                v = best[lineno]
+                if v is not None and total+lp2>=v[0]: continue  #cannot do better
+                if lastLine:
+                    c = total + lp2
+                else:
+                    slack = maxWidth - nat
+                    if slack<0:
+                        bad = 100*(-slack/(shrinkage*gaps))**3
+                    elif stretch:
+                        bad = 100*(slack/(stretch*gaps))**3 if gaps>0 else (_kpInfBad if slack>1e-8 else 0)
+                    else:
+                        bad = 100*(slack/raggedStretch)**3
+                    if bad>_kpInfBad: bad = _kpInfBad
+                    c = total + (_kpLinePenalty+bad)**2
+                if v is None or c<v[0]:
+                    best[lineno] = (c, lineno, b, None, nd)
+                continue
+            drop.append(x)
+            if hy is None or i<b:
+                #word b will not fit so try breaking inside it
+                if b not in H:
+                    H[b] = hyphenations(b) if W[b]>0 and not (forced or final) else ()
+                if not H[b]: continue
+                if i<b:
+                    nat = base + A[b] + G[b]
+                else:
+                    nat = gaps = 0
+                lim = maxWidth+shrinkage*gaps
+                for j, h in enumerate(H[b]):
+                    if nat+h[0]<=lim:
+                        c = total + (_kpLinePenalty+badness(maxWidth-nat-h[0], gaps))**2 + hp2
+                        if hy is not None: c += _kpDoubleHyphenDemerits
+                        k = j, lineno
+                        if k not in bestH or c<bestH[k][0]:
+                            bestH[k] = (c, lineno, b, h, nd)
+        if final:
+            nd = None
+            for v in best:
+                if v is not None and (nd is None or v[0]<nd[0]): nd = v
+            if nd is None: return
+            break
+        #only one node is needed for each way of breaking at b with the same widths to come
+        B = {}
+        for j, v in [(None,v) for v in best if v is not None]+[(k[0],v) for k,v in bestH.items()]:
+            k = j, min(v[1]+1,maxlineno)
+            if k not in B or v[0]<B[k][0]:
+                B[k] = v
+        B = [node(c, k[1], e, hy, prev) for k, (c, lineno, e, hy, prev) in B.items()]
+        if forced:
+            active = B
+        else:
+            if drop:
+                if drop[-1]==len(drop)-1:
+                    del active[:len(drop)]
+                else:
+                    for x in reversed(drop):
+                        del active[x]
+            active.extend(B)
+        if not active: return
+    R = [(nd[2],nd[3])]
+    nd = nd[4]
+    while nd[8] is not None:
+        R.append(nd[6:8])
+        nd = nd[8]
+    R.reverse()
+    return R
+
 def _splitWord(w, lineWidth, maxWidths, lineno, fontName, fontSize, encoding='utf8'):
     '''
     split w into words that fit in lines of length
@@ -1593,6 +1766,80 @@ def textTransformFrags(frags,style):
                 if not u: continue
                 f.text = tt(u)
 
+def _parseParaText(text, style, bulletText, caseSensitive, cleaner):
+    "returns the cleaned text, the style, the frags and the bulletText for a Paragraph"
+    #This used to be a global parser to save overhead.
+    #In the interests of thread safety it is being instantiated per paragraph.
+    #On the next release, we'll replace with a cElementTree parser
+    text = cleaner(text)
+    _parser = ParaParser()
+    _parser.caseSensitive = caseSensitive
+    style, frags, bulletTextFrags = _parser.parse(text,style)
+    if frags is None:
+        raise ValueError("xml parser error (%s) in paragraph beginning\n'%s'"\
+            % (_parser.errors[0],text[:min(30,len(text))]))
+    textTransformFrags(frags,style)
+    if bulletTextFrags: bulletText = bulletTextFrags
+    return text, style, frags, bulletText
+
+_dynamic_tag_search = re.compile(r'<\s*seq',re.I).search     #seq seqreset seqchain seqformat seqdefault
+def _isDynamicText(text):
+    "True if text has tags whose parse depends on the document state"
+    if isBytes(text):
+        text = text.decode('latin1')
+    return isinstance(text,str) and _dynamic_tag_search(text) is not None
+
+class ParaParseCache:
+    """process wide LRU cache of Paragraph parses keyed by (text, style, bulletText)
+    and limited to rl_config.paraParseCacheSize entries; the default 0 disables it.
+
+    Documents such as invoices repeat the same cell text thousands of times.
+    The style is matched by identity and the frags are shared by every
+    Paragraph made from the same key, so neither should be changed once used;
+    call clear after modifying a style in place.  Text using the sequencer
+    tags parses differently each time and is never cached."""
+    def __init__(self):
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    @property
+    def maxSize(self):
+        return rl_config.paraParseCacheSize
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def parse(self, text, style, bulletText, caseSensitive, cleaner):
+        "cached equivalent of _parseParaText"
+        maxSize = self.maxSize
+        if maxSize and (_isDynamicText(text) or _isDynamicText(bulletText)):
+            maxSize = 0
+        if maxSize:
+            k = text, id(style), bulletText, caseSensitive, cleaner
+            try:
+                v = self._data.get(k)
+            except TypeError:   #unhashable bulletText
+                maxSize = 0
+        if not maxSize:
+            return _parseParaText(text, style, bulletText, caseSensitive, cleaner)
+        data = self._data
+        if v is not None and v[0] is style:
+            data.move_to_end(k)
+            self.hits += 1
+        else:
+            r = _parseParaText(text, style, bulletText, caseSensitive, cleaner)
+            #keep style alive so its id cannot be reused while the entry exists
+            bulletFrags = isinstance(r[3],list)
+            v = data[k] = (style, r[0], r[1], tuple(r[2]), tuple(r[3]) if bulletFrags else r[3], bulletFrags)
+            while len(data)>maxSize:
+                data.popitem(last=False)
+            self.misses += 1
+        #fresh lists around the shared frags
+        return v[1], v[2], list(v[3]), list(v[4]) if v[5] else v[4]
+
+paraParseCache = ParaParseCache()
+
 class cjkU(str):
     '''simple class to hold the frag corresponding to a str'''
     def __new__(cls,value,frag,encoding):
@@ -1792,6 +2039,8 @@ class Paragraph(Flowable):
 
         It will also be able to handle any MathML specified Greek characters.
     """
+    _layoutReplayable = 1
+
     def __init__(self, text, style=None, bulletText = None, frags=None, caseSensitive=1, encoding='utf8'):
         if style is None:
             style = ParagraphStyle(name='paragraphImplicitDefaultStyle')
@@ -1811,19 +2060,8 @@ class Paragraph(Flowable):
 
     def _setup(self, text, style, bulletText, frags, cleaner):
 
-        #This used to be a global parser to save overhead.
-        #In the interests of thread safety it is being instantiated per paragraph.
-        #On the next release, we'll replace with a cElementTree parser
         if frags is None:
-            text = cleaner(text)
-            _parser = ParaParser()
-            _parser.caseSensitive = self.caseSensitive
-            style, frags, bulletTextFrags = _parser.parse(text,style)
-            if frags is None:
-                raise ValueError("xml parser error (%s) in paragraph beginning\n'%s'"\
-                    % (_parser.errors[0],text[:min(30,len(text))]))
-            textTransformFrags(frags,style)
-            if bulletTextFrags: bulletText = bulletTextFrags
+            text, style, frags, bulletText = paraParseCache.parse(text, style, bulletText, self.caseSensitive, cleaner)
 
         #AR hack
         self.text = text
@@ -1832,13 +2070,27 @@ class Paragraph(Flowable):
         self.bulletText = bulletText
         self.debug = 0  #turn this on to see a pretty one with all the margins etc.
 
+    def _layoutKey(self):
+        D = self.__dict__
+        return self.text, id(D.get('frags',D.get('_frags'))), id(self.style)
+
     def wrap(self, availWidth, availHeight):
         if availWidth<_FUZZ:
             #we cannot fit here
             return 0, 0x7fffffff
+        style = self.style
+        D = self.__dict__
+        frags = D.get('frags',D.get('_frags'))  #don't force a lazy frags property
+        wI = D.get('_wrapInfo')
+        if (wI and wI[0]==availWidth and wI[1] is style and wI[2] is frags and wI[3]==self.text
+                and wI[4] is D.get('blPara') and wI[5]==style.__dict__ and hasattr(self,'canv')):
+            #being laid out again with the same style values; our lines do not
+            #depend on availHeight so the last answer still stands
+            self.width = availWidth
+            self.height = wI[6]
+            return availWidth, wI[6]
         # work out widths array for breaking
         self.width = availWidth
-        style = self.style
         leftIndent = style.leftIndent
         first_line_width = availWidth - (leftIndent+style.firstLineIndent) - style.rightIndent
         later_widths = availWidth - leftIndent - style.rightIndent
@@ -1871,6 +2123,7 @@ class Paragraph(Flowable):
                 leading = blPara.ascent-blPara.descent
             height = len(blPara.lines) * leading
         self.height = height
+        self._wrapInfo = availWidth, style, D.get('frags',D.get('_frags')), self.text, blPara, style.__dict__.copy(), height
         return self.width, height
 
     def minWidth(self):
@@ -2053,6 +2306,13 @@ class Paragraph(Flowable):
         if attemptHyphenation:
             hymwl = getattr(style,'hyphenationMinWordLength',hyphenationMinWordLength)
         self._splitLongWordCount = self._hyphenations = 0
+        optimal = getattr(style,'lineBreakAlgorithm','greedy')
+        if optimal not in ('greedy','optimal'):
+            raise ValueError('ParagraphStyle.lineBreakAlgorithm value %r is invalid' % optimal)
+        optimal = optimal=='optimal'
+        if optimal:
+            kpStretch = _kpSpaceStretch if style.alignment==TA_JUSTIFY else 0
+            kpRaggedStretch = _kpRaggedStretch*style.fontSize
 
         #for bullets, work out width and ensure we wrap the right amount onto line one
         _handleBulletWidth(self.bulletText,style,maxWidths)
@@ -2087,6 +2347,61 @@ class Paragraph(Flowable):
             cLine = []
             currentWidth = -spaceWidth   # hack to get around extra space for word 1
             hyw = stringWidth('-', fontName, fontSize, self.encoding)
+            #measure the words in one go and keep them for the next wrap; the
+            #hyphenation and splitting below creates new words measured as they are met
+            wordWidths = self.__dict__.get('_wordWidths')
+            if not wordWidths or wordWidths[0]!=(fontName,fontSize):
+                wordWidths = [w.replace(_shy,'') for w in words]
+                wordWidths = self._wordWidths = (fontName,fontSize), dict(zip(wordWidths,
+                                stringWidthCache.stringWidths(wordWidths, fontName, fontSize, self.encoding)))
+            wordWidths = wordWidths[1]
+            if optimal:
+                kpWords = [_SHYStr(w) if _shy in w else w for w in words]
+                W = [wordWidths.get(w) for w in kpWords]
+                W = [stringWidth(w, fontName, fontSize, self.encoding) if ww is None else ww for w,ww in zip(kpWords,W)]
+                sW = lambda w: stringWidth(w, fontName, fontSize, self.encoding)
+                def hyphenations(i):
+                    word = kpWords[i]
+                    if isinstance(word,_SHYStr):
+                        split = lambda lim: word.__shysplit__(fontName, fontSize, hyw - 1e-8, lim, encoding=self.encoding)
+                    elif attemptHyphenation and not isinstance(word,_SplitWordH):
+                        hyOk = not getattr(f,'nobr',False)
+                        split = lambda lim: _hyphenateWord(hyphenator if hyOk else None,
+                                    fontName, fontSize, word, W[i], W[i], lim,
+                                    uriWasteReduce if hyOk else False,
+                                    embeddedHyphenation and hyOk, hymwl)
+                    else:
+                        return ()
+                    return _kpSplits(split,sW)
+                n = len(kpWords)
+                plan = _kpBreaks(W, [spaceWidth]*n, [False]*n, maxWidths, hyphenations, spaceShrinkage, kpStretch, kpRaggedStretch, 0)
+                if plan is not None:
+                    start = 0
+                    tail = None
+                    for b, hy in plan:
+                        if tail is None:
+                            cLine = kpWords[start:b]
+                            LW = W[start:b]
+                        else:
+                            cLine = [tail[2][1]]+kpWords[start+1:b]
+                            LW = [tail[1]]+W[start+1:b]
+                        if hy is None:
+                            cLine.append(kpWords[b])
+                            LW.append(W[b])
+                            start = b+1
+                        else:
+                            cLine.append(hy[2][0])
+                            LW.append(hy[0])
+                            start = b
+                            self._hyphenations += 1
+                        tail = hy
+                        currentWidth = sum(LW)+spaceWidth*(len(LW)-1)
+                        if currentWidth>self._width_max: self._width_max = currentWidth
+                        lines.append((maxWidth - currentWidth, cLine))
+                        lineno += 1
+                        maxWidth = maxWidths[min(maxlineno,lineno)]
+                    return f.clone(kind=0, lines=lines,ascent=ascent,descent=descent,fontSize=fontSize)
+                #no set of breaks fits so fall back to first fit
             forcedSplit = 0
             while words:
                 word = words.pop(0)
@@ -2095,7 +2410,9 @@ class Paragraph(Flowable):
                 elif _shy in word:
                     word = _SHYStr(word)    #allow for soft hyphenation
                 #this underscores my feeling that Unicode throughout would be easier!
-                wordWidth = stringWidth(word, fontName, fontSize, self.encoding)
+                wordWidth = wordWidths.get(word)
+                if wordWidth is None:
+                    wordWidth = stringWidth(word, fontName, fontSize, self.encoding)
                 newWidth = currentWidth + spaceWidth + wordWidth
                 limWidth = maxWidth + dSpaceShrink*len(cLine)
                 #print(f's: {currentWidth=} spaceShrink={limWidth-maxWidth} {newWidth=} {limWidth=} {newWidth>limWidth} cond={newWidth>limWidth and not (isinstance(word,_SplitWordH) or forcedSplit)} {word=}')
@@ -2194,6 +2511,62 @@ class Paragraph(Flowable):
             FW = []
             aFW = FW.append
             _words = _getFragWords(frags,maxWidth)
+            if optimal:
+                W = []
+                G = []
+                F = []
+                sw = 0
+                SW = {}
+                for w in _words:
+                    W.append(w[0])
+                    G.append(sw if w[0]>0 else 0)
+                    F.append(w[1][0]._fkind==_FK_BREAK)
+                    if isinstance(w,_HSFrag):
+                        g = w[-1][0]
+                        g = g.fontName, g.fontSize
+                        sw = SW.get(g)
+                        if sw is None:
+                            sw = SW[g] = stringWidth(' ',*g)
+                    else:
+                        sw = 0
+                def hyphenations(i):
+                    w = _words[i]
+                    f = w[1][0]
+                    if hasattr(f,'cbDefn') or isinstance(w,_SplitFragH):
+                        return ()
+                    elif isinstance(w,_SHYWord):
+                        split = lambda lim: w.shyphenate(w[0], lim)
+                    elif attemptHyphenation:
+                        hyOk = not getattr(f,'nobr',False)
+                        split = lambda lim: _hyphenateFragWord(hyphenator if hyOk else None,
+                                    w,w[0],lim,
+                                    uriWasteReduce if hyOk else False,
+                                    embeddedHyphenation and hyOk, hymwl)
+                    else:
+                        return ()
+                    return _kpSplits(split,lambda w: w[0])
+                plan = _kpBreaks(W, G, F, maxWidths, hyphenations, spaceShrinkage, kpStretch, kpRaggedStretch, style.justifyBreaks)
+                if plan is not None:
+                    #replay the chosen breaks through the first fit code below
+                    R = []
+                    start = 0
+                    tail = None
+                    for b, hy in plan:
+                        if tail is not None:
+                            R.append(tail[2][1])
+                            start += 1
+                        R.extend(_words[start:b])
+                        if hy is None:
+                            R.append(_words[b])
+                            start = b+1
+                        else:
+                            R.append(hy[2][0])
+                            start = b
+                            self._hyphenations += 1
+                        tail = hy
+                        if (hy or not F[b]) and b<len(_words)-1:
+                            R.append(_InjectedFrag([0,(R[-1][1][0].clone(_fkind=_FK_BREAK,text=''),'')]))
+                    _words = R
             sFW = 0
             while _words:
                 w = _words.pop(0)
@@ -2721,6 +3094,176 @@ class Paragraph(Flowable):
         i = indent*' '
         return i + ('\n'+i).join(R)
 
+class SimpleParagraph(Paragraph):
+    """ SimpleParagraph(text, style, bulletText=None)
+        A Paragraph for plain single style text; the text is used literally
+        so <, > and & need no escaping and markup is not recognised.
+
+        The lines are broken without any fragment objects and are kept as
+        (extraSpace, words) tuples in a small slotted structure; the output
+        is the same as Paragraph(escape(text),style). Styles needing endDots,
+        hyphenation, textTransform, CJK wrapping or the optimal line breaking
+        algorithm and text with soft hyphens or words longer than a line
+        (with splitLongWords) are handled by the Paragraph code.
+    """
+    def __init__(self, text, style=None, bulletText = None, frags=None, caseSensitive=1, encoding='utf8'):
+        if style is None:
+            style = ParagraphStyle(name='paragraphImplicitDefaultStyle')
+        self.caseSensitive = caseSensitive
+        self.encoding = encoding
+        self.style = style
+        self.bulletText = bulletText or getattr(style,'bulletText',None)
+        self.debug = 0
+        if frags is None:
+            self.text = cleanBlockQuotedText(text)
+        else:
+            #a split of the Paragraph fallback
+            self.text = None
+            self._frags = frags
+
+    @property
+    def frags(self):
+        '''the frags Paragraph would have parsed from the escaped text; made only when needed'''
+        frags = self.__dict__.get('_frags')
+        if frags is None:
+            text = self.text
+            if text:
+                style = self.style
+                fontName, bold, italic = ps2tt(style.fontName)
+                frags = [ParaFrag(rise=0, greek=0, link=[], us_lines=[],
+                            fontName=tt2ps(fontName,bold,italic), bold=bold, italic=italic,
+                            fontSize=style.fontSize, textColor=style.textColor, text=text)]
+                textTransformFrags(frags,style)
+            else:
+                frags = []
+            self._frags = frags
+        return frags
+
+    def _simple(self):
+        style = self.style
+        text = self.text
+        return not (text is None or style.endDots or style.wordWrap=='CJK'
+                    or getattr(style,'textTransform',None) or getattr(style,'hyphenationLang','')
+                    or style.uriWasteReduce or style.embeddedHyphenation
+                    or getattr(style,'lineBreakAlgorithm','greedy')!='greedy'
+                    or _shy in text)
+
+    def breakLines(self, width):
+        if not self._simple():
+            return Paragraph.breakLines(self, width)
+        self._width_max = widthMax = 0
+        if not isinstance(width,(tuple,list)): maxWidths = [width]
+        else: maxWidths = width
+        self.height = lineno = 0
+        maxlineno = len(maxWidths)-1
+        style = self.style
+        self._splitLongWordCount = self._hyphenations = 0
+        maxWidth0 = maxWidths[0]
+        _handleBulletWidth(self.bulletText,style,maxWidths)
+        maxWidth = maxWidths[0]
+
+        text = strip(self.text)
+        if not text:
+            return _SimpleParaLines([], style.fontName, style.fontSize, style.textColor,
+                            style.fontSize, -0.2*style.fontSize)
+        fontSize = style.fontSize
+        fontName, bold, italic = ps2tt(style.fontName)
+        fontName = tt2ps(fontName,bold,italic)
+        ascent, descent = getAscentDescent(fontName,fontSize)
+        #the word widths are kept for the next wrap
+        wordWidths = self.__dict__.get('_simpleWordWidths')
+        if not wordWidths or wordWidths[0]!=(fontName,fontSize):
+            words = split(text)
+            wordWidths = self._simpleWordWidths = ((fontName,fontSize), words,
+                            stringWidthCache.stringWidths(words, fontName, fontSize, self.encoding))
+        words, widths = wordWidths[1:]
+        spaceWidth = stringWidth(' ', fontName, fontSize, self.encoding)
+        dSpaceShrink = style.spaceShrinkage*spaceWidth
+        splitLongWords = style.splitLongWords
+        lines = []
+        cLine = []
+        currentWidth = -spaceWidth   # hack to get around extra space for word 1
+        for word, wordWidth in zip(words,widths):
+            newWidth = currentWidth + spaceWidth + wordWidth
+            if newWidth>maxWidth + dSpaceShrink*len(cLine):
+                if splitLongWords and wordWidth>maxWidths[min(lineno,maxlineno)]:
+                    #a long word needs splitting
+                    maxWidths[0] = maxWidth0
+                    return Paragraph.breakLines(self, width)
+                if cLine:
+                    #end of line
+                    if currentWidth>widthMax: widthMax = currentWidth
+                    lines.append((maxWidth - currentWidth, cLine))
+                    cLine = [word]
+                    currentWidth = wordWidth
+                    lineno += 1
+                    maxWidth = maxWidths[min(maxlineno,lineno)]
+                    continue
+            cLine.append(word)
+            currentWidth = newWidth
+
+        #deal with any leftovers on the final line
+        if cLine:
+            if currentWidth>widthMax: widthMax = currentWidth
+            lines.append((maxWidth - currentWidth, cLine))
+        self._width_max = widthMax
+        return _SimpleParaLines(lines, fontName, fontSize, style.textColor, ascent, descent)
+
+    def split(self,availWidth, availHeight):
+        if self.text is None:
+            return Paragraph.split(self,availWidth,availHeight)
+        if not self.text or availWidth<_FUZZ or availHeight<_FUZZ: return []
+
+        if not hasattr(self,'blPara'):
+            self.wrap(availWidth,availHeight)
+        blPara = self.blPara
+        if not isinstance(blPara,_SimpleParaLines):
+            return Paragraph.split(self,availWidth,availHeight)
+        style = self.style
+        autoLeading = getattr(self,'autoLeading',getattr(style,'autoLeading',''))
+        l = style.leading
+        if autoLeading=='max':
+            l = max(l,1.2*style.fontSize)
+        elif autoLeading=='min':
+            l = 1.2*style.fontSize
+        s = int(availHeight/float(l))
+        height = s*l
+
+        allowOrphans = getattr(self,'allowOrphans',getattr(style,'allowOrphans',0))
+        if (not allowOrphans and s<=1) or s==0: #orphan or not enough room
+            del self.blPara
+            return []
+        lines = blPara.lines
+        n = len(lines)
+        allowWidows = getattr(self,'allowWidows',getattr(style,'allowWidows',1))
+        if n<=s:
+            return [self]
+        if not allowWidows:
+            if n==s+1: #widow?
+                if (allowOrphans and n==3) or n>3:
+                    s -= 1  #give the widow some company
+                else:
+                    del self.blPara #no room for adjustment; force the whole para onwards
+                    return []
+        P1 = self.__class__(' '.join(w for line in lines[:s] for w in line[1]),style,
+                bulletText=self.bulletText,caseSensitive=self.caseSensitive,encoding=self.encoding)
+        P1.blPara = blPara.clone(lines[:s])
+        P1._JustifyLast = True
+        P1._splitpara = 1
+        P1.height = height
+        P1.width = availWidth
+        if style.firstLineIndent != 0:
+            style = deepcopy(style)
+            style.firstLineIndent = 0
+        P2 = self.__class__(' '.join(w for line in lines[s:] for w in line[1]),style,
+                caseSensitive=self.caseSensitive,encoding=self.encoding)
+        for a in ('autoLeading',    #possible attributes that might be directly on self.
+                ):
+            if hasattr(self,a):
+                setattr(P1,a,getattr(self,a))
+                setattr(P2,a,getattr(self,a))
+        return [P1,P2]
+
 if __name__=='__main__':    #NORUNTESTS
     def dumpParagraphLines(P):
         print('dumpParagraphLines(<Paragraph @ %d>)' % id(P))
@@ -11,7 +11,7 @@ import unicodedata
 import reportlab.lib.sequencer
 
 from reportlab.lib.abag import ABag
-from reportlab.lib.utils import ImageReader, annotateException, encode_label, asUnicode
+from reportlab.lib.utils import LazyImageReader, annotateException, encode_label, asUnicode
 from reportlab.lib.colors import toColor, black
 from reportlab.lib.fonts import tt2ps, ps2tt
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER, TA_JUSTIFY
@@ -2715,7 +2715,7 @@ class ParaParser(HTMLParser):
         defn = frag.cbDefn = ABag()
         defn.kind = 'img'
         defn.src = getattr(frag,'src',None)
-        defn.image = ImageReader(defn.src)
+        defn.image = LazyImageReader(defn.src)
         size = defn.image.getSize()
         defn.width = getattr(frag,'width',size[0])
         defn.height = getattr(frag,'height',size[1])
@@ -3209,6 +3209,12 @@ class ParaParser(HTMLParser):
         "attempt replacement for parse"
         self._setup_for_parse(style)
         text = asUnicode(text)
+        if '<' not in text and '&' not in text:
+            #no markup or entities so HTMLParser would only see one data run
+            self.start_para({})
+            if text: self.handle_data(text)
+            self.end_para()
+            return self._complete_parse()
         if not(len(text)>=6 and text[0]=='<' and _re_para.match(text)):
             text = u"<para>"+text+u"</para>"
         try:
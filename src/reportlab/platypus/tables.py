@@ -6,6 +6,7 @@ __all__= (
         'TableStyle',
         'CellStyle',
         'LongTable',
+        'StreamingTable',
         )
 __version__='3.5.21'
 
@@ -35,6 +36,9 @@ from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus.doctemplate import Indenter, NullActionFlowable
 from reportlab.platypus.flowables import LIIndenter
 from collections import namedtuple
+from bisect import bisect_left
+from operator import itemgetter
+import copy
 
 LINECAPS={None: None, 'butt':0,'round':1,'projecting':2,'squared':2}
 LINEJOINS={None: None, 'miter':0, 'mitre':0, 'round':1,'bevel':2}
@@ -246,6 +250,32 @@ def spanFixDim(V0,V,spanCons,lim=None,FUZZ=rl_config._FUZZ):
 class _ExpandedCellTuple(tuple):
     pass
 
+class _RowCmdIndex:
+    '''keyed style commands in absolute row coordinates ordered by first row.
+    The parts of a split table share one of these with a row shift rather than
+    each part rewriting every command that lies below its split'''
+    def __init__(self, cmds):
+        cmds.sort(key=lambda kc: kc[1][1][1])
+        self.cmds = cmds
+        self.starts = [kc[1][1][1] for kc in cmds]
+
+    def __len__(self):
+        return len(self.cmds)
+
+    def count(self, lo):
+        '''number of commands starting at or after row lo'''
+        return len(self.cmds)-bisect_left(self.starts,lo)
+
+    def window(self, lo, hi, shift):
+        '''the commands starting in rows lo<=sr<hi shifted by shift rows'''
+        starts = self.starts
+        return [(k,(c[0],(c[1][0],c[1][1]+shift),(c[2][0],c[2][1]+shift))+tuple(c[3:]))
+                for k,c in self.cmds[bisect_left(starts,lo):bisect_left(starts,hi) if hi is not None else None]]
+
+def _mergeKeyed(*L):
+    '''merge keyed command lists back into their original order'''
+    return sorted([kc for l in L for kc in l], key=itemgetter(0))
+
 
 RoundingRectDef = namedtuple('RoundingRectDefs','x0 y0 w h x1 y1 ar SL')
 RoundingRectLine = namedtuple('RoundingRectLine','xs ys xe ye weight color cap dash join')
@@ -266,7 +296,7 @@ class Table(Flowable):
         self._cellvalues = []
         _seqCW = isinstance(colWidths,(tuple,list))
         _seqRH = isinstance(rowHeights,(tuple,list))
-        if nrows: self._ncols = ncols = max(list(map(_rowLen,data)))
+        if nrows: self._ncols = ncols = len(data[0]) if normalizedData==2 else max(list(map(_rowLen,data)))
         elif colWidths and _seqCW: ncols = len(colWidths)
         else: ncols = 0
         if not emptyTableAction: emptyTableAction = rl_config.emptyTableAction
@@ -307,13 +337,14 @@ class Table(Flowable):
         if not _seqRH: rowHeights = nrows*[rowHeights]
         elif len(rowHeights) != nrows:
             raise ValueError(f'{self.identity()} data error - {nrows} rows in data but {len(rowHeights)} row heights')
-        for i,d in enumerate(data):
-            n = len(d)
-            if n!=ncols:
-                if rl_config.allowShortTableRows and isinstance(d,list):
-                    d[n:] = (ncols-n)*['']
-                else:
-                    raise ValueError(f'{self.identity()} expected {ncols} not {n} columns in row {i}!')
+        if normalizedData!=2:   #2 ==> rows already checked eg in the tables made by splitting
+            for i,d in enumerate(data):
+                n = len(d)
+                if n!=ncols:
+                    if rl_config.allowShortTableRows and isinstance(d,list):
+                        d[n:] = (ncols-n)*['']
+                    else:
+                        raise ValueError(f'{self.identity()} expected {ncols} not {n} columns in row {i}!')
         self._rowHeights = self._argH = rowHeights
         self._colWidths = self._argW = colWidths
         if cellStyles is None:
@@ -419,6 +450,7 @@ class Table(Flowable):
                         if maxLen: vx = vx[:maxLen]
                     if b: break
                 if b: break
+        if rh: rh = [_ for _ in rh if _ is not None] #rows may not all be measured
         if rh:  #find tallest row, it's of great interest'
             tallest = '(tallest row %d)' % int(max(rh))
         else:
@@ -589,6 +621,16 @@ class Table(Flowable):
         fontSize = s.fontsize
         return max([stringWidth(x,fontName,fontSize) for x in v])
 
+    def _getMeasuredRowHeights(self, W):
+        '''return the list of row heights already measured for column widths W (None
+        where not yet measured); the list is shared with the tables made by splitting
+        so each row is only measured once'''
+        W = tuple(W)
+        measured = getattr(self,'_measuredRowHeights',None)
+        if not measured or measured[0]!=W:
+            measured = self._measuredRowHeights = W, self._nrows*[None]
+        return measured[1]
+
     def _calc_height(self, availHeight, availWidth, H=None, W=None):
         H = self._argH
         if not W: W = _calc_pc(self._argW,availWidth)   #widths array
@@ -606,67 +648,79 @@ class Table(Flowable):
                 colSpanCells = self._colSpanCells
                 spanRanges = self._spanRanges
                 colpositions = self._colpositions
+                measured = None
             else:
                 rowSpanCells = colSpanCells = ()
                 spanRanges = {}
+                measured = self._getMeasuredRowHeights(W)
             if canv: saved = canv._fontname, canv._fontsize, canv._leading
             H0 = H
             H = H[:]    #make a copy as we'll change it
             self._rowHeights = H
             spanCons = {}
             FUZZ = rl_config._FUZZ
-            while None in H:
-                i = H.index(None)
-                V = self._cellvalues[i] # values for row i
-                S = self._cellStyles[i] # styles for row i
-                h = 0
-                j = 0
-                for j,(v, s, w) in enumerate(list(zip(V, S, W))): # value, style, width (lengths must match)
-                    ji = j,i
-                    span = spanRanges.get(ji,None)
-                    if ji in rowSpanCells and not span:
-                        continue # don't count it, it's either occluded or unreliable
-                    else:
-                        if isinstance(v,(tuple,list,Flowable)):
-                            if isinstance(v,Flowable): v = (v,)
-                            else: v = flatten(v)
-                            v = V[j] = self._cellListProcess(v,w,None)
-                            if w is None and not self._canGetWidth(v):
-                                raise ValueError(f'Flowable {v[0].identity()} in cell({i},{j}) can\'t have auto width\n{self.identity(30)}')
-                            if canv: canv._fontname, canv._fontsize, canv._leading = s.fontname, s.fontsize, s.leading or 1.2*s.fontsize
-                            if ji in colSpanCells:
-                                if not span: continue
-                                w = max(colpositions[span[2]+1]-colpositions[span[0]],w or 0)
-                            dW,t = self._listCellGeom(v,w or self._listValueWidth(v),s)
-                            if canv: canv._fontname, canv._fontsize, canv._leading = saved
-                            dW = dW + s.leftPadding + s.rightPadding
-                            if not rl_config.allowTableBoundsErrors and dW>w:
-                                from reportlab.platypus.doctemplate import LayoutError
-                                raise LayoutError("Flowable %s (%sx%s points) too wide for cell(%d,%d) (%sx* points) in\n%s" % (v[0].identity(30),fp_str(dW),fp_str(t),i,j, fp_str(w), self.identity(30)))
+            i = hpos = height = 0
+            while 1:
+                try:
+                    i = H.index(None,i)
+                except ValueError:
+                    break
+                h = measured[i] if measured is not None else None
+                if h is None:
+                    V = self._cellvalues[i] # values for row i
+                    S = self._cellStyles[i] # styles for row i
+                    h = 0
+                    j = 0
+                    for j,(v, s, w) in enumerate(list(zip(V, S, W))): # value, style, width (lengths must match)
+                        ji = j,i
+                        span = spanRanges.get(ji,None)
+                        if ji in rowSpanCells and not span:
+                            continue # don't count it, it's either occluded or unreliable
                         else:
-                            v = (v is not None and str(v) or '').split("\n")
-                            t = (s.leading or 1.2*s.fontsize)*len(v)
-                        t += s.bottomPadding+s.topPadding
-                        if span:
-                            r0 = span[1]
-                            r1 = span[3]
-                            if r0!=r1:
-                                x = r0,r1
-                                spanCons[x] = max(spanCons.get(x,t),t)
-                                t = 0
-                    if t>h: h = t   #record a new maximum
+                            if isinstance(v,(tuple,list,Flowable)):
+                                if isinstance(v,Flowable): v = (v,)
+                                else: v = flatten(v)
+                                v = V[j] = self._cellListProcess(v,w,None)
+                                if w is None and not self._canGetWidth(v):
+                                    raise ValueError(f'Flowable {v[0].identity()} in cell({i},{j}) can\'t have auto width\n{self.identity(30)}')
+                                if canv: canv._fontname, canv._fontsize, canv._leading = s.fontname, s.fontsize, s.leading or 1.2*s.fontsize
+                                if ji in colSpanCells:
+                                    if not span: continue
+                                    w = max(colpositions[span[2]+1]-colpositions[span[0]],w or 0)
+                                dW,t = self._listCellGeom(v,w or self._listValueWidth(v),s)
+                                if canv: canv._fontname, canv._fontsize, canv._leading = saved
+                                dW = dW + s.leftPadding + s.rightPadding
+                                if not rl_config.allowTableBoundsErrors and dW>w:
+                                    from reportlab.platypus.doctemplate import LayoutError
+                                    raise LayoutError("Flowable %s (%sx%s points) too wide for cell(%d,%d) (%sx* points) in\n%s" % (v[0].identity(30),fp_str(dW),fp_str(t),i,j, fp_str(w), self.identity(30)))
+                            else:
+                                v = (v is not None and str(v) or '').split("\n")
+                                t = (s.leading or 1.2*s.fontsize)*len(v)
+                            t += s.bottomPadding+s.topPadding
+                            if span:
+                                r0 = span[1]
+                                r1 = span[3]
+                                if r0!=r1:
+                                    x = r0,r1
+                                    spanCons[x] = max(spanCons.get(x,t),t)
+                                    t = 0
+                        if t>h: h = t   #record a new maximum
+                    if measured is not None: measured[i] = h
                 # If a minimum height has been specified use that, otherwise allow the cell to grow
                 H[i] = max(minRowHeights[i],h) if minRowHeights else h
                 # we can stop if we have filled up all available room
                 if longTable:
                     hmax = i+1      #we computed H[i] so known len == i+1
-                    height = sum(H[:hmax])
+                    height += sum(H[hpos:hmax])
+                    hpos = hmax
                     if height > availHeight:
                         #we can terminate if all spans are complete in H[:hmax]
                         if spanCons:
                             msr = max(x[1] for x in spanCons.keys())    #RS=[endrowspan,.....]
                             if hmax>msr:
                                 break
+                        else:
+                            break
             if None not in H: hmax = lim
 
             if spanCons:
@@ -730,7 +784,7 @@ class Table(Flowable):
         checks for it.
         """
         rh = self._rowHeights
-        tallest = max(rh)
+        tallest = max(_ for _ in rh if _ is not None)
         rowNum = rh.index(tallest)
         #rowNum of limited interest as usually it's a split one
         #and we see row #1.  Text might be a nice addition.
@@ -1085,6 +1139,7 @@ class Table(Flowable):
         self._hmax_spanRects = hmax
 
     def setStyle(self, tblstyle):
+        self.__dict__.pop('_wrapInfo',None)
         if not isinstance(tblstyle,TableStyle):
             tblstyle = TableStyle(tblstyle)
         for cmd in tblstyle.getCommands():
@@ -1293,6 +1348,7 @@ class Table(Flowable):
     def wrap(self, availWidth, availHeight):
         self._calc(availWidth, availHeight)
         self.availWidth = availWidth
+        self._wrapInfo = availWidth, availHeight
         return (self._width, self._height)
 
     def onSplit(self,T,byRow=1):
@@ -1317,7 +1373,6 @@ class Table(Flowable):
 
     def _cr_1_1(self, n, nRows, repeatRows, cmds, _srflMode=False):
         nrr = len(repeatRows)
-        rrS = set(repeatRows)
         for c in cmds:
             (sc,sr), (ec,er) = c[1:3]
             if sr in ('splitfirst','splitlast'):
@@ -1327,10 +1382,9 @@ class Table(Flowable):
                 sr = er = n
             if sr<0: sr += nRows
             if er<0: er += nRows
-            cS = set(range(sr,er+1)) & rrS
+            cS = [r for r in repeatRows if sr<=r<=er]
             if cS:
                 #it's a repeat row
-                cS = list(cS)
                 self._addCommand((c[0],)+((sc, repeatRows.index(min(cS))), (ec, repeatRows.index(max(cS))))+tuple(c[3:]))
             if er<n: continue
             sr = max(sr-n,0)+nrr
@@ -1452,13 +1506,13 @@ class Table(Flowable):
         # No content
         return ('', '')
 
-    def _splitLineCmds(self, n, doInRowSplit=0):
+    def _splitLineCmds(self, n, doInRowSplit=0, cmds=None):
         nrows = self._nrows
         ncols = self._ncols
         #copy the commands
         A = []
         # hack up the line commands
-        for op, (sc,sr), (ec,er), weight, color, cap, dash, join, count, space in self._linecmds:
+        for op, (sc,sr), (ec,er), weight, color, cap, dash, join, count, space in (self._linecmds if cmds is None else cmds):
             if isinstance(sr,strTypes) and sr.startswith('split'):
                 A.append((op,(sc,sr), (ec,sr), weight, color, cap, dash, join, count, space))
                 if sr=='splitlast':
@@ -1507,6 +1561,64 @@ class Table(Flowable):
 
         return A
 
+    def __getattr__(self,a):
+        if a in ('_linecmds','_bkgrndcmds') and '_sharedCmds' in self.__dict__:
+            self._unshareCmds()
+            return self.__dict__[a]
+        raise AttributeError(a)
+
+    def _unshareCmds(self):
+        '''make our own line and background command lists from the shared indices'''
+        XL, XB, LI, BI, lo, shift = self.__dict__.pop('_sharedCmds')
+        self._linecmds = [c for k,c in _mergeKeyed(XL,LI.window(lo,None,shift))]
+        self._bkgrndcmds = [c for k,c in _mergeKeyed(XB,BI.window(lo,None,shift))]
+
+    def _keyedSplitCmds(self, n, doInRowSplit=0):
+        '''return the keyed line and background commands that need rewriting for a
+        split at row n and the shared indices holding those that lie entirely below it'''
+        S = self.__dict__.get('_sharedCmds',None)
+        if S is None:
+            ncols = self._ncols
+            XL = []
+            IL = []
+            for k,c in enumerate(self._linecmds):
+                (sc,sr), (ec,er) = c[1:3]
+                if isinstance(sr,int) and isinstance(er,int) and 0<=sr<=er:
+                    if sc<0: sc += ncols
+                    if ec<0: ec += ncols
+                    IL.append((k,(c[0],(sc,sr),(ec,er))+tuple(c[3:])))
+                else:
+                    XL.append((k,c))
+            XB = []
+            IB = []
+            for k,c in enumerate(self._bkgrndcmds):
+                sr, er = c[1][1], c[2][1]
+                (IB if isinstance(sr,int) and isinstance(er,int) and 0<=sr<=er else XB).append((k,c))
+            S = XL, XB, _RowCmdIndex(IL), _RowCmdIndex(IB), 0, 0
+        XL, XB, LI, BI, lo, shift = S
+        hi = n-shift+1  #commands starting after row n are simply shifted
+        L = [(k,d) for k,c in _mergeKeyed(XL,LI.window(lo,hi,shift))
+                for d in self._splitLineCmds(n,doInRowSplit=doInRowSplit,cmds=(c,))]
+        B = _mergeKeyed(XB,BI.window(lo,hi,shift))
+        return L, B, LI, BI, hi, shift
+
+    def _crKeyed(self, cr, args, L, B):
+        '''apply the rewriter cr to keyed line and background commands one at a time
+        returning our resulting commands with their keys'''
+        XL = []
+        XB = []
+        for X, C, cmds, srfl in ((XL,L,self._linecmds,False),(XB,B,self._bkgrndcmds,True)):
+            for k,c in C:
+                m = len(cmds)
+                cr(*(args+([c],)),_srflMode=srfl)
+                X.extend((k,d) for d in cmds[m:])
+        return XL, XB
+
+    def _shareCmds(self, XL, XB, LI, BI, lo, shift):
+        if LI.count(lo) or BI.count(lo):
+            self._sharedCmds = XL, XB, LI, BI, lo, shift
+            del self._linecmds, self._bkgrndcmds
+
     def _stretchCommands(self, n, cmds, oldrowcount):
         """Stretches the commands when a row is split
 
@@ -1939,21 +2051,26 @@ class Table(Flowable):
             splitH = T._argH
 
         cornerRadii = getattr(self,'_cornerRadii',None)
+        mrh = T._minRowHeights
         R0 = self.__class__( data[:n], colWidths=T._colWidths, rowHeights=splitH[:n],
                 repeatRows=repeatRows, repeatCols=repeatCols, splitByRow=self.splitByRow,
-                splitInRow=self.splitInRow, normalizedData=1, cellStyles=T._cellStyles[:n],
+                splitInRow=self.splitInRow, normalizedData=2, cellStyles=T._cellStyles[:n],
                 ident=ident,
                 spaceBefore=getattr(self,'spaceBefore',None),
                 longTableOptimize=lto,
+                minRowHeights=mrh[:n] if mrh else None,
                 cornerRadii=cornerRadii[:2] if cornerRadii else None)
 
         nrows = T._nrows
         ncols = T._ncols
+        measured = getattr(T,'_measuredRowHeights',None)
+        if measured:
+            R0._measuredRowHeights = measured[0], measured[1][:n]
 
-        _linecmds = T._splitLineCmds(n, doInRowSplit=doInRowSplit)
+        L, B, LI, BI, lo, shift = T._keyedSplitCmds(n, doInRowSplit=doInRowSplit)
 
-        R0._cr_0(n,_linecmds,nrows)
-        R0._cr_0(n,T._bkgrndcmds,nrows,_srflMode=True)
+        R0._cr_0(n,[c for k,c in L],nrows)
+        R0._cr_0(n,[c for k,c in B],nrows,_srflMode=True)
         R0._cr_0(n,T._spanCmds,nrows)
         R0._cr_0(n,T._nosplitCmds,nrows)
 
@@ -1980,15 +2097,17 @@ class Table(Flowable):
                     rowHeights=iRowH+splitH[n:],
                     repeatRows=len(repeatRows), repeatCols=repeatCols,
                     splitByRow=self.splitByRow, splitInRow=self.splitInRow,
-                    normalizedData=1,
+                    normalizedData=2,
                     cellStyles=iCS+T._cellStyles[n:],
                     ident=ident,
                     spaceAfter=getattr(self,'spaceAfter',None),
                     longTableOptimize=lto,
+                    minRowHeights=[mrh[i] for i in repeatRows]+list(mrh[n:]) if mrh else None,
                     cornerRadii = cornerRadii,
                     )
-            R1._cr_1_1(n,nrows,repeatRows,_linecmds)
-            R1._cr_1_1(n,nrows,repeatRows,T._bkgrndcmds,_srflMode=True)
+            if measured:
+                R1._measuredRowHeights = measured[0], [measured[1][i] for i in repeatRows]+measured[1][n:]
+            R1._shareCmds(*R1._crKeyed(R1._cr_1_1,(n,nrows,repeatRows),L,B)+(LI,BI,lo,shift-n+len(repeatRows)))
             R1._cr_1_1(n,nrows,repeatRows,T._spanCmds)
             R1._cr_1_1(n,nrows,repeatRows,T._nosplitCmds)
         else:
@@ -1996,15 +2115,17 @@ class Table(Flowable):
             R1 = self.__class__(data[n:], colWidths=T._colWidths, rowHeights=splitH[n:],
                     repeatRows=repeatRows, repeatCols=repeatCols,
                     splitByRow=self.splitByRow, splitInRow=self.splitInRow,
-                    normalizedData=1, cellStyles=T._cellStyles[n:],
+                    normalizedData=2, cellStyles=T._cellStyles[n:],
                     ident=ident,
                     spaceAfter=getattr(self,'spaceAfter',None),
                     longTableOptimize=lto,
+                    minRowHeights=mrh[n:] if mrh else None,
                     cornerRadii = ([0,0] + cornerRadii[2:]) if cornerRadii else None,
                     )
 
-            R1._cr_1_0(n,_linecmds)
-            R1._cr_1_0(n,T._bkgrndcmds,_srflMode=True)
+            if measured:
+                R1._measuredRowHeights = measured[0], measured[1][n:]
+            R1._shareCmds(*R1._crKeyed(R1._cr_1_0,(n,),L,B)+(LI,BI,lo,shift-n))
             R1._cr_1_0(n,T._spanCmds)
             R1._cr_1_0(n,T._nosplitCmds)
         for c in T._srflcmds:
@@ -2055,7 +2176,9 @@ class Table(Flowable):
         return split_at
 
     def split(self, availWidth, availHeight):
-        self._calc(availWidth, availHeight)
+        if self.__dict__.pop('_wrapInfo',None)!=(availWidth, availHeight):
+            #we were not just wrapped for this space
+            self._calc(availWidth, availHeight)
         if self.splitByRow or self.splitInRow:
             if not rl_config.allowTableBoundsErrors and self._width>availWidth: return []
 
@@ -2450,6 +2573,132 @@ class LongTable(Table):
     '''Henning von Bargen's changes will be active'''
     _longTableOptimize = 1
 
+class StreamingTable(Flowable):
+    '''A table whose body rows are pulled from an iterator only as frames are filled.
+
+    rows        an iterable of body rows
+    colWidths   the fixed column widths
+    header      optional list of rows repeated at the top of every part
+    style       a TableStyle or list of commands; only row periodic commands are
+                allowed ie those confined to the header rows or running from
+                the header/first body row to the last row (-1)
+    rowHeights  optional fixed height for the body rows
+
+    Each frame gets an ordinary Table of the rows that fit there and those rows
+    are released once it is drawn, so only about a page of rows is held at once.
+    As the rows are consumed it can only be used in a single pass build.
+    '''
+    def __init__(self, rows, colWidths, header=None, style=None, rowHeights=None,
+                hAlign=None, vAlign=None, spaceBefore=None, spaceAfter=None, ident=None):
+        self.ident = ident
+        self.hAlign = hAlign or 'CENTER'
+        self.vAlign = vAlign or 'MIDDLE'
+        if not colWidths or not all(isinstance(w,(int,float)) for w in colWidths):
+            raise ValueError(f'{self.identity()} needs fixed numeric colWidths not {colWidths!a}')
+        self._colWidths = list(colWidths)
+        self._header = [list(r) for r in header] if header else []
+        self._rowHeight = rowHeights
+        nh = len(self._header)
+        cmds = []
+        if style:
+            if not isinstance(style,TableStyle):
+                style = TableStyle(style)
+            for cmd in style.getCommands():
+                if cmd[0]!='ROUNDEDCORNERS':
+                    sr, er = cmd[1][1], cmd[2][1]
+                    if isinstance(sr,strTypes) or not (0<=sr<=er<nh
+                            or (0<=sr<=nh and er==-1 and cmd[0] not in ('SPAN','NOSPLIT'))):
+                        raise ValueError(f'{self.identity()} style command {cmd!a} is not row periodic')
+                cmds.append(cmd)
+            for k,v in style._opts.items():
+                setattr(self,k,v)
+        self._cmds = cmds
+        if spaceBefore is not None:
+            self.spaceBefore = spaceBefore
+        if spaceAfter is not None:
+            self.spaceAfter = spaceAfter
+        self._rows = iter(rows)
+        self._exhausted = False
+        self._buffer = []   #rows pulled but not yet placed
+        self._measured = None
+        self._T = self._wrapArgs = None
+
+    def _pull(self, n):
+        '''pull up to n more rows from the iterator; return the number pulled'''
+        buffer = self._buffer
+        m = len(buffer)
+        for row in self._rows:
+            buffer.append(row)
+            n -= 1
+            if n<=0: break
+        else:
+            self._exhausted = True
+        return len(buffer)-m
+
+    def _makeTable(self, rows, rowHeights=None):
+        header = self._header
+        if rowHeights is None and self._rowHeight is not None:
+            rowHeights = len(header)*[None]+len(rows)*[self._rowHeight]
+        T = Table(header+rows, colWidths=self._colWidths, rowHeights=rowHeights,
+                style=self._cmds, repeatRows=len(header), hAlign=self.hAlign, vAlign=self.vAlign,
+                ident=self.ident, longTableOptimize=1)
+        measured = self._measured
+        if measured:
+            #reuse what we already measured for these rows
+            n = len(header)+len(rows)
+            T._measuredRowHeights = measured[0], (measured[1]+n*[None])[:n]
+        return T
+
+    def wrap(self, availWidth, availHeight):
+        self._wrapArgs = availWidth, availHeight
+        buffer = self._buffer
+        if not buffer: self._pull(16)
+        while 1:
+            if not (buffer or self._header):
+                self._T = None
+                return 0, 0
+            T = self._makeTable(buffer)
+            w, h = T.wrap(availWidth, availHeight)
+            self._measured = getattr(T,'_measuredRowHeights',None)
+            if h>availHeight or self._exhausted: break
+            #everything fits so estimate how many more rows we may need
+            if not self._pull(max(1,int(len(buffer)*(availHeight-h)/max(h,1))+1)): break
+        self._T = T
+        self._width = w
+        self._height = h
+        return w, h
+
+    def split(self, availWidth, availHeight):
+        if self._wrapArgs!=(availWidth, availHeight):
+            self.wrap(availWidth, availHeight)
+        T = self._T
+        if T is None or self._height<=availHeight: return [self]
+        nh = len(self._header)
+        k = T._getFirstPossibleSplitRowPosition(availHeight) - nh
+        if k<=0: return []
+        buffer = self._buffer
+        chunk = self._makeTable(buffer[:k], rowHeights=T._rowHeights[:nh+k])
+        if hasattr(self,'spaceBefore'):
+            chunk.spaceBefore = self.spaceBefore
+        rest = copy.copy(self)
+        rest.__dict__.pop('_postponed',None)
+        rest.spaceBefore = 0
+        rest._buffer = buffer[k:]
+        measured = self._measured
+        if measured:
+            rest._measured = measured[0], measured[1][:nh]+measured[1][nh+k:]
+        rest._T = rest._wrapArgs = None
+        self._buffer = []
+        self._T = self._measured = None
+        return [chunk, rest]
+
+    def draw(self):
+        T = self._T
+        if T is not None:
+            T.drawOn(self.canv, 0, 0)
+            self._buffer = []
+            self._T = self._measured = None
+
 LINECOMMANDS = list(_LineOpMap.keys())
 
 def _isLineCommand(cmd):
@@ -62,6 +62,7 @@ hyphenationLang
 uriWasteReduce
 embeddedHyphenation
 hyphenationMinWordLength
+lineBreakAlgorithm
 reserveTTFNotdef
 documentLang
 encryptionStrength
@@ -70,14 +71,32 @@ trustedSchemes
 renderPMBackend
 xmlParser
 textPaths
-toColorCanUse'''.split())
+toColorCanUse
+streamPages
+pdfObjectStreams
+imageXObjectCacheSize
+imageXObjectCacheDir
+pageZlibLevel
+pageZlibStrategy
+imageZlibLevel
+imageZlibStrategy
+fontZlibLevel
+fontZlibStrategy
+ttfParseCacheDir
+ttfUseMMap
+ttfIdentityH
+stringWidthCacheSize
+paraParseCacheSize
+qrSymbolCacheSize
+barcodeDrawAsForm
+drawingDrawAsForm'''.split())
 
 allowTableBoundsErrors =    1 # set to 0 to die on too large elements in tables in debug (recommend 1 for production use)
 shapeChecking =             1
 defaultEncoding =           'WinAnsiEncoding'       # 'WinAnsi' or 'MacRoman'
 defaultGraphicsFontName=    'Times-Roman'           #initializer for STATE_DEFAULTS in shapes.py
 pageCompression =           1                       # default page compression mode
-useA85 =                    1                       #set to 0 to disable Ascii Base 85 stream filters
+useA85 =                    0                       #set to 1 to enable Ascii Base 85 stream filters (larger, 7 bit clean output)
 defaultPageSize =           'A4'                    #default page size
 defaultImageCaching =       0                       #set to zero to remove those annoying cached images
 warnOnMissingFontGlyphs =   0                       #if 1, warns of each missing glyph
@@ -150,6 +169,8 @@ uriWasteReduce=0                                    #split URI if we would waste
                                                     #is attempted. suggested value = 0.3
 embeddedHyphenation=0                               #if true attempt hypenation of words with embedded hyphens
 hyphenationMinWordLength=5                          #minimum length of words that can be hyphenated
+lineBreakAlgorithm='greedy'                         #default paragraph line breaking: 'greedy' (first fit) or 'optimal'
+                                                    #(Knuth-Plass total fit over the whole paragraph)
 reserveTTFNotdef=0                                  #if true force subset element 0 to be zero(.notdef)
                                                     #helps to fix bug in edge
 documentLang=None                                   #pdf document catalog Lang value xx-xx not ee_xx
@@ -165,6 +186,36 @@ textPaths='backend'                                 #freetype or _renderPM or ba
                                                     #determines what code is used to create Paths from str
                                                     #see reportlab/graphics/utils.py for full horror
 toColorCanUse='rl_extended_literal_eval'            #change to None or 'rl_safe_eval' depending on trust
+streamPages=0                                       #if true canvases write each finished page to the output
+                                                    #as it is shown so memory use does not grow with page count
+pdfObjectStreams=0                                  #if true pack non stream objects into compressed object streams
+                                                    #with a cross reference stream (PDF 1.5); ignored when encrypting
+imageXObjectCacheSize=0                             #bytes of compressed image XObjects kept in a process wide LRU cache
+                                                    #keyed by source content; 0 means no in memory cache
+imageXObjectCacheDir=''                             #if set, a directory where cached image XObjects are also persisted
+pageZlibLevel=              -1                      #zlib compression level (0-9, -1 is zlib's default) for page and form streams
+pageZlibStrategy=           'default'               #zlib strategy for page streams: default, filtered, huffman, rle or fixed
+imageZlibLevel=             -1                      #zlib compression level for image data we compress
+imageZlibStrategy=          'default'               #zlib strategy for image data
+fontZlibLevel=              -1                      #zlib compression level for embedded font files
+fontZlibStrategy=           'default'               #zlib strategy for embedded font files
+ttfParseCacheDir=''                                 #if set, a directory where parsed TrueType font metrics are kept
+                                                    #keyed by file path, size and mtime so later processes skip parsing
+ttfUseMMap=                 0                       #if true TrueType font files are memory mapped rather than read
+                                                    #so processes share the page cache and subsetting copies only glyphs
+                                                    #(renderPM needs a build with buffer support for mapped fonts)
+ttfIdentityH=               0                       #if true TrueType fonts default to a single Identity-H CIDFontType2
+                                                    #per document with 2 byte codes instead of 256 glyph subsets
+stringWidthCacheSize=       0                       #entries in the process wide (fontName, fontSize, encoding, word) width
+                                                    #cache used by paragraph layout; 0 disables it (see tools/utils/widthbench.py)
+paraParseCacheSize=         0                       #if non zero, the number of (text, style, bulletText) paragraph parses
+                                                    #kept so repeated paragraphs share their frags; 0 disables it
+qrSymbolCacheSize=          128                     #the number of made QR code symbols kept in a process wide LRU cache
+                                                    #keyed by data, level and version; 0 disables it
+barcodeDrawAsForm=          0                       #if true barcode flowables are drawn as a form XObject made once per
+                                                    #document for each class, value and geometry with the bars in one path
+drawingDrawAsForm=          0                       #if true renderPDF draws each distinct drawing as a form XObject made
+                                                    #once per document and reused for repeated logos and charts
 
 # places to look for T1Font information
 T1SearchPath =  (
@@ -148,6 +148,7 @@ static FT_Library ft_library=0;
 typedef struct {
     PyObject_HEAD
     FT_Face face;
+	Py_buffer data;	/*the font file; FreeType reads it for the life of the face*/
 	} py_FT_FontObject;
 
 staticforward PyTypeObject py_FT_Font_Type;
@@ -181,13 +182,19 @@ static py_FT_FontObject *_get_ft_face(char *fontName)
 		goto RET;
 		}
 	ft_face->face = NULL;
+	ft_face->data.obj = NULL;
 	face = PyObject_GetAttrString(font,"face");
 	if(!face) goto RET;
 	_data = PyObject_GetAttrString(face,"_ttf_data");
 	Py_DECREF(face);
 	if(!_data) goto RET;
-	error = FT_New_Memory_Face(ft_library, (unsigned char *)PyBytes_AsString(_data), (FT_Long)PyBytes_GET_SIZE(_data), 0, &ft_face->face);
+	/*_ttf_data may be bytes or a (memory mapped) buffer*/
+	if(PyObject_GetBuffer(_data, &ft_face->data, PyBUF_SIMPLE)){
+		Py_DECREF(_data);
+		goto RET;
+		}
 	Py_DECREF(_data);
+	error = FT_New_Memory_Face(ft_library, (unsigned char *)ft_face->data.buf, (FT_Long)ft_face->data.len, 0, &ft_face->face);
 	if(error){
 		PyErr_Format(PyExc_IOError, "FT_New_Memory_Face(%s) Failed!", fontName);
 		goto RET;
@@ -221,6 +228,7 @@ static	PyObject*	ft_get_face(PyObject* self, PyObject* args)
 static void py_FT_font_dealloc(py_FT_FontObject* self)
 {
     if(self->face) FT_Done_Face(self->face);
+    if(self->data.obj) PyBuffer_Release(&self->data);
     PyObject_DEL(self);
 }
 
@@ -330,6 +330,86 @@ class BarcodeWidgetTestCase(unittest.TestCase):
                 if not klass.valid(c):
                     raise ValueError('%s.valid(%r) does not match' % (klass.__name__,c))
 
+    def test_qr_fast_mask_scoring(self):
+        '''the packed mask scores match getLostPoint and the symbol cache returns equal copies'''
+        from reportlab.graphics.barcode.qrencoder import QRCode, QRUtil, QRErrorCorrectLevel, qrSymbolCache
+        from reportlab.graphics.barcode.qr import QrCodeWidget
+        from reportlab import rl_config
+        for value, level in (('HELLO WORLD', 'Q'), ('0123456789'*20, 'M'), ('https://www.reportlab.com/'*12, 'L')):
+            qr = QRCode(None, getattr(QRErrorCorrectLevel, level))
+            qr.addData(value)
+            qr.version = qr.calculate_version()
+            for i in range(8):
+                qr.makeImpl(True, i)
+                rows, cols = QRUtil.packModules(qr.modules)
+                self.assertEqual(QRUtil.getPackedLostPoint(rows, cols, qr.moduleCount), QRUtil.getLostPoint(qr))
+        old = rl_config.qrSymbolCacheSize
+        try:
+            qrSymbolCache.clear()
+            rl_config.qrSymbolCacheSize = 2
+            W = [QrCodeWidget('cached %d' % (i % 3)) for i in range(6)]
+            for w in W: w.qr.make()
+            self.assertEqual((qrSymbolCache.hits, qrSymbolCache.misses), (0, 6))
+            W[1].qr.make()
+            W[4].qr.make()
+            self.assertEqual((qrSymbolCache.hits, qrSymbolCache.misses), (1, 7))
+            self.assertEqual(W[4].qr.modules, W[1].qr.modules)
+            self.assertIsNot(W[4].qr.modules[0], W[1].qr.modules[0])
+            rl_config.qrSymbolCacheSize = 0
+            qr = QrCodeWidget('cached 1').qr
+            qr.make()
+            self.assertEqual(qr.modules, W[1].qr.modules)
+            self.assertEqual(qrSymbolCache.misses, 7)
+        finally:
+            rl_config.qrSymbolCacheSize = old
+            qrSymbolCache.clear()
+        g = QrCodeWidget('VALUE', qrDrawMode='path').draw()
+        self.assertEqual(len(g.contents), 2)
+
+    def test_barcode_draw_as_form(self):
+        '''repeated barcodes share one form XObject with the bars in one path'''
+        from reportlab.graphics.barcode.code128 import Code128
+        from reportlab.graphics.barcode.common import I2of5
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab import rl_config
+        def make(drawAsForm=None):
+            c = Canvas(None, pageCompression=0)
+            for i in range(6):
+                for B in (Code128('LABEL-%d' % (i % 2), humanReadable=1, drawAsForm=drawAsForm),
+                          I2of5('1234', bearers=2, bearerBox=1, drawAsForm=drawAsForm)):
+                    B.drawOn(c, 20, 20 + 40 * i)
+            return c
+        c = make()
+        self.assertEqual(c._formsinuse, [])
+        c = make(1)
+        self.assertEqual(len(c._formsinuse), 12)
+        self.assertEqual(len(set(c._formsinuse)), 3)
+        self.assertTrue(all(c.hasForm(n) for n in c._formsinuse))
+        form = c._doc.idToObject[c._doc.getXObjectName(c._formsinuse[0])]
+        self.assertEqual(form.stream.split().count(b'f'), 1)
+        old = rl_config.barcodeDrawAsForm
+        try:
+            rl_config.barcodeDrawAsForm = 1
+            self.assertEqual(len(set(make()._formsinuse)), 3)
+            self.assertEqual(make(0)._formsinuse, [])
+        finally:
+            rl_config.barcodeDrawAsForm = old
+        #frame layout state must not change the form name
+        B = Code128('LABEL-0', humanReadable=1)
+        name = B._formName()
+        B._frame = object()
+        B._postponed = 1
+        B._skipMeNextTime = 1
+        self.assertEqual(B._formName(), name)
+        #draw caches derived values on a USPS_4State; one instance must still make one form
+        from reportlab.graphics.barcode.usps4s import USPS_4State
+        c = Canvas(None)
+        B = USPS_4State('01234567094987654321', drawAsForm=1)
+        for i in range(3):
+            B.drawOn(c, 20, 20 + 40 * i)
+        USPS_4State('01234567094987654321', drawAsForm=1).drawOn(c, 20, 200)
+        self.assertEqual(len(set(c._formsinuse)), 1)
+
     def createSample(self,name,memory):
         f = open(self.makeFn(name),'wb')
         f.write(memory)
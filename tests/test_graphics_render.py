@@ -176,6 +176,101 @@ class RenderTestCase(unittest.TestCase):
         lastColWhite = [y for y in range(124) if im.getpixel((223,y))==(255,255,255)]
         self.assertEqual(len(lastColWhite),124)
 
+    @unittest.skipIf(not _renderPM,'no _renderPM')
+    def testTTFText(self):
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        pdfmetrics.registerFont(TTFont('Vera','Vera.ttf'))
+        gs = _renderPM.gstate(100,50)
+        gs.setFont('Vera',12)
+        gs.fillColor = 0
+        gs.drawString(10,20,'Hello')
+        self.assertLess(min(gs.pixBuf),128,'no text was drawn')
+
+    def testDrawAsForm(self):
+        from reportlab.graphics import renderPDF
+        from reportlab.graphics.charts.barcharts import VerticalBarChart
+        from reportlab.pdfgen.canvas import Canvas
+        def chart(v=1):
+            d = Drawing(300,150)
+            c = VerticalBarChart()
+            c.data = [[v,2,3],[3,2,1]]
+            d.add(c)
+            return d
+        self.assertEqual(renderPDF.nodeDigest(chart()),renderPDF.nodeDigest(chart()))
+        self.assertNotEqual(renderPDF.nodeDigest(chart()),renderPDF.nodeDigest(chart(2)))
+        from io import BytesIO
+        c = Canvas(BytesIO())
+        for d in (chart(), chart(), chart(2)):
+            renderPDF.draw(d,c,10,10)
+        self.assertEqual(c._formsinuse,[])
+        for d in (chart(), chart(), chart(2)):
+            d.drawAsForm = 1
+            renderPDF.draw(d,c,10,10)
+        self.assertEqual(len(c._formsinuse),3)
+        self.assertEqual(len(set(c._formsinuse)),2)
+        c.showPage()
+        c.save()
+
+    def testRendererCaches(self):
+        from reportlab.graphics.renderbase import StateTracker, getStateDelta, _nodeDrawMethod
+        from reportlab.graphics.shapes import Wedge, DirectDraw, STATE_DEFAULTS
+        class MyRect(Rect): pass
+        self.assertEqual(_nodeDrawMethod(MyRect),'drawRect')
+        self.assertEqual(_nodeDrawMethod(Drawing),'drawGroup')
+        self.assertEqual(_nodeDrawMethod(Wedge),'drawWedge')
+        self.assertEqual(_nodeDrawMethod(DirectDraw),None)
+        self.assertEqual(_nodeDrawMethod(int),'')
+        r = MyRect(0,0,10,10,fillColor=toColor('red'))
+        r._private = 1
+        self.assertEqual(getStateDelta(r),dict((k,v) for k,v in r.getProperties().items() if k in STATE_DEFAULTS))
+        st = StateTracker()
+        st.push({'fillColor':'red','transform':(2,0,0,2,0,0)})
+        self.assertEqual(st.getCTM(),(2,0,0,2,0,0))
+        st.push({})
+        self.assertIs(st.getState(),st._combined[-2])
+        st['fillColor'] = 'blue'
+        self.assertEqual(st['fillColor'],'blue')
+        self.assertEqual(st._combined[-2]['fillColor'],'red')
+        st.pop()
+        self.assertEqual(st.pop(),{'fillColor':STATE_DEFAULTS['fillColor'],'transform':(.5,0,0,.5,0,0)})
+
+    def testPointCloud(self):
+        from reportlab.graphics.shapes import PointCloud, Circle
+        from reportlab.graphics import renderPDF, renderSVG, renderPS
+        from reportlab.graphics.charts.lineplots import ScatterPlot
+        from reportlab.graphics.widgets.markers import makeMarker
+        from array import array
+        pc = PointCloud([(10,20),(30,40),(50,60)],Rect(-1,-2,2,4,fillColor=toColor('red')))
+        self.assertEqual(pc.points,array('d',[10,20,30,40,50,60]))
+        self.assertEqual(PointCloud([10,20,30,40]).points,array('d',[10,20,30,40]))
+        self.assertEqual(pc.getBounds(),(9,18,51,62))
+        self.assertEqual(pc.copy().points,pc.points)
+        self.assertRaises(AttributeError,setattr,pc,'points',[1,2])
+        pc.verify()
+        d = Drawing(100,100,pc,PointCloud([70,70],makeMarker('FilledCircle',size=4)))
+        pdf = renderPDF.drawToString(d,canvasKwds=dict(pageCompression=0))
+        self.assertEqual(pdf.count(b'/Subtype /Form'),2)
+        self.assertEqual(pdf.count(b' Do Q'),4)
+        self.assertIn(b'q 1 0 0 1 30 40 cm /FormXob.PointCloud_',pdf)
+        svg = renderSVG.drawToString(d)
+        self.assertEqual(svg.count('<use '),4)
+        self.assertEqual(svg.count('<rect x="-1" y="-2"'),1)
+        ps = renderPS.drawToString(d)
+        self.assertEqual(ps.count(b'-1 -2 m'),3)
+        self.assertIn(b'[1 0 0 1 30 40] concat',ps)
+        d = Drawing(400,200)
+        d.add(ScatterPlot(),name='chart')
+        d.chart.lines.symbol = makeMarker('Circle')
+        d.chart.bulkSymbols = 1
+        def clouds(g):
+            return sum((clouds(n) if isinstance(n,Group) else [n] for n in g.getContents() if isinstance(n,(Group,PointCloud))),[])
+        n = len(d.chart.data)
+        self.assertEqual(len(clouds(d.chart.draw())),n)
+        d.chart.lines[0,1].symbol = makeMarker('Square')
+        self.assertEqual(len(clouds(d.chart.draw())),n-1)
+        renderPDF.drawToString(d)
+
 def makeSuite():
     return makeSuiteForClasses(RenderTestCase)
 
@@ -54,6 +54,107 @@ class ReaderTestCase(unittest.TestCase):
         finally:
             rl_config.useA85 = old
 
+    def testLazyImageReader(self):
+        from reportlab.lib.utils import LazyImageReader
+        from reportlab.lib.testutils import testsFolder
+        from reportlab.pdfgen.canvas import Canvas
+        imageFileName = os.path.join(testsFolder,'pythonpowered.gif')
+        ir = LazyImageReader(imageFileName)
+        self.assertEqual(ir.getSize(), (110,44))
+        self.assertNotIn('_image', ir.__dict__, 'header read should not load the image')
+        self.assertNotIn('fp', ir.__dict__, 'header read should not load the file')
+        self.assertEqual(md5(ir.getRGBData()).hexdigest(), '02e000bf3ffcefe9fc9660c95d7e27cf')
+        def pdf(img):
+            c = Canvas(None, invariant=1)
+            c.drawImage(img, 0, 0)
+            c.drawImage(img, 100, 0)
+            c.showPage()
+            return c.getpdfdata()
+        ir = LazyImageReader(imageFileName)
+        self.assertEqual(pdf(ir), pdf(ImageReader(imageFileName)))
+        self.assertNotIn('fp', ir.__dict__, 'pixels should be released after making the XObject')
+        self.assertEqual(ir._data, None)
+        from reportlab.lib.testutils import outputfile
+        jpgFileName = outputfile('test_images_lazy.jpg')
+        ImageReader(imageFileName)._image.convert('RGB').save(jpgFileName,'JPEG')
+        jpg = LazyImageReader(jpgFileName)
+        self.assertEqual(pdf(jpg), pdf(ImageReader(jpgFileName)))
+
+    def testPNGPassThrough(self):
+        from reportlab import rl_config
+        from reportlab.lib.testutils import outputfile
+        from reportlab.pdfbase.pdfdoc import PDFImageXObject
+        from reportlab.pdfbase.pdfutils import readPNGInfo
+        from PIL import Image
+        from io import BytesIO
+        im = ImageReader(os.path.join(os.path.dirname(__file__),'pythonpowered.gif'))._image.convert('RGB')
+        old = rl_config.useA85
+        try:
+            rl_config.useA85 = 0
+            for mode, kwds, passed in (
+                    ('RGB', {}, True),
+                    ('L', {}, True),
+                    ('P', dict(bits=8), True),
+                    ('RGBA', {}, False),                #alpha needs an SMask
+                    ('RGB', dict(transparency=(255,255,255)), False),   #as does auto masking
+                    ):
+                fn = outputfile('test_images_png_%s%s.png' % (mode,''.join('_%s' % k for k in kwds)))
+                img = im.quantize(64) if mode=='P' else im.convert(mode)
+                img.info.pop('transparency',None)
+                img.save(fn,'PNG',**kwds)
+                with open(fn,'rb') as f:
+                    data = f.read()
+                for src in (fn, ImageReader(BytesIO(data))):
+                    xobj = PDFImageXObject('x', src if isinstance(src,str) else None, mask='auto')
+                    if not isinstance(src,str): xobj.loadImageFromSRC(src)
+                    self.assertEqual((xobj.width,xobj.height),(110,44))
+                    if passed:
+                        self.assertEqual(xobj.streamContent, readPNGInfo(data)['idat'], 'PNG %s data was not passed through' % mode)
+                        self.assertEqual(xobj._decodeParms['Colors'], 3 if mode=='RGB' else 1)
+                    else:
+                        self.assertFalse(hasattr(xobj,'_decodeParms'), 'PNG %s %r should be decoded' % (mode,kwds))
+        finally:
+            rl_config.useA85 = old
+
+    def testImageXObjectCache(self):
+        from reportlab import rl_config
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.pdfbase.pdfdoc import imageXObjectCache
+        from reportlab.lib.testutils import testsFolder
+        import tempfile, shutil, pathlib
+        gif = os.path.join(testsFolder,'pythonpowered.gif')
+        png = os.path.join(testsFolder,'test-rgba.png')
+        def pdf():
+            c = Canvas(None, invariant=1)
+            c.drawImage(gif, 0, 0)
+            c.drawImage(ImageReader(png), 0, 0, mask='auto')
+            c.drawImage(ImageReader(gif), 100, 0)
+            c.drawImage(pathlib.Path(gif), 200, 0)
+            c.showPage()
+            return c.getpdfdata()
+        oldSize, oldDir = rl_config.imageXObjectCacheSize, rl_config.imageXObjectCacheDir
+        cacheDir = tempfile.mkdtemp()
+        try:
+            rl_config.imageXObjectCacheSize = 1<<20
+            imageXObjectCache.clear()
+            first = pdf()
+            self.assertEqual((imageXObjectCache.hits,imageXObjectCache.misses),(0,2))
+            self.assertEqual(pdf(), first)
+            self.assertEqual((imageXObjectCache.hits,imageXObjectCache.misses),(2,2))
+            self.assertIsNone(imageXObjectCache.key(object(),None))
+
+            rl_config.imageXObjectCacheSize = 0
+            rl_config.imageXObjectCacheDir = cacheDir
+            imageXObjectCache.clear()
+            self.assertEqual(pdf(), first)
+            imageXObjectCache.clear()
+            self.assertEqual(pdf(), first)
+            self.assertEqual((imageXObjectCache.hits,imageXObjectCache.misses),(2,0))
+        finally:
+            rl_config.imageXObjectCacheSize, rl_config.imageXObjectCacheDir = oldSize, oldDir
+            imageXObjectCache.clear()
+            shutil.rmtree(cacheDir, ignore_errors=True)
+
 def makeSuite():
     return makeSuiteForClasses(ReaderTestCase)
 
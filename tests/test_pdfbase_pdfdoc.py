@@ -45,6 +45,145 @@ class PdfdocTestCase(NearTestCase):
         PL.addPageLabel(0,pdfdoc.PDFPageLabel('D',0,'AA'))
         self.assertEqual(PL.format(doc),b'<<\n/Nums [ 0 2 0 R ]\n>>')
 
+    def testStreamPages(self):
+        from io import BytesIO
+        from reportlab.pdfgen.canvas import Canvas
+        def make(streamPages):
+            f = BytesIO()
+            c = Canvas(f, streamPages=streamPages, invariant=1)
+            for i in range(5):
+                c.drawString(100,700,'Hello page %d' % i)
+                if i==1: c.doForm('later')  #forward reference delays streaming of this page
+                c.drawImage('pythonpowered.gif',100,100)
+                c.showPage()
+                if i==2:
+                    c.beginForm('later')
+                    c.drawString(0,0,'form')
+                    c.endForm()
+            c.save()
+            return f.getvalue()
+        data = make(1)
+        self.assertEqual(make(0).count(b' 0 obj\n'),data.count(b' 0 obj\n'))
+        self.assertTrue(data.startswith(b'%PDF-1.3') and data.endswith(b'%%EOF\n'))
+        #every xref entry must point at the start of its object
+        xref = data[int(data.split(b'startxref\n')[-1].split()[0]):]
+        lines = xref.split(b'\n')
+        n = int(lines[1].split()[1])
+        for i in range(1,n):
+            offset = int(lines[i+2].split()[0])
+            self.assertTrue(data[offset:].startswith(b'%d 0 obj' % i), 'bad offset for object %d' % i)
+        self.assertEqual(data.count(b'/Type /Page\n')+data.count(b'/Type /Page '),5)
+
+    def testStreamFailure(self):
+        import os, tempfile, shutil
+        from reportlab.pdfgen.canvas import Canvas
+        d = tempfile.mkdtemp()
+        try:
+            fn = os.path.join(d,'out.pdf')
+            with open(fn,'wb') as f:
+                f.write(b'previous')
+            c = Canvas(fn, streamPages=1)
+            c.drawString(100,700,'Hello')
+            c.showPage()
+            c.doForm('undefined')
+            self.assertRaises(Exception,c.save)
+            self.assertEqual(open(fn,'rb').read(),b'previous','failed streamed save damaged the output')
+            self.assertEqual(os.listdir(d),['out.pdf'])
+            c = Canvas(fn, streamPages=1)
+            c.drawString(100,700,'Hello')
+            c.save()
+            self.assertTrue(open(fn,'rb').read().endswith(b'%%EOF\n'))
+            self.assertEqual(os.listdir(d),['out.pdf'])
+            if hasattr(os,'symlink'):
+                #a plain save writes through a link into the existing file
+                os.chmod(fn,0o640)
+                ln = os.path.join(d,'link.pdf')
+                os.symlink(fn,ln)
+                c = Canvas(ln, streamPages=0, pageCompression=0)
+                c.drawString(100,700,'Linked')
+                c.save()
+                self.assertTrue(os.path.islink(ln))
+                self.assertEqual(os.stat(fn).st_mode&0o777,0o640)
+                self.assertIn(b'Linked',open(fn,'rb').read())
+                self.assertEqual(sorted(os.listdir(d)),['link.pdf','out.pdf'])
+        finally:
+            shutil.rmtree(d, ignore_errors=True)
+
+    def testObjectStreams(self):
+        import zlib
+        from io import BytesIO
+        from reportlab.pdfgen.canvas import Canvas
+        def stream(data, offset):
+            i = data.index(b'stream\n',offset)+7
+            n = int(re.search(rb'/Length (\d+)',data[offset:i]).group(1))
+            return data[offset:i], zlib.decompress(data[i:i+n])
+        for streamPages in (0,1):
+            f = BytesIO()
+            c = Canvas(f, objectStreams=1, streamPages=streamPages, invariant=1)
+            for i in range(150):
+                c.bookmarkPage('P%d' % i)
+                c.addOutlineEntry('Page %d' % i,'P%d' % i)
+                c.drawString(100,700,'Hello page %d' % i)
+                c.showPage()
+            c.save()
+            data = f.getvalue()
+            self.assertTrue(data.endswith(b'%%EOF\n'))
+            if not streamPages:
+                self.assertTrue(data.startswith(b'%PDF-1.5'))
+            self.assertNotIn(b'trailer',data)
+            xrefoffset = int(data.split(b'startxref\n')[-1].split()[0])
+            D, xref = stream(data,xrefoffset)
+            self.assertIn(b'/Type /XRef',D)
+            w = [int(x) for x in re.search(rb'/W \[ (\d+) (\d+) (\d+) \]',D).groups()]
+            rl = sum(w)
+            E = [(xref[i],int.from_bytes(xref[i+1:i+1+w[1]],'big'),int.from_bytes(xref[i+1+w[1]:i+rl],'big'))
+                    for i in range(0,len(xref),rl)]
+            self.assertEqual(E[0],(0,0,65535))
+            self.assertEqual(int(re.search(rb'/Size (\d+)',D).group(1)),len(E))
+            npacked = 0
+            for n,(t,f1,f2) in enumerate(E[1:],1):
+                if t==1:
+                    self.assertTrue(data[f1:].startswith(b'%d 0 obj' % n), 'bad offset for object %d' % n)
+                else:
+                    self.assertEqual(t,2)
+                    npacked += 1
+                    D, content = stream(data,E[f1][1])
+                    self.assertIn(b'/Type /ObjStm',D)
+                    first = int(re.search(rb'/First (\d+)',D).group(1))
+                    H = content[:first].split()
+                    self.assertEqual(int(H[2*f2]),n)
+            self.assertGreater(npacked,150)
+
+    def testBinaryStreams(self):
+        import zlib
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.lib.testutils import testsFolder
+        import os
+        doc = self.doc
+        img = pdfdoc.PDFImageXObject('img',os.path.join(testsFolder,'pythonpowered.gif'))
+        doc.Reference(img,'img')
+        parts = pdfdoc.PDFIndirectObject('img',img).formatParts(doc)
+        self.assertIs(parts[2],img.streamContent,'image stream content should not be copied')
+        self.assertEqual(b''.join(parts),pdfdoc.PDFIndirectObject('img',img).format(doc))
+        def pdf(**kwds):
+            old = dict((k,getattr(rl_config,k)) for k in kwds)
+            try:
+                for k,v in kwds.items(): setattr(rl_config,k,v)
+                c = Canvas(None,invariant=1)
+                c.drawString(100,100,'Hello World '*100)
+                c.showPage()
+                return c.getpdfdata()
+            finally:
+                for k,v in old.items(): setattr(rl_config,k,v)
+        stream = lambda data: re.search(rb'/Length (\d+).*?\nstream\n(.*?)endstream',data,re.S).group(2)
+        data = pdf(useA85=0)
+        self.assertNotIn(b'ASCII85Decode',data)
+        content = stream(data)
+        self.assertIn(b'Hello World',zlib.decompress(content))
+        self.assertNotEqual(stream(pdf(useA85=0,pageZlibLevel=0)),content)
+        self.assertEqual(stream(pdf(useA85=0,pageZlibLevel=-1,pageZlibStrategy='default')),content)
+        self.assertIn(b'ASCII85Decode',pdf(useA85=1))
+
     @property
     def doc(self):
         return pdfdoc.PDFDocument()
@@ -97,6 +97,82 @@ class PDFMetricsTestCase(unittest.TestCase):
         "Visual test for correct glyph widths"
         makeTestDoc(fontNamesToTest)
 
+    def testStringWidths(self):
+        "stringWidths must agree exactly with stringWidth"
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.lib.randomtext import randomText, PYTHON
+        pdfmetrics.registerFont(TTFont("Vera", "Vera.ttf"))
+        words = randomText(PYTHON,5).split() + ['', 'caf\xe9', b'na\xc3\xafve', '\u2260\u0416', '\u20ac5', 'x\U0001f600']
+        old = pdfmetrics._stringWidthsMinBatch
+        try:
+            for minBatch in (0, old, len(words)+1):
+                pdfmetrics._stringWidthsMinBatch = minBatch
+                for fontName in ('Helvetica','Times-Bold','Symbol','ZapfDingbats','Vera'):
+                    for fontSize in (7, 10.5, 13.7):
+                        self.assertEqual(pdfmetrics.stringWidths(words, fontName, fontSize),
+                            [pdfmetrics.stringWidth(w, fontName, fontSize) for w in words],
+                            'stringWidths(%s,%s) minBatch=%d' % (fontName,fontSize,minBatch))
+        finally:
+            pdfmetrics._stringWidthsMinBatch = old
+        if pdfmetrics._getNumpy():
+            #fonts with code points beyond the table limit use a capped table
+            font = pdfmetrics.getFont('Vera')
+            oldMax = pdfmetrics._widthsTableMax
+            try:
+                pdfmetrics._widthsTableMax = 0x100
+                font.__dict__.pop('_widthsTable',None)
+                self.assertEqual(pdfmetrics.stringWidths(words*5, 'Vera', 10),
+                            [pdfmetrics.stringWidth(w, 'Vera', 10) for w in words*5])
+                self.assertEqual(len(font._widthsTable),0x101)
+            finally:
+                pdfmetrics._widthsTableMax = oldMax
+                font.__dict__.pop('_widthsTable',None)
+
+    def testStringWidthCache(self):
+        "the word width cache agrees with stringWidth and counts its lookups"
+        from reportlab import rl_config
+        from reportlab.platypus.paragraph import Paragraph
+        from reportlab.lib.styles import getSampleStyleSheet
+        cache = pdfmetrics.stringWidthCache
+        old = rl_config.stringWidthCacheSize
+        try:
+            rl_config.stringWidthCacheSize = 4
+            cache.clear()
+            words = ['alpha','beta','gamma','alpha']
+            self.assertEqual(cache.stringWidths(words,'Helvetica',10),
+                    [pdfmetrics.stringWidth(w,'Helvetica',10) for w in words])
+            self.assertEqual((cache.hits,cache.misses),(1,3))
+            self.assertEqual(cache.stringWidth('beta','Helvetica',10),pdfmetrics.stringWidth('beta','Helvetica',10))
+            self.assertEqual((cache.hits,cache.misses),(2,3))
+            cache.stringWidths(['delta','epsilon'],'Helvetica',10)
+            self.assertEqual(len(cache._data),4)
+            self.assertNotIn(('Helvetica',10,'utf8','alpha'),cache._data)    #least recently used went first
+            self.assertIn(('Helvetica',10,'utf8','beta'),cache._data)
+            #bytes are decoded with the encoding so it is part of the key
+            for enc in ('cp1252','latin1'):
+                self.assertEqual(cache.stringWidth(b'\x80','Helvetica',10,enc),pdfmetrics.stringWidth(b'\x80','Helvetica',10,enc))
+            self.assertNotEqual(cache.stringWidth(b'\x80','Helvetica',10,'cp1252'),cache.stringWidth(b'\x80','Helvetica',10,'latin1'))
+            pdfmetrics.registerFont(pdfmetrics.getFont('Helvetica'))
+            self.assertEqual(len(cache._data),0)
+
+            rl_config.stringWidthCacheSize = 1000
+            cache.clear()
+            p = Paragraph(' '.join(['a b c d e f']*10),getSampleStyleSheet()['Normal'])
+            p.wrap(100,1000)
+            self.assertEqual(cache.misses,6)
+            misses = cache.misses
+            p.wrap(50,1000)
+            self.assertEqual(cache.misses,misses)
+
+            rl_config.stringWidthCacheSize = 0
+            cache.clear()
+            self.assertEqual(cache.stringWidths(words,'Helvetica',10),
+                    [pdfmetrics.stringWidth(w,'Helvetica',10) for w in words])
+            self.assertEqual((cache.hits,cache.misses,len(cache._data)),(0,0,0))
+        finally:
+            rl_config.stringWidthCacheSize = old
+            cache.clear()
+
 
 def makeSuite():
     return makeSuiteForClasses(PDFMetricsTestCase)
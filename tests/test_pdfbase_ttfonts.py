@@ -165,6 +165,48 @@ class TTFontFileTestCase(NearTestCase):
         self.assertEqual(ttf.stemV, 87)
         self.assertEqual(ttf.defaultWidth, 600.09765625)
 
+    def testParseCache(self):
+        "Tests the persistent TrueType parse cache"
+        import os, tempfile, shutil
+        ref = TTFontFile("Vera.ttf")
+        cacheDir = tempfile.mkdtemp()
+        old = rl_config.ttfParseCacheDir
+        try:
+            rl_config.ttfParseCacheDir = cacheDir
+            TTFontFile("Vera.ttf")
+            self.assertEqual(len(os.listdir(cacheDir)),1)
+            ttf = TTFontFile("Vera.ttf")
+            for k in ('name','familyName','flags','ascent','descent','bbox','defaultWidth',
+                        'charToGlyph','charWidths','hmetrics','glyphPos','numGlyphs'):
+                self.assertEqual(getattr(ttf,k),getattr(ref,k),'cached %s differs' % k)
+            self.assertEqual(ttf.name.ustr,ref.name.ustr)
+            self.assertEqual(ttf.makeSubset([0x41,0x42]),ref.makeSubset([0x41,0x42]))
+            TTFontFile(BytesIO(TTFOpenFile("Vera.ttf")[1].read()))
+            self.assertEqual(len(os.listdir(cacheDir)),1,'file objects should not be cached')
+        finally:
+            rl_config.ttfParseCacheDir = old
+            shutil.rmtree(cacheDir,True)
+
+    def testMMap(self):
+        "Tests memory mapped font files"
+        import mmap
+        old = rl_config.ttfUseMMap
+        try:
+            rl_config.ttfUseMMap = 1
+            ttf = TTFontFile("Vera.ttf")
+            rl_config.ttfUseMMap = 0
+            ref = TTFontFile("Vera.ttf")
+        finally:
+            rl_config.ttfUseMMap = old
+        self.assertIsInstance(ttf._ttf_data,mmap.mmap)
+        self.assertIsInstance(ref._ttf_data,bytes)
+        self.assertEqual(ttf.charWidths,ref.charWidths)
+        self.assertEqual(ttf.glyphPos,ref.glyphPos)
+        self.assertEqual(ttf.get_table('head'),ref.get_table('head'))
+        subset = [0x41,0x42,0xe9,0x20ac]
+        self.assertEqual(ttf.makeSubset(subset),ref.makeSubset(subset))
+        self.assertEqual(TTFontFile(memoryview(ref._ttf_data)).makeSubset(subset),ref.makeSubset(subset))
+
     def testAdd32(self):
         "Test add32"
         self.assertEqual(add32(10, -6), 4)
@@ -412,6 +454,57 @@ class TTFontTestCase(NearTestCase):
         finally:
             rl_config.ttfAsciiReadable = ttfAsciiReadable
 
+    def testIdentityH(self):
+        "Test TTFont Identity-H embedding"
+        doc = PDFDocument()
+        font = TTFont("Vera", "Vera.ttf", identityH=1)
+        text = u'hello \u0410\u00e9 hello'
+        self.assertEqual(font.splitString(text, doc),
+                [(0, b'\0\1\0\2\0\3\0\3\0\4\0\5\0\6\0\7\0\5\0\1\0\2\0\3\0\3\0\4')])
+        self.assertEqual(font.splitString(u'\u00a0', doc), [(0, b'\0\5')])
+        internalName = font.getSubsetInternalName(0, doc)[1:]
+        font.addObjects(doc)
+        pdfFont = doc.idToObject[internalName]
+        self.assertEqual(pdfFont.Subtype, 'Type0')
+        self.assertEqual(pdfFont.BaseFont, "AAAAAA+BitstreamVeraSans-Roman")
+        cidFont = doc.idToObject[pdfFont.DescendantFonts.sequence[0].name]
+        self.assertEqual(cidFont.Subtype, 'CIDFontType2')
+        widths = cidFont.W.sequence[1].sequence
+        self.assertEqual(widths, [font.face.getCharWidth(ord(c)) for c in u'helo \u0410\u00e9'])
+        cidToGid = doc.idToObject[cidFont.CIDToGIDMap.name].content
+        self.assertEqual(len(cidToGid), 16)
+        toUnicode = doc.idToObject[pdfFont.ToUnicode.name].content
+        self.assertIn('<0006> <0410>', toUnicode)
+        self.assertEqual(len(doc.idToObject['BasicFonts'].dict), 1)
+
+        #the text survives a round trip and is justified with TJ adjustments
+        from reportlab.platypus import Paragraph, SimpleDocTemplate
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.enums import TA_JUSTIFY
+        #a face can only be registered once so hide any earlier Vera
+        fonts, dynFaceNames = pdfmetrics._fonts.copy(), pdfmetrics._dynFaceNames.copy()
+        try:
+            pdfmetrics._dynFaceNames.pop(font.face.name,None)
+            pdfmetrics.registerFont(TTFont("VeraIdentityH", "Vera.ttf", identityH=1))
+            fn = outputfile('test_pdfbase_ttfonts_identityh.pdf')
+            style = ParagraphStyle('identityh',fontName='VeraIdentityH',alignment=TA_JUSTIFY)
+            SimpleDocTemplate(fn).build([Paragraph(u' '.join([u'\u0410\u0411\u0412 hello world']*30),style)])
+        finally:
+            pdfmetrics._fonts.clear()
+            pdfmetrics._fonts.update(fonts)
+            pdfmetrics._dynFaceNames.clear()
+            pdfmetrics._dynFaceNames.update(dynFaceNames)
+        with open(fn,'rb') as f:
+            pdf = f.read()
+        self.assertIn(b'/Identity-H',pdf)
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            return
+        r = PdfReader(fn)
+        self.assertEqual(r.pages[0].extract_text().split(),(u'\u0410\u0411\u0412 hello world '*30).split())
+        self.assertIn(b'] TJ',r.pages[0].get_contents().get_data())
+
     def testMakeToUnicodeCMap(self):
         "Test makeToUnicodeCMap"
         self.assertEqual(makeToUnicodeCMap("TestFont", [ 0x1234, 0x4321, 0x4242 ]),
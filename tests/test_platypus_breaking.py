@@ -480,6 +480,180 @@ class BreakingTestCase(unittest.TestCase):
         canv.showPage()
         canv.save()
 
+    def test7(self):
+        """parallelBuild draws the sections as forms on the pages build would make"""
+        from io import BytesIO
+        from reportlab.platypus.flowables import SectionBreak
+        styleSheet = getSampleStyleSheet()
+        def onPage(canv, doc):
+            canv.drawString(300, 20, 'Page %d' % doc.page)
+        def story():
+            random.seed(2)
+            S = []
+            for i in range(4):
+                if i: S.append(SectionBreak())
+                S.append(Paragraph('Section %d <a href="http://www.reportlab.com/%d">link</a>' % (i,i), styleSheet['Heading1']))
+                for j in range(30):
+                    S.append(Paragraph(randomText(PYTHON, 10), styleSheet['Normal']))
+            return S
+        def run(meth, **kwds):
+            f = BytesIO()
+            doc = SimpleDocTemplate(f, invariant=1, pageCompression=0)
+            getattr(doc, meth)(story(), onFirstPage=onPage, onLaterPages=onPage, **kwds)
+            return f.getvalue()
+        seq = run('build')
+        npages = seq.count(b'/Type /Page\n')
+        for maxWorkers in (1, 2):
+            par = run('parallelBuild', maxWorkers=maxWorkers)
+            self.assertEqual(npages, par.count(b'/Type /Page\n'), 'parallelBuild(maxWorkers=%d) page count differs' % maxWorkers)
+            self.assertEqual(npages, len(re.findall(rb'/FormXob\.Section\d+Page\d+ Do',par)), 'parallelBuild(maxWorkers=%d) section forms not drawn' % maxWorkers)
+            for i in range(npages):
+                self.assertIn(b'(Page %d) Tj' % (i+1), par, 'parallelBuild(maxWorkers=%d) page %d template missing' % (maxWorkers,i+1))
+            for i in range(4):
+                self.assertIn(b'(http://www.reportlab.com/%d)' % i, par)
+                self.assertIn(b'(Section %d ) Tj' % i, par)
+            self.assertEqual(seq.count(b'/Subtype /Link'), par.count(b'/Subtype /Link'))
+            self.assertEqual(seq.count(b'/Type /Font'), par.count(b'/Type /Font'), 'parallelBuild(maxWorkers=%d) fonts not shared' % maxWorkers)
+
+        #page numbers read while drawing are document wide
+        class PageNumber(Flowable):
+            def wrap(self, aW, aH):
+                return aW, 12
+            def draw(self):
+                self.canv.drawString(0, 0, 'PN=%d DP=%d' % (self.canv.getPageNumber(), self.canv._doctemplate.page))
+        def numbered():
+            S = []
+            for i in range(3):
+                if i: S.append(SectionBreak())
+                S.append(PageNumber())
+            return S
+        for maxWorkers in (1, 2):
+            f = BytesIO()
+            doc = SimpleDocTemplate(f, invariant=1, pageCompression=0)
+            progress = []
+            doc.setProgressCallBack(lambda typ, value: progress.append(typ))
+            doc.parallelBuild(numbered(), maxWorkers=maxWorkers)
+            for i in range(3):
+                self.assertIn(b'(PN=%d DP=%d) Tj' % (i+1,i+1), f.getvalue(), 'parallelBuild(maxWorkers=%d) page number %d wrong' % (maxWorkers,i+1))
+            self.assertEqual(progress[-1], 'FINISHED')
+
+        #flowables needing the document's own afterFlowable pass are refused
+        from reportlab.platypus.tableofcontents import TableOfContents
+        self.assertRaises(ValueError, SimpleDocTemplate(BytesIO()).parallelBuild, [TableOfContents()]+numbered())
+        class AfterDoc(SimpleDocTemplate):
+            def afterFlowable(self, flowable):
+                pass
+        self.assertRaises(ValueError, AfterDoc(BytesIO()).parallelBuild, numbered())
+
+    def test8(self):
+        """lineBreakAlgorithm='optimal' uses the Knuth-Plass total fit breaks"""
+        sw = stringWidth(' ','Helvetica',10)
+        def demerits(P):
+            #the Knuth-Plass measure for single frag justified paragraphs
+            d = 0
+            for es, words in P.blPara.lines[:-1]:
+                gaps = 0.5*sw*(len(words)-1)
+                bad = 100*(es/gaps)**3 if es>=0 and gaps else 0
+                d += (10+min(bad,10000))**2
+            return d
+        def lines(P):
+            if P.blPara.kind==0:
+                return [' '.join(l[1]) for l in P.blPara.lines]
+            return [''.join(getattr(w,'text','') for w in l.words).strip() for l in P.blPara.lines]
+        random.seed(11)
+        style = ParagraphStyle('normal',fontName='Helvetica',fontSize=10,leading=12,alignment=TA_JUSTIFY,lineBreakAlgorithm='optimal')
+        greedy = ParagraphStyle('greedy',parent=style,lineBreakAlgorithm='greedy')
+        better = 0
+        for i in range(20):
+            text = randomText(PYTHON,3)
+            P = Paragraph(text,style)
+            G = Paragraph(text,greedy)
+            for width in (150, 220, 330):
+                P.wrap(width,1000)
+                G.wrap(width,1000)
+                self.assertEqual(' '.join(lines(P)).split(),text.split())
+                self.assertLessEqual(demerits(P),demerits(G)+1e-6)
+                better += demerits(P)<demerits(G)-1e-6
+                self.assertTrue(min(l[0] for l in P.blPara.lines)>=-0.05*sw*len(text.split()))
+            #the multi-frag path must choose the same lines
+            M = Paragraph('<font color="red">%s</font>' % text,style)
+            M.wrap(220,1000)
+            P.wrap(220,1000)
+            self.assertEqual(lines(M),lines(P))
+
+        self.assertTrue(better>5,'optimal breaking rarely improved on greedy')
+
+        #hyphenation is considered wherever it helps
+        hyphenator = lambda s: [(s[:j],s[j:]) for j in range(len(s)-2,1,-1)]
+        text = 'abcdefghijklmnopqrstuvwxyz '*12
+        P = Paragraph(text,ParagraphStyle('hy',parent=style,hyphenationLang=hyphenator,splitLongWords=0))
+        P.wrap(200,1000)
+        L = lines(P)
+        self.assertTrue(P._hyphenations>0)
+        self.assertTrue(any(l.endswith('-') for l in L))
+        self.assertEqual(''.join(l.rstrip('-') for l in L).replace(' ',''),text.replace(' ',''))
+        P = Paragraph('<b>x</b> '+text,ParagraphStyle('hy',parent=style,hyphenationLang=hyphenator,splitLongWords=0))
+        P.wrap(200,1000)
+        self.assertTrue(P._hyphenations>0)
+        self.assertEqual(''.join(l.rstrip('-') for l in lines(P)).replace(' ',''),'x'+text.replace(' ',''))
+
+        self.assertRaises(ValueError,Paragraph('x',ParagraphStyle('bad',lineBreakAlgorithm='best')).wrap,100,100)
+
+    def test9(self):
+        """frames and KeepTogether reuse the last wrap of a flowable"""
+        from io import BytesIO
+        from reportlab.platypus.tables import Table
+        random.seed(5)
+        styleSheet = getSampleStyleSheet()
+        def story():
+            S = []
+            for i in range(40):
+                S.append(KeepTogether([Paragraph('Heading %d' % i,styleSheet['Heading2']),
+                            Paragraph(randomText(PYTHON,2),styleSheet['BodyText'])]))
+                if i%8==0:
+                    S.append(Table([[str(j),'row %d' % j] for j in range(50)],repeatRows=1))
+            return S
+        random.seed(5)
+        doc = SimpleDocTemplate(BytesIO(),invariant=1,wrapStats=1)
+        doc.build(story())
+        stats = doc.wrapStats
+        self.assertGreater(stats.reused,0)
+        self.assertLess(stats.redundant,stats.reused)
+        self.assertEqual(repr(stats),'WrapStats(wraps=%d, reused=%d, redundant=%d)' % (stats.wraps,stats.reused,stats.redundant))
+
+        #reusing a wrap must not change the output
+        def build(S):
+            buf = BytesIO()
+            SimpleDocTemplate(buf,invariant=1).build(S)
+            return buf.getvalue()
+        random.seed(5)
+        reused = build(story())
+        wrap = Paragraph.wrap
+        def forgetfulWrap(self, aW, aH):
+            self.__dict__.pop('_wrapInfo',None)
+            return wrap(self, aW, aH)
+        try:
+            Paragraph.wrap = forgetfulWrap
+            random.seed(5)
+            self.assertEqual(reused,build(story()))
+        finally:
+            Paragraph.wrap = wrap
+
+        #a direct wrap always recalculates
+        P = Paragraph('some text to wrap',styleSheet['BodyText'])
+        self.assertEqual(P.wrap(200,100),P.wrap(200,50))
+        wI = P._wrapInfo
+        P.wrap(200,100)
+        self.assertIsNot(P._wrapInfo,wI)
+
+        #changing the style in place is noticed during layout
+        P = Paragraph('some text to wrap',ParagraphStyle('mutable',parent=styleSheet['BodyText']))
+        P.canv = None
+        h = P.wrap(200,100)[1]
+        self.assertEqual(P.wrap(200,100)[1],h)
+        P.style.leading *= 2
+        self.assertEqual(P.wrap(200,100)[1],2*h)
+
 def makeSuite():
     return makeSuiteForClasses(BreakingTestCase)
 
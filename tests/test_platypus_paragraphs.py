@@ -23,7 +23,7 @@ from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate, PageBr
 from reportlab.platypus import tableofcontents
 from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.platypus.tables import TableStyle, Table
-from reportlab.platypus.paragraph import Paragraph, _getFragWords, _splitWord, _fragWordSplitRep, ABag, pyphen
+from reportlab.platypus.paragraph import Paragraph, SimpleParagraph, _getFragWords, _splitWord, _fragWordSplitRep, ABag, pyphen
 from reportlab.rl_config import rtlSupport, trustedHosts, trustedSchemes
 
 def myMainPageFrame(canvas, doc):
@@ -956,6 +956,61 @@ class FragmentTestCase(unittest.TestCase):
         frags = [f.text for f in P.frags]
         assert frags == ['X', 'Y', 'Z']
 
+    def testPlainFastPath(self):
+        "text without markup or entities must parse as if it went through HTMLParser"
+        B = getSampleStyleSheet()['BodyText']
+        D = lambda frags: [sorted(f.__dict__.items(),key=lambda i:i[0]) for f in frags]
+        for text in ('', ' ', 'Total', ' VAT  20% ', 'a > b ]]> "c"'):
+            self.assertEqual(D(ParaParser().parse(text,B)[1]),D(ParaParser().parse('<para>%s</para>' % text,B)[1]))
+
+    def testParseCache(self):
+        "opt in cache of paragraph parses"
+        from reportlab import rl_config
+        from reportlab.platypus.paragraph import paraParseCache
+        B = getSampleStyleSheet()['BodyText']
+        size = rl_config.paraParseCacheSize
+        try:
+            rl_config.paraParseCacheSize = 2
+            paraParseCache.clear()
+            P = [Paragraph(t, B) for t in ('<b>Total</b>','VAT','<b>Total</b>','VAT')]
+            self.assertEqual((paraParseCache.hits,paraParseCache.misses),(2,2))
+            self.assertIsNot(P[0].frags,P[2].frags)
+            self.assertIs(P[0].frags[0],P[2].frags[0])
+            self.assertEqual(P[2].frags[0].fontName,'Helvetica-Bold')
+            Paragraph('VAT', getSampleStyleSheet()['BodyText'])  #another style object
+            Paragraph('Total', B, bulletText='*')
+            self.assertEqual((paraParseCache.hits,paraParseCache.misses),(2,4))
+            self.assertEqual(len(paraParseCache._data),2)
+            Paragraph('<bullet>1</bullet>VAT', B)
+            self.assertEqual([f.text for f in Paragraph('<bullet>1</bullet>VAT', B).bulletText],['1'])
+            self.assertEqual(paraParseCache.hits,3)
+            rl_config.paraParseCacheSize = 0
+            Paragraph('VAT', B)
+            self.assertEqual(paraParseCache.hits,3)
+        finally:
+            rl_config.paraParseCacheSize = size
+            paraParseCache.clear()
+
+    def testParseCacheSeq(self):
+        "paragraphs using the sequencer must not share a cached parse"
+        from reportlab import rl_config
+        from reportlab.platypus.paragraph import paraParseCache
+        from reportlab.lib.sequencer import getSequencer, setSequencer, Sequencer
+        B = getSampleStyleSheet()['BodyText']
+        size = rl_config.paraParseCacheSize
+        seq = getSequencer()
+        try:
+            setSequencer(Sequencer())
+            rl_config.paraParseCacheSize = 100
+            paraParseCache.clear()
+            P = [Paragraph('Item <seq id="it"/>', B) for i in range(4)]
+            self.assertEqual([p.getPlainText() for p in P],['Item 1','Item 2','Item 3','Item 4'])
+            self.assertEqual(len(paraParseCache._data),0)
+        finally:
+            rl_config.paraParseCacheSize = size
+            paraParseCache.clear()
+            setSequencer(seq)
+
     def test2(self):
         '''test _splitWord'''
         self.assertEqual(_splitWord(u'd\'op\u00e9ration',30,[30],0,'Helvetica',12),[u'', u"d'op\xe9", u'ratio', u'n'])
@@ -1224,6 +1279,43 @@ class FragmentTestCase(unittest.TestCase):
         xh = 'eee06395aa68a727d58e688006c85d79'
         self.assertEqual(xh, h, 'test8 code is no longer correct %s != expected %s' % (h,xh))
 
+class SimpleParagraphTestCase(unittest.TestCase):
+    "SimpleParagraph must look like Paragraph"
+
+    def _build(self, klass, texts, style):
+        from io import BytesIO
+        from reportlab.platypus.doctemplate import SimpleDocTemplate
+        buf = BytesIO()
+        SimpleDocTemplate(buf,invariant=1).build([klass(t,style) for t in texts])
+        return buf.getvalue()
+
+    def test0(self):
+        from reportlab.lib.randomtext import randomText, PYTHON
+        from reportlab.platypus.paragraph import _SimpleParaLines
+        N = getSampleStyleSheet()['Normal']
+        texts = [randomText(PYTHON,10) for i in range(40)] + ['', 'x'*300, 'Mr\xa0Smith\xa0went to town', 'soft\xadhyphen']
+        for style in (N,
+                ParagraphStyle('J',parent=N,alignment=TA_JUSTIFY,firstLineIndent=20,bulletText='*'),
+                ParagraphStyle('C',parent=N,alignment=TA_CENTER,fontName='Times-Bold',autoLeading='max'),
+                ParagraphStyle('R',parent=N,alignment=TA_RIGHT,textTransform='uppercase',allowWidows=0),
+                ParagraphStyle('L',parent=N,splitLongWords=0,fontSize=30,leading=36),
+                ):
+            self.assertEqual(self._build(Paragraph,texts,style),self._build(SimpleParagraph,texts,style),
+                    'SimpleParagraph output differs for style %s' % style.name)
+        P = SimpleParagraph(texts[0],N)
+        P.wrap(200,1000)
+        self.assertIsInstance(P.blPara,_SimpleParaLines)
+        self.assertIsNone(P.__dict__.get('_frags'),'wrap must not make the lazy frags')
+        self.assertEqual(P.getPlainText(),Paragraph(texts[0],N).getPlainText())
+        self.assertEqual(P.minWidth(),Paragraph(texts[0],N).minWidth())
+        P = SimpleParagraph('a<b> & c',N)
+        self.assertEqual(P.getPlainText(),'a<b> & c')
+        P.wrap(200,1000)
+        self.assertEqual(P.blPara.lines[0][1],['a<b>','&','c'])
+        P = SimpleParagraph('x'*300,N)
+        P.wrap(200,1000)
+        self.assertNotIsInstance(P.blPara,_SimpleParaLines)
+
 class ULTestCase(unittest.TestCase):
     "Test underlining and overstriking of paragraphs."
     def testUl(self):
@@ -1753,7 +1845,7 @@ impose an interpretation on the system of base rules exclusive of the
 
 #noruntests
 def makeSuite():
-    return makeSuiteForClasses(ParagraphCorners,SplitFrameParagraphTest,FragmentTestCase, ParagraphSplitTestCase, ULTestCase, JustifyTestCase,
+    return makeSuiteForClasses(ParagraphCorners,SplitFrameParagraphTest,FragmentTestCase, SimpleParagraphTestCase, ParagraphSplitTestCase, ULTestCase, JustifyTestCase,
             AutoLeadingTestCase)
 
 #noruntests
@@ -1135,6 +1135,113 @@ class TablesTestCase(unittest.TestCase):
         assert(T[0]._cornerRadii==[0,3,0,0])
         assert(T[1]._cornerRadii==[0,3,5,0])
 
+    def test6(self):
+        '''long tables are measured once and split tables share the measurements'''
+        from io import BytesIO
+        bodyText = styleSheet['BodyText']
+        class CP(Paragraph):
+            wraps = []
+            def wrap(self, aW, aH):
+                self.wraps.append(self)
+                return Paragraph.wrap(self, aW, aH)
+        N = 600
+        data = [['No','Item']]+[[str(i),CP('item %d %s' % (i,' spam'*(i%7)),bodyText)] for i in range(N)]
+        for lto in (0,1):
+            CP.wraps[:] = []
+            t = Table(data, colWidths=(50,100), repeatRows=1, longTableOptimize=lto, minRowHeights=[0]+N*[30],
+                    style=[('GRID',(0,0),(-1,-1),0.5,colors.black),('ROWBACKGROUNDS',(0,1),(-1,-1),[colors.white,colors.lightgrey])])
+            T = t.split(300,500)
+            self.assertEqual(len(T),2)
+            self.assertEqual(T[1]._measuredRowHeights[1][0],T[0]._measuredRowHeights[1][0])
+            if lto:
+                self.assertIn(None,T[1]._rowHeights,'long table should stop measuring at the available height')
+            self.assertEqual(T[1]._minRowHeights[:2],[0,30])
+            CP.wraps[:] = []
+            SimpleDocTemplate(BytesIO()).build([Table(data, colWidths=(50,100), repeatRows=1, longTableOptimize=lto)])
+            #each paragraph is wrapped once when measured and once more when drawn
+            self.assertEqual(len(CP.wraps),2*N)
+            self.assertEqual(len(set(map(id,CP.wraps))),N)
+
+    def test7(self):
+        '''StreamingTable pulls its rows as the frames are filled'''
+        from io import BytesIO
+        from reportlab.platypus.tables import StreamingTable
+        N = 3000
+        pulled = [0]
+        def rows():
+            for i in range(N):
+                pulled[0] += 1
+                yield [str(i),'item %d' % i, '%d.00' % (i*7%1000)]
+        placed = []
+        backlog = []
+        assertEqual = self.assertEqual
+        def record(V):
+            assertEqual(V[0],['No','Item','Amount'])
+            placed.extend(int(r[0]) for r in V[1:])
+            backlog.append((pulled[0]-len(placed),len(V)-1))
+        class ST(StreamingTable):
+            def draw(self):
+                if self._T: record(self._T._cellvalues)
+                StreamingTable.draw(self)
+        class Doc(SimpleDocTemplate):
+            def afterFlowable(self, f):
+                if isinstance(f,Table): record(f._cellvalues)
+        style = [('GRID',(0,0),(-1,-1),0.5,colors.black),
+                ('ROWBACKGROUNDS',(0,1),(-1,-1),[colors.white,colors.lightgrey]),
+                ('FONT',(0,0),(-1,0),'Helvetica-Bold')]
+        Doc(BytesIO()).build([Paragraph('A ledger',styleSheet['BodyText']),
+                ST(rows(),colWidths=(60,200,80),header=[['No','Item','Amount']],style=style)])
+        self.assertEqual(placed,list(range(N)))
+        #never more than a couple of pages worth of rows held at once
+        perPage = max(b[1] for b in backlog)
+        self.assertGreater(len(backlog),10)
+        self.assertLessEqual(max(b[0] for b in backlog),2*perPage)
+        for cmd in (('SPAN',(0,1),(1,-1)),('BACKGROUND',(0,3),(-1,-1),colors.red),
+                    ('LINEBELOW',(0,-1),(-1,-1),1,colors.black),('TEXTCOLOR',(0,'splitfirst'),(-1,'splitfirst'),colors.red)):
+            self.assertRaises(ValueError,StreamingTable,[],colWidths=(60,200),header=[['a','b']],style=[cmd])
+        self.assertRaises(ValueError,StreamingTable,[],colWidths=(60,None))
+
+    def test8(self):
+        '''split tables share the style commands below the split'''
+        from io import BytesIO
+        N = 600
+        data = [['No','Item','Amount']]+[[str(i),'item %d' % i,'%d.00' % i] for i in range(N)]
+        style = [('GRID',(0,0),(-1,-1),0.5,colors.black),
+                ('LINEBELOW',(0,'splitlast'),(-1,'splitlast'),2,colors.red),
+                ('BACKGROUND',(0,'splitfirst'),(-1,'splitfirst'),colors.yellow),
+                ('LINEABOVE',(0,-3),(-1,-1),1,colors.purple)]
+        for i in range(1,N+1):
+            if i%2: style.append(('BACKGROUND',(0,i),(-1,i),colors.lightgrey))
+            if i%5==0: style.append(('LINEBELOW',(0,i),(-1,i),1,colors.blue))
+            if i%37==0: style.append(('BOX',(0,i),(-1,i+5),2,colors.green))
+        def build(repeatRows):
+            buf = BytesIO()
+            SimpleDocTemplate(buf,invariant=1).build([Spacer(0,200),Table(data,repeatRows=repeatRows,style=style)])
+            return buf.getvalue()
+        T = Table(data,repeatRows=1,style=style)
+        T.wrap(400,300)
+        R0, R1 = T.split(400,300)
+        self.assertNotIn('_sharedCmds',R0.__dict__)
+        self.assertIn('_sharedCmds',R1.__dict__)
+        R1.wrap(400,300)
+        S0, S1 = R1.split(400,300)
+        self.assertIs(S1._sharedCmds[2],R1._sharedCmds[2])
+        n = R0._nrows+S0._nrows-1
+        k = n+1 if n%2 else n+2
+        self.assertIn(('BACKGROUND',(0,k-n),(-1,k-n),colors.lightgrey),S1._bkgrndcmds)
+        self.assertNotIn('_sharedCmds',S1.__dict__)
+        #the shared commands must draw exactly as the rewritten ones did
+        shared = [build(rr) for rr in (0,1)]
+        _shareCmds = Table._shareCmds
+        def unshared(self, *args):
+            _shareCmds(self, *args)
+            if '_sharedCmds' in self.__dict__: self._unshareCmds()
+        try:
+            Table._shareCmds = unshared
+            self.assertEqual(shared,[build(rr) for rr in (0,1)])
+        finally:
+            Table._shareCmds = _shareCmds
+
 def makeSuite():
     return makeSuiteForClasses(TablesTestCase)
 
@@ -370,6 +370,48 @@ class TocTestCase(unittest.TestCase):
         doc = MyDocTemplate(outputfile('test_platypus_toc_simple.pdf'))
         doc.build(S)
 
+    def test3(self):
+        "incremental multiBuild must produce the same document as a full rebuild"
+        from io import BytesIO
+        headerStyle = makeHeaderStyle(0)
+        bodyStyle = makeBodyStyle()
+        def story():
+            random.seed(1306291711)
+            S = [tableofcontents.TableOfContents()]
+            for i in range(8):
+                S.append(Paragraph('Chapter %d' % i, headerStyle))
+                for j in range(6):
+                    S.append(Paragraph(xmlEscape(randomtext.randomText(randomtext.PYTHON, 12)), bodyStyle))
+            return S
+        def run(incremental):
+            f = BytesIO()
+            doc = MyDocTemplate(f, invariant=1)
+            doc.allowSplitting = 1
+            passes = doc.multiBuild(story(), incremental=incremental)
+            return passes, f.getvalue()
+        full = run(False)
+        self.assertEqual(full[0], 2)
+        self.assertEqual(full, run(True), 'incremental multiBuild differs from full rebuild')
+
+    def test4(self):
+        "incremental multiBuild must not replay the layout of paragraphs changed between passes"
+        from io import BytesIO
+        bodyStyle = makeBodyStyle()
+        total = Paragraph('Total pages: ??', bodyStyle)
+        class TotalDocTemplate(MyDocTemplate):
+            def beforeDocument(self):
+                total.__init__('Total pages: %s' % getattr(self,'_lastPage','??'), bodyStyle)
+            def afterPage(self):
+                self._lastPage = self.page
+        S = [total, tableofcontents.TableOfContents()]
+        for i in range(3):
+            S.append(Paragraph('Chapter %d' % i, makeHeaderStyle(0)))
+            S.append(PageBreak())
+        f = BytesIO()
+        doc = TotalDocTemplate(f, invariant=1, pageCompression=0)
+        self.assertEqual(doc.multiBuild(S, incremental=True), 2)
+        self.assertIn(b'(Total pages: 3)', f.getvalue())
+
 def makeSuite():
     return makeSuiteForClasses(TocTestCase)
 
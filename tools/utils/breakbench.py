@@ -0,0 +1,36 @@
+__all__=('breakbench',)
+def breakbench(nWords=10000, widths=(200,300,450), repeats=3, verbose=1):
+    '''compare greedy and optimal (Knuth-Plass) line breaking times and line counts
+    for a single long justified paragraph, as plain text and with markup'''
+    import time, random
+    from reportlab.platypus.paragraph import Paragraph
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.enums import TA_JUSTIFY
+    from reportlab.lib.randomtext import randomText, PYTHON
+    random.seed(1)
+    words = []
+    while len(words)<nWords:
+        words.extend(randomText(PYTHON,1).split())
+    plain = ' '.join(words[:nWords])
+    marked = ' '.join(('<b>%s</b>' % w if i%9==0 else w) for i,w in enumerate(words[:nWords]))
+    results = []
+    for label, text in (('plain',plain),('markup',marked)):
+        for alg in ('greedy','optimal'):
+            style = ParagraphStyle('bench',fontName='Helvetica',fontSize=10,leading=12,
+                        alignment=TA_JUSTIFY,lineBreakAlgorithm=alg)
+            t = 0
+            for r in range(repeats):
+                P = [Paragraph(text,style) for w in widths]
+                t0 = time.time()
+                for p,w in zip(P,widths):
+                    p.wrap(w,0x7fffffff)
+                t += time.time()-t0
+            nLines = sum(len(p.blPara.lines) for p in P)
+            results.append((label,alg,nLines,1000*t/repeats))
+            if verbose:
+                print('%-8s %-8s %6d lines %10.1f ms' % results[-1])
+    return results
+
+if __name__=='__main__':
+    import sys
+    breakbench(int(sys.argv[1]) if len(sys.argv)>1 else 10000)
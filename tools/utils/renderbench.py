@@ -0,0 +1,73 @@
+__all__=('renderbench',)
+def renderbench(nPoints=20000, renderers=('PDF','PM','SVG'), repeats=1, verbose=1):
+    '''time renderPDF, renderPM and renderSVG drawing a scatter plot with
+    nPoints markers (as shapes and as a PointCloud) and a drawing of nPoints
+    plain shapes'''
+    import time, random
+    from reportlab.graphics.shapes import Drawing, Group, Rect, Circle, Line, PolyLine
+    from reportlab.graphics.charts.lineplots import ScatterPlot
+    from reportlab.graphics.widgets.markers import makeMarker
+    from reportlab.lib import colors
+    random.seed(1)
+
+    def scatter(bulk=0):
+        d = Drawing(400,300)
+        p = ScatterPlot()
+        p.bulkSymbols = bulk
+        p.x = p.y = 40
+        p.width, p.height = 340, 240
+        p.data = [[(random.random(),random.random()) for i in range(nPoints)]]
+        p.lines[0].symbol = makeMarker('FilledCircle',size=2)
+        p.lineLabelFormat = None
+        p.xLabel = p.yLabel = ''
+        p.xValueAxis.visible = p.yValueAxis.visible = 0
+        d.add(p)
+        return d
+
+    def shapes():
+        d = Drawing(400,300)
+        g = Group()
+        for i in range(nPoints):
+            x, y = random.random()*400, random.random()*300
+            k = i%4
+            if k==0:
+                g.add(Rect(x,y,3,3,fillColor=colors.red,strokeColor=None))
+            elif k==1:
+                g.add(Circle(x,y,2,fillColor=colors.blue,strokeWidth=0.5))
+            elif k==2:
+                g.add(Line(x,y,x+3,y+3,strokeColor=colors.green))
+            else:
+                g.add(PolyLine([x,y,x+2,y+3,x+4,y],strokeColor=colors.black))
+        d.add(g)
+        return d
+
+    results = []
+    for label, make in (('scatter',scatter),('bulk',lambda: scatter(1)),('shapes',shapes)):
+        d = make()
+        for name in renderers:
+            try:
+                if name=='PDF':
+                    from reportlab.graphics.renderPDF import drawToString
+                    draw = lambda: drawToString(d)
+                elif name=='PM':
+                    from reportlab.graphics.renderPM import drawToString
+                    draw = lambda: drawToString(d,fmt='GIF')
+                else:
+                    from reportlab.graphics.renderSVG import drawToString
+                    draw = lambda: drawToString(d)
+                t0 = time.time()
+                for r in range(repeats):
+                    draw()
+                t = (time.time()-t0)/repeats
+            except Exception as e:
+                if verbose:
+                    print('%-8s %-4s failed: %s' % (label,name,e))
+                continue
+            results.append((label,name,nPoints,1000*t))
+            if verbose:
+                print('%-8s %-4s %8d nodes %10.1f ms' % results[-1])
+    return results
+
+if __name__=='__main__':
+    import sys
+    renderbench(int(sys.argv[1]) if len(sys.argv)>1 else 20000)
@@ -0,0 +1,55 @@
+__all__=('streambench',)
+def streambench(pages=200, image=None, configs=None, verbose=1):
+    '''compare bytes written and time per page for stream encoding settings.
+    configs is a sequence of (label, dict of rl_config settings); the default
+    compares ASCII85 with binary streams and some zlib levels/strategies'''
+    import os, time, tempfile
+    from reportlab import rl_config
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.lib.randomtext import randomText, PYTHON
+    from reportlab.pdfbase.pdfdoc import imageXObjectCache
+    if image is None:
+        import reportlab
+        image = os.path.join(os.path.dirname(reportlab.__file__),'..','..','tests','pythonpowered.gif')
+    if configs is None:
+        configs = (
+            ('A85+zlib', dict(useA85=1)),
+            ('binary zlib', dict(useA85=0)),
+            ('binary zlib 1', dict(useA85=0, pageZlibLevel=1, imageZlibLevel=1)),
+            ('binary zlib 9', dict(useA85=0, pageZlibLevel=9, imageZlibLevel=9)),
+            ('binary zlib 9 filtered images', dict(useA85=0, pageZlibLevel=9, imageZlibLevel=9, imageZlibStrategy='filtered')),
+            )
+    lines = [randomText(PYTHON,8) for i in range(60)]
+    fd, fn = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    results = []
+    try:
+        for label, settings in configs:
+            old = dict((k,getattr(rl_config,k)) for k in settings)
+            try:
+                for k,v in settings.items(): setattr(rl_config,k,v)
+                imageXObjectCache.clear()
+                t0 = time.time()
+                c = Canvas(fn, invariant=1)
+                for p in range(pages):
+                    c.setFont('Helvetica',8)
+                    for i,line in enumerate(lines):
+                        c.drawString(36,800-12*i,line[:120])
+                    #a different image each page so every one is compressed
+                    c.drawImage(image,36,36,width=110+p%7,height=44,mask=[p%256]*6)
+                    c.showPage()
+                c.save()
+                t = time.time()-t0
+            finally:
+                for k,v in old.items(): setattr(rl_config,k,v)
+            size = os.path.getsize(fn)
+            results.append((label,size,1000*t/pages))
+            if verbose:
+                print('%-32s %10d bytes %8.3f ms/page' % results[-1])
+    finally:
+        os.remove(fn)
+    return results
+
+if __name__=='__main__':
+    import sys
+    streambench(int(sys.argv[1]) if len(sys.argv)>1 else 200)
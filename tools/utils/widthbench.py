@@ -0,0 +1,40 @@
+__all__=('widthbench',)
+def widthbench(nParas=1000, sizes=(0,20000), repeats=3, verbose=1):
+    '''time the wrapping of many short paragraphs, plain and with markup, with
+    the word width cache (rl_config.stringWidthCacheSize) at each of sizes'''
+    import time, random
+    from reportlab import rl_config
+    from reportlab.pdfbase.pdfmetrics import stringWidthCache
+    from reportlab.platypus.paragraph import Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.randomtext import randomText, PYTHON
+    style = getSampleStyleSheet()['Normal']
+    random.seed(1)
+    plain = [randomText(PYTHON,5) for i in range(nParas)]
+    marked = [' '.join(('<b>%s</b>' % w if i%9==0 else w) for i,w in enumerate(t.split())) for t in plain]
+    old = rl_config.stringWidthCacheSize
+    results = []
+    try:
+        for label, texts in (('plain',plain),('markup',marked)):
+            for size in sizes:
+                rl_config.stringWidthCacheSize = size
+                t = 0
+                for r in range(repeats):
+                    stringWidthCache.clear()
+                    P = [Paragraph(text,style) for text in texts]
+                    t0 = time.time()
+                    for p in P:
+                        p.wrap(450,0x7fffffff)
+                    t += time.time()-t0
+                n = stringWidthCache.hits+stringWidthCache.misses
+                results.append((label,size,1000*t/repeats,100.0*stringWidthCache.hits/n if n else 0))
+                if verbose:
+                    print('%-8s size=%-6d %10.1f ms %5.1f%% hits' % results[-1])
+    finally:
+        rl_config.stringWidthCacheSize = old
+        stringWidthCache.clear()
+    return results
+
+if __name__=='__main__':
+    import sys
+    widthbench(int(sys.argv[1]) if len(sys.argv)>1 else 1000)